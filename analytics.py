@@ -0,0 +1,332 @@
+# analytics.py
+# Exit-survey analytics. APU_EXIT_ROLLUP holds answer counts per
+# (month, company, department, tenure bucket, question, answer); only the months touched
+# since the last refresh are recomputed. The dashboard loads the whole (small) rollup once
+# per refresh and slices it in pandas, so charts never scan the raw answer tables.
+import re
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+import streamlit as st
+
+from codebook import sync_codebook
+from config import ANSWER_CODEBOOK_TABLE, ANSWER_TABLE, EMPLOYEE_TABLE, EXIT_ROLLUP_TABLE, INTERVIEW_TABLE, fq
+from db_session import get_session_pool
+from questions import QUESTIONS
+from query_telemetry import collect, to_pandas
+from reason_codes import REASON_COLUMN, encode_reasons, top_reasons
+from storage import get_storage
+
+
+# ---- Defaults (override under [analytics] in secrets.toml) ----
+DEFAULT_REFRESH_INTERVAL = 15 * 60  # seconds between incremental rollup refreshes
+DEFAULT_MAX_STALENESS = 2 * 3600    # past this the dashboard aggregates the raw tables instead
+ROLLUP_LOOKBACK = timedelta(hours=1)  # late (write-behind) rows re-open the month they belong to
+ROLLUP_CACHE_TTL = 600
+
+# Survey columns with one code per row / a multi-select bitmask
+SINGLE_CHOICE_COLUMNS = tuple(
+    q["answer_key"].upper() for q in QUESTIONS.values() if q["kind"] != "multi_select"
+)
+MULTI_SELECT_COLUMNS = tuple(
+    q["answer_key"].upper() for q in QUESTIONS.values() if q["kind"] == "multi_select"
+)
+INTERVIEW_SCORE_COLUMNS = ("Q1_SCORE", "Q2_SCORE", "Q3_SCORE", "Q4_CHOICE", "Q5_SCORE", "Q6_SCORE")
+
+ROLLUP_COLUMNS = (
+    "MONTH", "COMPANYNAME", "DEPNAME", "TENURE_BUCKET", "QUESTION", "ANSWER",
+    "RESPONSES", "LAST_SUBMITTED_AT",
+)
+
+EXIT_ROLLUP_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {fq(EXIT_ROLLUP_TABLE)} (
+        MONTH             DATE,
+        COMPANYNAME       VARCHAR,
+        DEPNAME           VARCHAR,
+        TENURE_BUCKET     VARCHAR,
+        QUESTION          VARCHAR,
+        ANSWER            VARCHAR,
+        RESPONSES         NUMBER,
+        LAST_SUBMITTED_AT TIMESTAMP_NTZ
+    )
+    CLUSTER BY (MONTH)
+"""
+
+# Counts for every answer submitted on/after ? (survey / interview), in rollup shape. Survey
+# answers are counted by codebook code (multi-select bitmasks expand through the codebook's
+# BIT column); the label is joined on read, so rewording an option never splits its counts.
+# The SURVEYS / INTERVIEWS pseudo-questions count submissions per segment.
+ROLLUP_SOURCE_SQL = f"""
+    WITH e AS (
+        SELECT EMPCODE, COMPANYNAME, DEPNAME
+        FROM {fq(EMPLOYEE_TABLE)}
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY EMPCODE ORDER BY LASTHIREDDATE DESC NULLS LAST) = 1
+    ),
+    survey_type AS (
+        SELECT EMPCODE, SURVEY_TYPE
+        FROM {fq(ANSWER_TABLE)}
+        WHERE SUBMITTED_AT IS NOT NULL
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY EMPCODE ORDER BY SUBMITTED_AT DESC) = 1
+    ),
+    a AS (
+        SELECT * FROM {fq(ANSWER_TABLE)} WHERE SUBMITTED_AT >= ?
+    ),
+    single AS (
+        SELECT EMPCODE, SURVEY_TYPE, SUBMITTED_AT, QUESTION, ANSWER
+        FROM (SELECT EMPCODE, SURVEY_TYPE, SUBMITTED_AT, {', '.join(f'{c}::VARCHAR AS {c}' for c in SINGLE_CHOICE_COLUMNS)} FROM a)
+        UNPIVOT (ANSWER FOR QUESTION IN ({', '.join(SINGLE_CHOICE_COLUMNS)}))
+    ),
+    multi AS (
+        {' UNION ALL '.join(
+            f"SELECT a.EMPCODE, a.SURVEY_TYPE, a.SUBMITTED_AT, cb.QUESTION, cb.CODE::VARCHAR AS ANSWER "
+            f"FROM a JOIN {fq(ANSWER_CODEBOOK_TABLE)} cb ON cb.QUESTION = '{c}' AND BITAND(a.{c}, cb.BIT) <> 0"
+            for c in MULTI_SELECT_COLUMNS
+        )}
+    ),
+    iv AS (
+        SELECT u.EMP_CODE AS EMPCODE, t.SURVEY_TYPE, u.SUBMITTED_AT, u.QUESTION, u.ANSWER
+        FROM (
+            SELECT EMP_CODE, SUBMITTED_AT, {', '.join(f'{c}::VARCHAR AS {c}' for c in INTERVIEW_SCORE_COLUMNS)}
+            FROM {fq(INTERVIEW_TABLE)}
+            WHERE SUBMITTED_AT >= ?
+        )
+        UNPIVOT (ANSWER FOR QUESTION IN ({', '.join(INTERVIEW_SCORE_COLUMNS)})) u
+        LEFT JOIN survey_type t ON t.EMPCODE = u.EMP_CODE
+    ),
+    counted AS (
+        SELECT EMPCODE, SURVEY_TYPE, SUBMITTED_AT, 'SURVEYS' AS QUESTION, 'submitted' AS ANSWER FROM a
+        UNION ALL
+        SELECT EMPCODE, SURVEY_TYPE, SUBMITTED_AT, 'INTERVIEWS', 'submitted'
+        FROM (SELECT EMP_CODE AS EMPCODE, SUBMITTED_AT FROM {fq(INTERVIEW_TABLE)} WHERE SUBMITTED_AT >= ?) i
+        LEFT JOIN survey_type USING (EMPCODE)
+    ),
+    answers AS (
+        SELECT * FROM single UNION ALL SELECT * FROM multi UNION ALL SELECT * FROM iv
+        UNION ALL SELECT * FROM counted
+    )
+    SELECT
+        DATE_TRUNC('month', x.SUBMITTED_AT)::DATE AS MONTH,
+        COALESCE(e.COMPANYNAME, '')               AS COMPANYNAME,
+        COALESCE(e.DEPNAME, '')                   AS DEPNAME,
+        COALESCE(x.SURVEY_TYPE, '')               AS TENURE_BUCKET,
+        x.QUESTION,
+        x.ANSWER,
+        COUNT(*)                                  AS RESPONSES,
+        MAX(x.SUBMITTED_AT)                       AS LAST_SUBMITTED_AT
+    FROM answers x
+    LEFT JOIN e ON e.EMPCODE = x.EMPCODE
+    WHERE x.ANSWER IS NOT NULL AND x.ANSWER <> ''
+    GROUP BY 1, 2, 3, 4, 5, 6
+"""
+
+ROLLUP_SOURCE_PARAMS = ROLLUP_SOURCE_SQL.count("?")  # every ? is the same "since" timestamp
+
+ROLLUP_WATERMARK_SQL = f"SELECT MAX(LAST_SUBMITTED_AT) FROM {fq(EXIT_ROLLUP_TABLE)}"
+DELETE_ROLLUP_MONTHS_SQL = f"DELETE FROM {fq(EXIT_ROLLUP_TABLE)} WHERE MONTH >= DATE_TRUNC('month', ?::TIMESTAMP_NTZ)"
+INSERT_ROLLUP_SQL = f"INSERT INTO {fq(EXIT_ROLLUP_TABLE)} ({', '.join(ROLLUP_COLUMNS)})" + ROLLUP_SOURCE_SQL
+
+
+def _labeled(source) -> str:
+    """Rollup-shaped rows from `source` with survey answer codes replaced by codebook labels."""
+    return f"""
+    SELECT r.MONTH, r.COMPANYNAME, r.DEPNAME, r.TENURE_BUCKET, r.QUESTION,
+           COALESCE(cb.LABEL, r.ANSWER) AS ANSWER, r.RESPONSES
+    FROM ({source}) r
+    LEFT JOIN {fq(ANSWER_CODEBOOK_TABLE)} cb ON cb.QUESTION = r.QUESTION AND cb.CODE::VARCHAR = r.ANSWER
+"""
+
+
+SELECT_ROLLUP_SQL = _labeled(f"SELECT * FROM {fq(EXIT_ROLLUP_TABLE)}")
+LIVE_ROLLUP_SQL = _labeled(ROLLUP_SOURCE_SQL)
+
+EPOCH = "1970-01-01"
+
+
+def _month_start(ts):
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+class ExitRollup:
+    """Creates APU_EXIT_ROLLUP and re-aggregates the months that changed since its watermark."""
+
+    def __init__(self, run, refresh_interval=DEFAULT_REFRESH_INTERVAL, max_staleness=DEFAULT_MAX_STALENESS):
+        self._run = run  # run(fn(session)) -> result, e.g. SessionPool.run
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+
+        self._lock = threading.Lock()
+        self._ensured = False
+        self._refreshed_at = 0.0
+        self._last_error = None
+        self.version = 0
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def ready(self) -> bool:
+        return self._ensured and time.time() - self._refreshed_at < self.max_staleness
+
+    def refresh_once(self):
+        with self._lock:
+            try:
+                self._run(self._refresh)
+            except Exception as e:
+                self._last_error = str(e)
+                raise
+            self._last_error = None
+            self._refreshed_at = time.time()
+            self.version += 1
+
+    def _refresh(self, session):
+        if not self._ensured:
+            sync_codebook(session)  # the rollup joins its labels from the codebook
+            collect(session, EXIT_ROLLUP_DDL)
+            self._ensured = True
+        watermark = collect(session, ROLLUP_WATERMARK_SQL)[0][0]
+        since = EPOCH if watermark is None else _month_start(watermark - ROLLUP_LOOKBACK)
+        # Whole months are recomputed, so a month is never half old / half new
+        collect(session, "BEGIN")
+        try:
+            collect(session, DELETE_ROLLUP_MONTHS_SQL, params=[since])
+            collect(session, INSERT_ROLLUP_SQL, params=[since] * ROLLUP_SOURCE_PARAMS)
+            collect(session, "COMMIT")
+        except Exception:
+            collect(session, "ROLLBACK")
+            raise
+
+    def request_refresh(self):
+        self._wake.set()
+
+    def info(self) -> dict:
+        return {
+            "ready": self.ready(),
+            "version": self.version,
+            "refreshed_at": self._refreshed_at,
+            "last_error": self._last_error,
+        }
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="exit-rollup-refresh", daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh_once()
+            except Exception:
+                pass  # the dashboard aggregates live until a refresh succeeds
+
+
+@st.cache_resource
+def get_exit_rollup() -> ExitRollup:
+    """One rollup maintainer + refresh thread per Streamlit server process.
+
+    The thread only runs with the Snowflake storage backend (the rollup is a Snowflake table).
+    """
+    cfg = st.secrets.get("analytics", {})
+    rollup = ExitRollup(
+        get_session_pool().run,
+        refresh_interval=float(cfg.get("refresh_interval", DEFAULT_REFRESH_INTERVAL)),
+        max_staleness=float(cfg.get("max_staleness", DEFAULT_MAX_STALENESS)),
+    )
+    if cfg.get("enabled", True) and get_storage().name == "snowflake":
+        rollup.start()
+    return rollup
+
+
+# ---- Aggregation layer ----
+@st.cache_data(ttl=ROLLUP_CACHE_TTL, show_spinner=False)
+def _load_rollup(from_rollup, rollup_version):
+    if from_rollup:
+        q, params = SELECT_ROLLUP_SQL, None
+    else:
+        q, params = LIVE_ROLLUP_SQL, [EPOCH] * ROLLUP_SOURCE_PARAMS  # same shape, from the raw tables
+    df = get_session_pool().run(lambda session: to_pandas(session, q, params=params))
+    df = df[list(ROLLUP_COLUMNS[:-1])]
+    df["MONTH"] = pd.to_datetime(df["MONTH"])
+    df["RESPONSES"] = df["RESPONSES"].astype("int64")
+    for col in ("COMPANYNAME", "DEPNAME", "TENURE_BUCKET", "QUESTION", "ANSWER"):
+        df[col] = df[col].astype("category")
+    return df
+
+
+def load_rollup() -> pd.DataFrame:
+    """MONTH / COMPANYNAME / DEPNAME / TENURE_BUCKET / QUESTION / ANSWER / RESPONSES."""
+    rollup = get_exit_rollup()
+    ready = rollup.ready()
+    return _load_rollup(ready, rollup.version if ready else None)
+
+
+def filter_rollup(df, company=None, department=None, tenure=None, month_from=None, month_to=None):
+    mask = pd.Series(True, index=df.index)
+    if company:
+        mask &= df["COMPANYNAME"] == company
+    if department:
+        mask &= df["DEPNAME"] == department
+    if tenure:
+        mask &= df["TENURE_BUCKET"] == tenure
+    if month_from is not None:
+        mask &= df["MONTH"] >= pd.Timestamp(month_from).to_period("M").to_timestamp()
+    if month_to is not None:
+        mask &= df["MONTH"] <= pd.Timestamp(month_to)
+    return df[mask]
+
+
+def answer_counts(df, question) -> pd.Series:
+    """Responses per answer for one question (column name), largest first."""
+    rows = df[df["QUESTION"] == question.upper()]
+    return rows.groupby("ANSWER", observed=True)["RESPONSES"].sum().sort_values(ascending=False)
+
+
+def monthly_responses(df, question="SURVEYS") -> pd.Series:
+    """Responses per month for one question (default: submitted surveys)."""
+    rows = df[df["QUESTION"] == question.upper()]
+    return rows.groupby("MONTH")["RESPONSES"].sum().sort_index()
+
+
+def likert_means(df) -> pd.Series:
+    """Average interview score (1-5, from the "5 — ..." labels) per interview question."""
+    rows = df[df["QUESTION"].isin([c for c in INTERVIEW_SCORE_COLUMNS if c.endswith("_SCORE")])]
+    score = pd.to_numeric(rows["ANSWER"].astype(str).str[0], errors="coerce")
+    weighted = (score * rows["RESPONSES"]).groupby(rows["QUESTION"], observed=True).sum()
+    counts = rows["RESPONSES"].where(score.notna()).groupby(rows["QUESTION"], observed=True).sum()
+    return (weighted / counts).dropna()
+
+
+SEGMENT_COLUMNS = ("COMPANYNAME", "DEPNAME", "TENURE_BUCKET")
+
+
+def reason_table(df) -> pd.DataFrame:
+    """Reason_for_Leaving rollup rows with their stable REASON_CODE (already split per reason)."""
+    rows = df[df["QUESTION"] == REASON_COLUMN]
+    return rows[["MONTH", *SEGMENT_COLUMNS, "RESPONSES"]].assign(REASON_CODE=encode_reasons(rows["ANSWER"]))
+
+
+def top_reasons_by_segment(df, segment=None, n=3) -> pd.DataFrame:
+    """Top `n` leaving reasons per company / department / tenure bucket (or overall for None)."""
+    return top_reasons(reason_table(df), by=[segment] if segment else [], n=n, weight="RESPONSES")
+
+
+def question_label(question) -> str:
+    """Plain-text title of a survey question (registry title without HTML), or the column name."""
+    for q in QUESTIONS.values():
+        if q["answer_key"].upper() == question.upper():
+            return re.sub(r"<[^>]+>", "", q["title"]).strip()
+    return question
@@ -1,20 +1,21 @@
 # app_setup.py
 import streamlit as st
-import base64
+from assets import font_face_src
+from rerun_timing import timed
 
 
+@timed("apply_custom_font")
 def apply_custom_font():
-    # 1️⃣ Read and base64-encode your font file
-    with open("fonts/CeraPro-Medium.ttf", "rb") as f:
-        font_data = f.read()
-        font_base64 = base64.b64encode(font_data).decode()
+    # 1️⃣ Font source: a cacheable app/static/... file (or a base64 data URI in "inline" asset mode)
+    font_src = font_face_src("fonts/CeraPro-Medium.ttf")
 
     # 2️⃣ Inject the CSS using <style> and @font-face
     st.markdown(f"""
         <style>
             @font-face {{
                 font-family: 'CeraPro-Medium';
-                src: url(data:font/ttf;base64,{font_base64}) format('truetype');
+                src: {font_src};
+                font-display: swap;
             }}
 
             html, body, [class*="css"], .stApp, .stMainBlockContainer, .stLayoutWrapper, .stElementContainer, .stMarkdown{{
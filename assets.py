@@ -0,0 +1,206 @@
+# assets.py
+# Process-wide registry of the survey artwork and font. Every asset is read, (optionally)
+# downscaled and turned into an <img>/@font-face source once per process instead of on
+# every rerun of every question page.
+#
+# Two modes (set `mode` under [assets] in secrets.toml):
+#   "static" (default) - the bytes are published under static/_cache/ with a content-hash
+#                        filename and referenced as app/static/... URLs, so the browser
+#                        caches them (needs server.enableStaticServing, see .streamlit/config.toml)
+#   "inline"           - the bytes are inlined as base64 data URIs (also the fallback when
+#                        the static directory cannot be written)
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import streamlit as st
+
+from rerun_timing import timed
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional: without it the original PNG is served
+    Image = None
+
+
+MAX_CACHE_BYTES = 32 * 1024 * 1024  # cap on cached source strings (LRU beyond that)
+RETINA_SCALE = 2                    # variants are rendered at 2x the CSS height for sharp HiDPI screens
+DEFAULT_IMAGE_FORMATS = ("avif", "png")  # prebuilt formats the loader may pick from (smallest wins; png when no avif was built)
+
+APP_DIR = Path(__file__).resolve().parent
+STATIC_DIR = APP_DIR / "static"          # served by Streamlit at app/static/
+PUBLISH_DIR = STATIC_DIR / "_cache"      # generated, content-hashed copies (git-ignored)
+BUILD_DIR = STATIC_DIR / "build"         # output of tools/build_assets.py (committed)
+MANIFEST_PATH = BUILD_DIR / "manifest.json"
+STATIC_URL_PREFIX = "app/static"
+
+MIME_TYPES = {
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+    ".ttf": "font/ttf",
+    ".woff2": "font/woff2",
+}
+FONT_FORMATS = {".woff2": "woff2", ".ttf": "truetype"}
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # (path, height, mode) -> src string, least recently used first
+_cache_bytes = 0
+
+
+def _asset_config() -> dict:
+    try:
+        return st.secrets.get("assets", {})
+    except Exception:  # no secrets.toml at all
+        return {}
+
+
+def asset_mode() -> str:
+    return _asset_config().get("mode", "static")
+
+
+_manifest_cache = None
+
+
+def manifest() -> dict:
+    """static/build/manifest.json written by tools/build_assets.py ({} if the build was not run)."""
+    global _manifest_cache
+    if _manifest_cache is None:
+        try:
+            _manifest_cache = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _manifest_cache = {}
+    return _manifest_cache
+
+
+def _prebuilt(path, height, fmt=None):
+    """Smallest allowed prebuilt variant for (path, height) from the manifest, or None.
+
+    Fonts (height None): the woff2 subset, else the ttf one; `fmt` asks for that one only.
+    """
+    allowed = _asset_config().get("formats", DEFAULT_IMAGE_FORMATS)
+    if height:
+        variants = manifest().get("images", {}).get(str(path), {}).get(str(height), {})
+        candidates = [v for fmt, v in variants.items() if fmt in allowed]
+        return min(candidates, key=lambda v: v["bytes"]) if candidates else None
+    variants = manifest().get("fonts", {}).get(str(path), {})
+    for f in (fmt,) if fmt else ("woff2", "ttf"):
+        if f in variants:
+            return variants[f]
+    return None
+
+
+def _downscale_png(raw: bytes, height: int) -> bytes:
+    if Image is None:
+        return raw
+    with Image.open(io.BytesIO(raw)) as im:
+        target_h = height * RETINA_SCALE
+        if im.height <= target_h:
+            return raw
+        target_w = max(1, round(im.width * target_h / im.height))
+        paletted = im.mode == "P"
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA")
+        small = im.resize((target_w, target_h), Image.LANCZOS)
+        if paletted:
+            # Back to a 256-colour palette: keeps the flat emoji artwork ~5x smaller than RGBA
+            small = small.quantize(256, method=Image.Quantize.FASTOCTREE)
+        out = io.BytesIO()
+        small.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+def _resolve(path) -> Path:
+    p = Path(path)
+    return p if p.is_absolute() else APP_DIR / p
+
+
+def _read_variant(path, height):
+    raw = _resolve(path).read_bytes()
+    if height:
+        raw = _downscale_png(raw, height)
+    return raw
+
+
+def _data_uri(raw: bytes, suffix: str) -> str:
+    return f"data:{MIME_TYPES.get(suffix, 'application/octet-stream')};base64,{base64.b64encode(raw).decode()}"
+
+
+def publish_static(raw: bytes, stem: str, suffix: str) -> str:
+    """Write raw under static/_cache/<stem>.<hash><suffix> (once) and return its URL."""
+    digest = hashlib.sha256(raw).hexdigest()[:12]
+    name = f"{stem.replace(' ', '_').replace('(', '').replace(')', '')}.{digest}{suffix}"
+    target = PUBLISH_DIR / name
+    if not target.exists():
+        PUBLISH_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(raw)
+        tmp.replace(target)
+    return f"{STATIC_URL_PREFIX}/{PUBLISH_DIR.name}/{name}"
+
+
+def _build_src(path, height, mode, fmt=None) -> str:
+    built = _prebuilt(path, height, fmt)
+    if built:
+        if mode == "static":
+            return f"{STATIC_URL_PREFIX}/{built['file']}?v={built['sha256']}"
+        return _data_uri((STATIC_DIR / built["file"]).read_bytes(), Path(built["file"]).suffix)
+
+    p = Path(path)
+    raw = _read_variant(p, height)
+    if mode == "static":
+        stem = p.stem if not height else f"{p.stem}-h{height}"
+        try:
+            return publish_static(raw, stem, p.suffix)
+        except OSError:
+            pass  # read-only filesystem: fall back to inlining
+    return _data_uri(raw, p.suffix)
+
+
+def _src(path, height=None, fmt=None) -> str:
+    global _cache_bytes
+    key = (str(path), height, asset_mode(), fmt)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    src = _build_src(path, height, key[2], fmt)
+
+    with _lock:
+        if key not in _cache:
+            _cache[key] = src
+            _cache_bytes += len(src)
+            while _cache_bytes > MAX_CACHE_BYTES and len(_cache) > 1:
+                _, evicted = _cache.popitem(last=False)
+                _cache_bytes -= len(evicted)
+    return src
+
+
+@timed("image_src")
+def image_src(path, height=None) -> str:
+    """Value for an <img src=...> attribute, downscaled to the rendered height when one is given."""
+    return _src(path, height)
+
+
+@timed("font_face_src")
+def font_face_src(path) -> str:
+    """Value for an @font-face `src:`: the subset woff2 from the build when there is one, then TrueType."""
+    src = _src(path)
+    built = _prebuilt(path, None)
+    suffix = Path(built["file"]).suffix if built else Path(path).suffix
+    face = f"url('{src}') format('{FONT_FORMATS.get(suffix, 'truetype')}')"
+    if suffix != ".ttf" and Path(path).suffix == ".ttf":
+        # Browsers without woff2 take the ttf subset (or the original file when it was not built)
+        face += f", url('{_src(path, fmt='ttf')}') format('truetype')"
+    return face
+
+
+def cache_info() -> dict:
+    with _lock:
+        return {"entries": len(_cache), "bytes": _cache_bytes, "max_bytes": MAX_CACHE_BYTES}
@@ -0,0 +1,391 @@
+# benchmarks/link_load.py
+"""
+Load test of link-mode surveys: N respondents open their `?mode=link&token=` link at once.
+
+    python benchmarks/link_load.py --sessions 50                  # 50 concurrent respondents
+    python benchmarks/link_load.py --sessions 200 --ramp 60       # opened over a minute
+    python benchmarks/link_load.py --sessions 20 --think 0.5      # short think times (smoke run)
+    python benchmarks/link_load.py --sessions 50 --signed         # signed tokens (survey_tokens.py)
+
+A real `streamlit run` server is started on the local SQLite storage backend (storage.py),
+seeded with demo employees, so it stands in for Snowflake. Links are issued with
+survey_links.generate_links like HR's bulk link tool does. Every session is one websocket
+client speaking the browser's protocol: it opens its link and then answers each question page
+the way a respondent clicks it (a radio choice, a picture button, or one to three checkboxes
+and "continue"), waiting a random think time before every click (--think seconds on average).
+
+Reported, for sizing replicas:
+    rerun latency      p50 / p95 / p99 / max from sending a click until the script run ends
+    memory per session (peak server RSS - RSS after a warm-up session) / sessions
+    server CPU         average and peak cores used by the server process while the test runs
+
+Sessions stay connected until every one has finished, so the peak RSS holds all of them.
+Memory and CPU are read from /proc (Linux).
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import pandas as pd  # noqa: E402
+
+from storage import SQLiteStorage  # noqa: E402
+from survey_flow import CATEGORY, seed  # noqa: E402
+from survey_links import generate_links  # noqa: E402
+
+APP = ROOT / "streamlit_app.py"
+CONTINUE_LABEL = "Үргэлжлүүлэх →"
+MAX_PAGES = 30             # a session that is still on a question page after this many is stuck
+SAMPLE_INTERVAL = 0.25     # seconds between server RSS / CPU samples
+
+
+# ---- Server ----
+def free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def write_secrets(workdir, token_secret=None):
+    sections = {
+        "storage": {"backend": "sqlite", "path": str(workdir / "load.sqlite3")},
+        "submission_queue": {"spool_path": str(workdir / "spool.sqlite3")},
+        "pending_interviews": {"refresh_interval": 3600},
+        "exit_summary": {"enabled": False},
+        "assets": {"mode": "static"},
+    }
+    if token_secret:
+        sections["survey_tokens"] = {"secret": token_secret}
+    lines = []
+    for name, values in sections.items():
+        lines.append(f"[{name}]")
+        lines += [f"{key} = {json.dumps(value)}" for key, value in values.items()]
+    path = workdir / "secrets.toml"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path, sections
+
+
+def start_server(port, secrets_path, log):
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(APP),
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.enableXsrfProtection", "false",
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+            "--secrets.files", str(secrets_path),
+        ],
+        cwd=ROOT, stdout=log, stderr=subprocess.STDOUT,
+    )
+
+
+def wait_healthy(port, server, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("the Streamlit server exited; see its log")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("the Streamlit server did not come up")
+
+
+class ServerSampler(threading.Thread):
+    """Samples the server's RSS and CPU time from /proc every SAMPLE_INTERVAL seconds."""
+
+    def __init__(self, pid):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.peak_rss = 0
+        self.peak_cores = 0.0
+        self._stop_event = threading.Event()
+
+    def rss(self):
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def cpu_seconds(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.cpu_at_start = self.cpu_seconds()
+        super().start()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.elapsed = time.perf_counter() - self.started_at
+        self.cpu_used = self.cpu_seconds() - self.cpu_at_start
+
+    def run(self):
+        last_t, last_cpu = self.started_at, self.cpu_at_start
+        while not self._stop_event.wait(SAMPLE_INTERVAL):
+            now, cpu = time.perf_counter(), self.cpu_seconds()
+            self.peak_cores = max(self.peak_cores, (cpu - last_cpu) / (now - last_t))
+            self.peak_rss = max(self.peak_rss, self.rss())
+            last_t, last_cpu = now, cpu
+
+
+# ---- Respondent ----
+class Session:
+    """One browser tab on a survey link, speaking Streamlit's websocket protocol."""
+
+    def __init__(self, port, query_string, think, rng, timeout):
+        self.url = f"ws://localhost:{port}/_stcore/stream"
+        self.origin = f"http://localhost:{port}"
+        self.query_string = query_string
+        self.think = think
+        self.rng = rng
+        self.timeout = timeout
+        self.latencies = []  # (step, seconds)
+        self.pages = 0
+        self.error = None
+        self.finished = threading.Event()
+
+    def rerun(self, step, widgets=()):
+        """Send one rerun; wait for the run it causes and return the widgets its last run rendered."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query_string
+        msg.rerun_script.widget_states.widgets.extend(widgets)
+        started = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        rendered = []
+        while True:
+            fmsg = ForwardMsg()
+            fmsg.ParseFromString(self.ws.recv(timeout=self.timeout))
+            kind = fmsg.WhichOneof("type")
+            if kind == "delta" and fmsg.delta.WhichOneof("type") == "new_element":
+                element = fmsg.delta.new_element
+                name = element.WhichOneof("type")
+                proto = getattr(element, name)
+                if getattr(proto, "id", ""):
+                    rendered.append((name, proto))
+            elif kind == "script_finished":
+                if fmsg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    self.latencies.append((step, time.perf_counter() - started))
+                    return rendered
+                rendered = []  # st.rerun(): only the run that follows is on screen
+
+    def pause(self):
+        time.sleep(self.rng.uniform(0.5, 1.5) * self.think)
+
+    def answer(self, rendered):
+        """Click through the question page on screen; the widgets it leads to (None: no question shown)."""
+        radios = [p for name, p in rendered if name == "radio"]
+        checkboxes = [p for name, p in rendered if name == "checkbox"]
+        triggers = [p for name, p in rendered if name == "button" and p.label.startswith("trigger")]
+
+        self.pause()
+        if radios:
+            radio = radios[0]
+            rendered = self.rerun("radio", [WidgetState(id=radio.id, string_value=self.rng.choice(radio.options))])
+        elif triggers:
+            rendered = self.rerun("image_choice", [WidgetState(id=self.rng.choice(triggers).id, trigger_value=True)])
+        elif checkboxes:
+            picked = self.rng.sample(checkboxes, self.rng.randint(1, min(3, len(checkboxes))))
+            states = []
+            for checkbox in picked:
+                states.append(WidgetState(id=checkbox.id, bool_value=True))
+                rendered = self.rerun("checkbox", states)
+                self.pause()
+            buttons = [p for name, p in rendered if name == "button" and p.label == CONTINUE_LABEL]
+            if not buttons:
+                raise RuntimeError("no continue button after ticking checkboxes")
+            rendered = self.rerun("continue", states + [WidgetState(id=buttons[0].id, trigger_value=True)])
+        else:
+            return None
+        self.pages += 1
+        return rendered
+
+    def walk(self):
+        rendered = self.rerun("open")
+        if not any(name in ("radio", "checkbox", "button") for name, _ in rendered):
+            raise RuntimeError("the link did not open a question page")
+        while True:
+            rendered = self.answer(rendered)
+            if rendered is None:
+                return
+            if self.pages > MAX_PAGES:
+                raise RuntimeError(f"still on a question page after {MAX_PAGES} pages")
+
+    def run(self, start_at, done):
+        """Open the link at start_at, answer every page, then stay connected until done is set."""
+        try:
+            time.sleep(max(0.0, start_at - time.perf_counter()))
+            with connect(self.url, subprotocols=["streamlit"], origin=self.origin,
+                         max_size=None, open_timeout=self.timeout) as self.ws:
+                self.walk()
+                self.finished.set()
+                done.wait()
+        except Exception as e:  # noqa: BLE001 - reported per session
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.finished.set()
+
+
+# ---- Setup ----
+def issue_links(storage_path, n, signed_secret=None):
+    """n link query strings ("mode=link&token=...") for freshly seeded demo employees."""
+    empcodes = seed(storage_path, n)
+    signer = None
+    if signed_secret:
+        from survey_tokens import TokenSigner
+        signer = TokenSigner(signed_secret)
+    requests = pd.DataFrame({"EMPCODE": empcodes, "CATEGORY": CATEGORY})
+    links = generate_links(SQLiteStorage(storage_path), requests, signer=signer)
+    return [urlsplit(link).query for link in links["LINK"]]
+
+
+# ---- Report ----
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def report(sessions, sampler, idle_rss, wall):
+    latencies = [s for session in sessions for _, s in session.latencies]
+    failed = [session for session in sessions if session.error]
+    result = {
+        "sessions": len(sessions),
+        "completed": len(sessions) - len(failed),
+        "reruns": len(latencies),
+        "reruns_per_second": round(len(latencies) / wall, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(max(latencies) * 1000, 1),
+            "mean": round(statistics.fmean(latencies) * 1000, 1),
+        } if latencies else {},
+        "server_rss_mb": {"idle": round(idle_rss / 2**20, 1), "peak": round(sampler.peak_rss / 2**20, 1)},
+        "memory_per_session_mb": round(max(0, sampler.peak_rss - idle_rss) / 2**20 / len(sessions), 2),
+        "server_cpu_cores": {
+            "average": round(sampler.cpu_used / sampler.elapsed, 2),
+            "peak": round(sampler.peak_cores, 2),
+        },
+        "errors": sorted({session.error for session in failed}),
+    }
+    by_step = {}
+    for session in sessions:
+        for step, seconds in session.latencies:
+            by_step.setdefault(step, []).append(seconds)
+    result["latency_ms_by_step"] = {
+        step: {"count": len(v), "p50": round(percentile(v, 50) * 1000, 1), "p95": round(percentile(v, 95) * 1000, 1)}
+        for step, v in sorted(by_step.items())
+    }
+    return result
+
+
+def print_report(result):
+    lat = result["latency_ms"]
+    print(f"sessions           {result['completed']} / {result['sessions']} completed")
+    print(f"reruns             {result['reruns']} ({result['reruns_per_second']} / s)")
+    if lat:
+        print(f"rerun latency ms   p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  max {lat['max']}")
+    for step, v in result["latency_ms_by_step"].items():
+        print(f"  {step:<16} {v['count']:>6} reruns  p50 {v['p50']:>8}  p95 {v['p95']:>8}")
+    rss = result["server_rss_mb"]
+    print(f"server RSS MB      idle {rss['idle']}  peak {rss['peak']}")
+    print(f"memory / session   {result['memory_per_session_mb']} MB")
+    cpu = result["server_cpu_cores"]
+    print(f"server CPU cores   average {cpu['average']}  peak {cpu['peak']}")
+    for error in result["errors"]:
+        print(f"error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent respondents")
+    parser.add_argument("--think", type=float, default=3.0, help="average seconds before each click")
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which the sessions open their links")
+    parser.add_argument("--signed", action="store_true", help="issue signed tokens instead of random lookup tokens")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds one script run may take")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for answers and think times")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    parser.add_argument("--server-log", help="keep the Streamlit server output in this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        token_secret = os.urandom(16).hex() if args.signed else None
+        secrets_path, secrets = write_secrets(workdir, token_secret)
+        queries = issue_links(secrets["storage"]["path"], args.sessions + 1, token_secret)
+
+        port = free_port()
+        with open(args.server_log or os.devnull, "w") as log:
+            server = start_server(port, secrets_path, log)
+            try:
+                wait_healthy(port, server)
+                sampler = ServerSampler(server.pid)
+
+                # one full session first: imports, caches and the storage connection are warm
+                warmup, done = Session(port, queries[0], 0, rng, args.timeout), threading.Event()
+                done.set()
+                warmup.run(time.perf_counter(), done)
+                if warmup.error:
+                    sys.exit(f"warm-up session failed: {warmup.error}")
+                idle_rss = sampler.rss()
+
+                done = threading.Event()
+                sessions = [Session(port, q, args.think, random.Random(rng.random()), args.timeout)
+                            for q in queries[1:]]
+                started = time.perf_counter()
+                threads = [
+                    threading.Thread(target=s.run, args=(started + args.ramp * i / max(1, len(sessions)), done))
+                    for i, s in enumerate(sessions)
+                ]
+                sampler.start()
+                for t in threads:
+                    t.start()
+                for s in sessions:
+                    s.finished.wait()
+                sampler.stop()
+                wall = time.perf_counter() - started
+                done.set()
+                for t in threads:
+                    t.join()
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    result = report(sessions, sampler, idle_rss, wall)
+    print_report(result)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    if result["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+# benchmarks/survey_flow.py
+"""
+End-to-end benchmark of the HR survey and interview flow, driven with Streamlit's AppTest.
+
+    python benchmarks/survey_flow.py                     # compare against benchmarks/baseline.json
+    python benchmarks/survey_flow.py --runs 5            # more repetitions (median is reported)
+    python benchmarks/survey_flow.py --update-baseline   # store this machine's numbers
+
+The app runs against the local SQLite storage backend (storage.py) seeded with demo employees,
+so no Snowflake account is needed. Each step is one click as a respondent / HR user makes it:
+
+    login -> submitted list -> directory -> confirm -> begin -> question pages 3..15 -> survey_end
+    -> back to the list -> interview list -> interview intro -> interview form -> interview_end
+
+(survey_end lasts until the write-behind queue has stored the answers) and records the script
+run time (every rerun the click causes), the bytes of the messages the app sends to the
+browser, and the number of storage statements the script runs ran (the queue flusher and
+other background threads are not counted). A step regresses when it sends more than
+--bytes-tolerance more bytes or runs more statements at all; the script then exits with
+status 1.
+
+Timings depend on the machine and its load, so they only warn: when a step is slower than the
+baseline by more than --time-tolerance (a ratio, plus a small absolute allowance for very fast
+steps), and only if the baseline was recorded on this machine (--update-baseline stores which).
+The interview row pick happens in st.data_editor, which AppTest cannot edit, so that step puts
+the selection into session_state the way the "continue" button does.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.runtime.secrets import Secrets
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from navigation import SURVEY_END, plan_for  # noqa: E402
+from pending_interviews import get_pending_interviews  # noqa: E402
+from questions import QUESTIONS  # noqa: E402
+from seed_local_storage import demo_employees  # noqa: E402
+from storage import SQLiteStorage, get_storage  # noqa: E402
+from submission_queue import get_submission_queue  # noqa: E402
+
+APP = ROOT / "streamlit_app.py"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TIME_TOLERANCE = 0.5    # 50 % slower than the baseline warns
+DEFAULT_BYTES_TOLERANCE = 0.1   # 10 % more payload fails
+TIME_ALLOWANCE = 0.05           # seconds always allowed on top (timer noise on fast steps)
+
+BENCH_USER = ("bench", "bench")
+CATEGORY = "АЖИЛТНЫ САНААЧИЛГААР"  # with under a year of tenure: every question page 3..15
+HIRED_DAYS_AGO = 200
+
+
+# ---- Measuring ----
+class Meter:
+    """Payload bytes (every ForwardMsg the app enqueues) and storage statements, as running totals."""
+
+    def __init__(self):
+        self.bytes = 0
+        enqueue = ForwardMsgQueue.enqueue
+        meter = self
+
+        def counting_enqueue(queue, msg):
+            meter.bytes += msg.ByteSize()
+            return enqueue(queue, msg)
+
+        ForwardMsgQueue.enqueue = counting_enqueue
+
+    def snapshot(self):
+        return time.perf_counter(), self.bytes, get_storage().statements
+
+
+class Flow:
+    """One pass through the flow on its own AppTest; results is {step: (seconds, bytes, statements)}."""
+
+    def __init__(self, meter, secrets, empcode, timeout):
+        self.meter = meter
+        self.empcode = empcode
+        self.results = {}
+        self.at = AppTest.from_file(str(APP), default_timeout=timeout)
+        self.at.secrets.update(secrets)
+
+    def step(self, name, *actions):
+        """Run the actions (each returns after its script run) and record them as one step.
+
+        name None: the step is named after the page it ends on (page_4, ..., survey_end).
+        """
+        t0, b0, q0 = self.meter.snapshot()
+        for action in actions:
+            action()
+            if self.at.exception:
+                raise RuntimeError(f"{name}: {self.at.exception[0].value}")
+        t1, b1, q1 = self.meter.snapshot()
+        if name is None:
+            page = self.at.session_state.page
+            name = page if page == SURVEY_END else f"page_{page}"
+        self.results[name] = (t1 - t0, b1 - b0, q1 - q0)
+
+    def button(self, label):
+        return next(b for b in self.at.button if b.label == label)
+
+    # ---- the flow ----
+    def run(self, storage_path):
+        at = self.at
+        user, password = BENCH_USER
+        self.step("login_page", at.run)
+        self.step("login", lambda: (
+            at.text_input[0].set_value(user), at.text_input[1].set_value(password),
+            self.button("Нэвтрэх").click(), at.run(),
+        ))
+        self.step("directory", lambda: self.button("Үргэлжлүүлэх → Судалгааны сонголт").click().run())
+        self.step("survey_kind", lambda: at.radio(key="survey_or_interview").set_value("ГАРАХ СУДАЛГАА").run())
+        self.step("category", lambda: at.radio(key="category_selected").set_value(CATEGORY).run())
+        self.step("confirm", lambda: (
+            at.text_input(key="empcode").set_value(self.empcode), at.button(key="btn_confirm").click(), at.run(),
+        ))
+        self.step(None, lambda: at.button(key="begin_survey_btn").click().run())
+
+        while at.session_state.page != SURVEY_END:
+            page = at.session_state.page
+            if page not in QUESTIONS:
+                raise RuntimeError(f"unexpected page {page!r} after {list(self.results)[-1]}")
+            actions = self._answer(QUESTIONS[page])
+            if plan_for(at.session_state.total_questions_order).next(page) == SURVEY_END:
+                # The write-behind queue flushes in the background: survey_end lasts until the row is
+                # stored. The flusher is held while the page renders, so it always shows "pending".
+                queue = get_submission_queue()
+                actions = [queue.stop, *actions, queue.start, lambda: self._wait_stored(storage_path)]
+            self.step(None, *actions)
+
+        self.step("back_to_list", lambda: at.button(key="btn_back_to_directory").click().run())
+        self.step("interview_directory", lambda: self.button("Үргэлжлүүлэх → Судалгааны сонголт").click().run())
+        self.step("interview_list", lambda: at.radio(key="survey_or_interview").set_value("ГАРАХ ЯРИЛЦЛАГА").run())
+        self.step("interview_intro", self._pick_for_interview)
+        self.step("interview_form", lambda: at.button(key="btn_start_interview").click().run())
+        self.step("interview_end", self._fill_interview)
+        if at.session_state.page != "interview_end":
+            raise RuntimeError(f"interview did not finish: {[e.value for e in at.error]}")
+        return self.results
+
+    def _answer(self, question):
+        at = self.at
+        key = question["answer_key"]
+        if question["kind"] == "radio":
+            return [lambda: at.radio(key=key).set_value(question["options"][0]).run()]
+        if question["kind"] == "image_choice":
+            return [lambda: at.button(key=f"{key}_0").click().run()]
+        return [  # multi_select: tick one option, then "continue"
+            lambda: at.checkbox(key=f"{key}_0").check().run(),
+            lambda: self.button("Үргэлжлүүлэх →").click().run(),
+        ]
+
+    def _wait_stored(self, storage_path, timeout=30):
+        probe = SQLiteStorage(storage_path)  # a second handle: its statements are not counted
+        deadline = time.time() + timeout
+        while not probe.already_submitted(self.empcode):
+            if time.time() > deadline:
+                raise RuntimeError("survey answers were not flushed to storage")
+            time.sleep(0.02)
+
+    def _pick_for_interview(self):
+        at = self.at
+        at.session_state["selected_emp_code"] = self.empcode
+        at.session_state["selected_emp_lastname"] = ""
+        at.session_state["selected_emp_firstname"] = ""
+        at.session_state["page"] = "interview_0"
+        at.run()
+
+    def _fill_interview(self):
+        at = self.at
+        for n in (1, 2, 3, 5, 6):
+            radio = at.radio(key=f"INT_Q{n}_SCORE")
+            radio.set_value(radio.options[0])
+        choice = at.radio(key="INT_Q4_CHOICE")
+        choice.set_value(choice.options[0])
+        at.text_area(key="INT_Q7_FACTORS").set_value("Цалин; Ажлын ачаалал; Хамт олон")
+        at.button(key="btn_finish_interview").click().run()
+
+
+# ---- Setup ----
+def seed(storage_path, n):
+    employees = demo_employees(n)
+    employees["LASTHIREDDATE"] = (date.today() - timedelta(days=HIRED_DAYS_AGO)).isoformat()
+    SQLiteStorage(storage_path).import_employees(employees)
+    return employees["EMPCODE"].tolist()
+
+
+def stop_background_threads():
+    """Stop the app's maintainer threads: the flusher would recreate spool.sqlite3 during cleanup."""
+    for get in (get_submission_queue, get_pending_interviews):
+        get().stop(timeout=30)
+
+
+def app_secrets(workdir):
+    user, password = BENCH_USER
+    return {
+        "users": {user: password},
+        "storage": {"backend": "sqlite", "path": str(workdir / "bench.sqlite3")},
+        "submission_queue": {"spool_path": str(workdir / "spool.sqlite3"), "flush_interval": 0.05},
+        "pending_interviews": {"refresh_interval": 3600},
+        "exit_summary": {"enabled": False},
+        "assets": {"mode": "static"},
+    }
+
+
+# ---- Baseline ----
+def machine() -> str:
+    """Which machine the timings come from (baseline.json keeps it next to the steps)."""
+    return f"{platform.node()} {platform.machine()} {os.cpu_count()} cpus, Python {platform.python_version()}"
+
+
+def summarize(runs):
+    """Median seconds / bytes / statements per step over all runs."""
+    return {
+        name: {
+            "seconds": round(statistics.median(r[name][0] for r in runs), 4),
+            "bytes": int(statistics.median(r[name][1] for r in runs)),
+            "statements": int(statistics.median(r[name][2] for r in runs)),
+        }
+        for name in runs[0]
+    }
+
+
+def regressions(current, baseline, bytes_tolerance):
+    """Steps that send more bytes or run more statements than the baseline (these fail the run)."""
+    problems = []
+    for name, now in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if now["bytes"] > base["bytes"] * (1 + bytes_tolerance):
+            problems.append(f"{name}: {now['bytes']} bytes (baseline {base['bytes']})")
+        if now["statements"] > base["statements"]:
+            problems.append(f"{name}: {now['statements']} statements (baseline {base['statements']})")
+    for name in baseline:
+        if name not in current:
+            problems.append(f"{name}: step missing from this run")
+    return problems
+
+
+def slow_steps(current, baseline, time_tolerance):
+    """Steps slower than the baseline (only a warning)."""
+    return [
+        f"{name}: {now['seconds'] * 1000:.0f} ms (baseline {baseline[name]['seconds'] * 1000:.0f} ms)"
+        for name, now in current.items()
+        if name in baseline and now["seconds"] > baseline[name]["seconds"] * (1 + time_tolerance) + TIME_ALLOWANCE
+    ]
+
+
+def print_table(current, baseline):
+    print(f"{'step':<22} {'ms':>8} {'base ms':>8} {'KB':>8} {'base KB':>8} {'stmts':>6} {'base':>5}")
+    for name, now in current.items():
+        base = baseline.get(name, {})
+        print(
+            f"{name:<22} {now['seconds'] * 1000:>8.1f} "
+            f"{base['seconds'] * 1000 if base else float('nan'):>8.1f} "
+            f"{now['bytes'] / 1024:>8.1f} {base.get('bytes', float('nan')) / 1024:>8.1f} "
+            f"{now['statements']:>6} {base.get('statements', '-'):>5}"
+        )
+    total = sum(s["seconds"] for s in current.values())
+    print(f"{'total':<22} {total * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="passes through the flow (median per step)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument("--bytes-tolerance", type=float, default=DEFAULT_BYTES_TOLERANCE)
+    parser.add_argument("--timeout", type=float, default=60, help="seconds one script run may take")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # the app reads fonts/ and static/ relative to the repo root
+    with tempfile.TemporaryDirectory(prefix="apu-bench-") as tmp:
+        workdir = Path(tmp)
+        secrets = app_secrets(workdir)
+        # Same secrets outside the script runs too, so get_storage() here is the app's backend
+        st.secrets = Secrets()
+        st.secrets._secrets = secrets
+        empcodes = seed(secrets["storage"]["path"], args.runs + 1)
+        meter = Meter()
+
+        try:
+            # Warm-up pass: imports, cache_resource singletons and asset caches are built here
+            Flow(meter, secrets, empcodes[0], args.timeout).run(secrets["storage"]["path"])
+            runs = [
+                Flow(meter, secrets, empcode, args.timeout).run(secrets["storage"]["path"])
+                for empcode in empcodes[1:]
+            ]
+        finally:
+            stop_background_threads()
+
+    current = summarize(runs)
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        stored = {"machine": machine(), "steps": current}
+        baseline_path.write_text(json.dumps(stored, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print_table(current, current)
+        print(f"baseline written to {baseline_path}")
+        return 0
+
+    stored = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+    baseline = stored.get("steps", {})
+    print_table(current, baseline)
+    if not baseline:
+        print(f"no baseline at {baseline_path}: run with --update-baseline first")
+        return 0
+    if stored.get("machine") == machine():
+        for p in slow_steps(current, baseline, args.time_tolerance):
+            print(f"WARNING slower {p}")
+    else:
+        print(f"baseline recorded on {stored.get('machine', 'an unknown machine')}: timings not compared")
+    problems = regressions(current, baseline, args.bytes_tolerance)
+    for p in problems:
+        print(f"REGRESSION {p}")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+# codebook.py
+# Answer codebook: every survey question's options as small integer codes, built from the
+# questions.py registry. APU_SURVEY_ANSWERS stores the codes (single choice: the option's
+# code; multi select: a bitmask with bit code-1 set per selected option), the
+# APU_SURVEY_ANSWERS_LABELED view and APU_SURVEY_ANSWER_CODEBOOK give the labels back.
+#
+# Codes are 1-based positions in a question's option list: append new options, never
+# reorder or delete (rewording an option keeps its code, so analytics stay comparable).
+#
+# Deploy step: the Snowflake tables are converted once with tools/migrate_answer_codes.py.
+# Until that has run, the app refuses to start on Snowflake (see answer_codes_ready below).
+import logging
+
+from config import ANSWER_CODEBOOK_TABLE, ANSWER_LABEL_VIEW, ANSWER_TABLE, DATABASE_NAME, SCHEMA_NAME, fq
+from questions import QUESTIONS
+from query_telemetry import collect
+
+MULTI_SELECT_SEPARATOR = ";"
+
+logger = logging.getLogger(__name__)
+
+
+def _option_label(option) -> str:
+    return option["label"] if isinstance(option, dict) else option
+
+
+def _normalize(label) -> str:
+    # Radio labels carry stray spaces / line breaks ("⭐⭐\n Сайн, ... "); compare them collapsed
+    return " ".join(str(label).split())
+
+
+# ---- Codebook (answer column -> {label: code}) ----
+CODEBOOK = {
+    q["answer_key"]: {_option_label(opt): code for code, opt in enumerate(q["options"], start=1)}
+    for q in QUESTIONS.values()
+}
+MULTI_SELECT_KEYS = frozenset(q["answer_key"] for q in QUESTIONS.values() if q["kind"] == "multi_select")
+ANSWER_COLUMNS = tuple(CODEBOOK)
+
+_CODE_OF = {key: {_normalize(label): code for label, code in options.items()} for key, options in CODEBOOK.items()}
+_LABEL_OF = {key: {code: label for label, code in options.items()} for key, options in CODEBOOK.items()}
+
+
+def encode_answer(key, value, strict=False):
+    """Stored code for one answer (None for blank).
+
+    Text that is not an option of the question is stored as NULL with a logged warning (a
+    multi select keeps its known parts), so one stale label cannot fail a respondent's row;
+    strict=True raises ValueError instead (the migration lists such text before converting).
+    """
+    if value is None or not str(value).strip():
+        return None
+    codes = _CODE_OF[key]
+    parts = str(value).split(MULTI_SELECT_SEPARATOR) if key in MULTI_SELECT_KEYS else [value]
+    found = []
+    for part in parts:
+        if not str(part).strip():
+            continue
+        code = codes.get(_normalize(part))
+        if code is None:
+            if strict:
+                raise ValueError(f"{key}: unknown answer {str(part).strip()!r}")
+            logger.warning("%s: unknown answer %r stored as NULL", key, str(part).strip())
+            continue
+        found.append(code)
+    if key not in MULTI_SELECT_KEYS:
+        return found[0] if found else None
+    mask = 0
+    for code in found:
+        mask |= 1 << (code - 1)
+    return mask or None
+
+
+def decode_answer(key, code):
+    """Label text for a stored code (multi select: "; "-joined labels in option order)."""
+    if code is None:
+        return None
+    labels = _LABEL_OF[key]
+    if key not in MULTI_SELECT_KEYS:
+        return labels.get(int(code))
+    return "; ".join(label for c, label in sorted(labels.items()) if int(code) & (1 << (c - 1)))
+
+
+def encode_row(row: dict) -> dict:
+    """Copy of an answer row with every question column replaced by its code."""
+    out = dict(row)
+    for key in ANSWER_COLUMNS:
+        if key in out:
+            out[key] = encode_answer(key, out[key])
+    return out
+
+
+# ---- SQL ----
+def sql_literal(text) -> str:
+    return "'" + str(text).replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n") + "'"
+
+
+def decode_sql(key, column=None) -> str:
+    """SQL expression turning the stored code in `column` back into the label text."""
+    column = column or key
+    labels = _LABEL_OF[key]
+    if key not in MULTI_SELECT_KEYS:
+        whens = " ".join(f"WHEN {code} THEN {sql_literal(label)}" for code, label in sorted(labels.items()))
+        return f"CASE {column} {whens} END"
+    parts = ", ".join(
+        f"IFF(BITAND({column}, {1 << (code - 1)}) <> 0, {sql_literal(label)}, NULL)"
+        for code, label in sorted(labels.items())
+    )
+    return f"NULLIF(ARRAY_TO_STRING(ARRAY_CONSTRUCT_COMPACT({parts}), '; '), '')"
+
+
+CODEBOOK_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {fq(ANSWER_CODEBOOK_TABLE)} (
+        QUESTION VARCHAR NOT NULL,
+        CODE     NUMBER(3) NOT NULL,
+        BIT      NUMBER,
+        LABEL    VARCHAR
+    )
+"""
+
+# BIT is the mask value of the option for multi-select questions (NULL for single choice)
+CODEBOOK_ROWS = [
+    (key.upper(), code, (1 << (code - 1)) if key in MULTI_SELECT_KEYS else None, label)
+    for key, options in CODEBOOK.items()
+    for label, code in options.items()
+]
+
+SYNC_CODEBOOK_SQL = f"""
+    MERGE INTO {fq(ANSWER_CODEBOOK_TABLE)} t
+    USING (SELECT column1 AS QUESTION, column2 AS CODE, column3 AS BIT, column4 AS LABEL
+           FROM VALUES {', '.join('(?, ?, ?, ?)' for _ in CODEBOOK_ROWS)}) src
+    ON t.QUESTION = src.QUESTION AND t.CODE = src.CODE
+    WHEN MATCHED THEN UPDATE SET t.BIT = src.BIT, t.LABEL = src.LABEL
+    WHEN NOT MATCHED THEN INSERT (QUESTION, CODE, BIT, LABEL) VALUES (src.QUESTION, src.CODE, src.BIT, src.LABEL)
+"""
+SYNC_CODEBOOK_PARAMS = [v for row in CODEBOOK_ROWS for v in row]
+
+LABELED_VIEW_SQL = f"""
+    CREATE OR REPLACE VIEW {fq(ANSWER_LABEL_VIEW)} AS
+    SELECT
+        EMPCODE, SURVEY_TYPE, SUBMITTED_AT,
+        {', '.join(f'{decode_sql(key)} AS {key}' for key in ANSWER_COLUMNS)}
+    FROM {fq(ANSWER_TABLE)}
+"""
+
+
+def sync_codebook(session):
+    """Create / update the codebook table and the labeled view from the registry."""
+    collect(session, CODEBOOK_DDL)
+    collect(session, SYNC_CODEBOOK_SQL, params=SYNC_CODEBOOK_PARAMS)
+    collect(session, LABELED_VIEW_SQL)
+
+
+# ---- Deploy check ----
+ANSWER_CODES_READY_SQL = f"""
+    SELECT
+        (SELECT DATA_TYPE FROM {DATABASE_NAME}.INFORMATION_SCHEMA.COLUMNS
+         WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?) AS ANSWER_TYPE,
+        (SELECT COUNT(*) FROM {DATABASE_NAME}.INFORMATION_SCHEMA.TABLES
+         WHERE TABLE_SCHEMA = ? AND TABLE_NAME IN (?, ?)) AS CODEBOOK_OBJECTS
+"""
+
+
+def answer_codes_ready(session) -> bool:
+    """True once tools/migrate_answer_codes.py has run: numeric answer columns, codebook and view exist."""
+    row = collect(session, ANSWER_CODES_READY_SQL, params=[
+        SCHEMA_NAME, ANSWER_TABLE, ANSWER_COLUMNS[0].upper(),
+        SCHEMA_NAME, ANSWER_CODEBOOK_TABLE, ANSWER_LABEL_VIEW,
+    ])[0]
+    return row[0] is not None and row[0] != "TEXT" and row[1] == 2
@@ -0,0 +1,23 @@
+# config.py
+# ---- CONFIG ----
+
+COMPANY_NAME = "АПУ ХК"
+SCHEMA_NAME = "APU"
+EMPLOYEE_TABLE = "APU_EMP_DATA_JULY2025"
+ANSWER_TABLE = f"{SCHEMA_NAME}_SURVEY_ANSWERS"
+DATABASE_NAME = "CDNA_HR_DATA"
+LOGO_URL = "https://i.imgur.com/DgCfZ9B.png"
+LINK_TABLE = f"{SCHEMA_NAME}_SURVEY_LINKS"  # -> APU_SURVEY_LINKS
+LINK_REVOCATION_TABLE = f"{SCHEMA_NAME}_SURVEY_LINK_REVOCATIONS"  # deny-list for signed link tokens
+BASE_URL = "https://apu-exit-survey-cggmobn4x6kmsmpavyuu5z.streamlit.app/"  
+# BASE_URL = "http://localhost:8501/"  
+INTERVIEW_TABLE = f"{SCHEMA_NAME}_INTERVIEW_ANSWERS"
+EXIT_SUMMARY_TABLE = f"{SCHEMA_NAME}_EXIT_SUMMARY"  # one row per EMPCODE, maintained by exit_summary.py
+EXIT_ROLLUP_TABLE = f"{SCHEMA_NAME}_EXIT_ROLLUP"    # answer counts per month/segment, maintained by analytics.py
+ANSWER_CODEBOOK_TABLE = f"{SCHEMA_NAME}_SURVEY_ANSWER_CODEBOOK"  # (question, code) -> label, see codebook.py
+ANSWER_LABEL_VIEW = f"{SCHEMA_NAME}_SURVEY_ANSWERS_LABELED"      # APU_SURVEY_ANSWERS with label text
+
+
+def fq(table: str) -> str:
+    """Fully qualified table name, e.g. CDNA_HR_DATA.APU.APU_SURVEY_ANSWERS"""
+    return f"{DATABASE_NAME}.{SCHEMA_NAME}.{table}"
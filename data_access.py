@@ -0,0 +1,392 @@
+# data_access.py
+# Shared write path: every statement here has a fixed SQL text and bound (?) parameters,
+# so Snowflake can reuse the compiled plan and no value is ever spliced into the SQL.
+# Statements run through query_telemetry.py, which records their latency and rows per call site.
+import json
+
+from codebook import ANSWER_COLUMNS, encode_answer
+from config import (
+    ANSWER_LABEL_VIEW, ANSWER_TABLE, EMPLOYEE_TABLE, EXIT_SUMMARY_TABLE, INTERVIEW_TABLE,
+    LINK_REVOCATION_TABLE, LINK_TABLE, fq,
+)
+from query_telemetry import collect, to_pandas
+
+
+# ---- Column layouts ----
+EMPLOYEE_COLUMNS = (
+    "EMPCODE", "LASTNAME", "FIRSTNAME", "COMPANYNAME", "HEADDEPNAME", "DEPNAME",
+    "POSNAME", "GROUPYEAR", "LASTHIREDDATE",
+)
+
+SURVEY_ANSWER_COLUMNS = (
+    "EMPCODE",
+    "SURVEY_TYPE",
+    "SUBMITTED_AT",
+    "Reason_for_Leaving",
+    "Onboarding_Effectiveness",
+    "Unexpected_Responsibilities",
+    "Feedback",
+    "Leadership_Style",
+    "Team_Collaboration_Satisfaction",
+    "Motivation_In_Daily_Work",
+    "Work_Life_Balance",
+    "Value_Of_Benefits",
+    "Accuracy_Of_KPI_Evaluation",
+    "Career_Growth_Opportunities",
+    "Quality_Of_Training_Programs",
+    "Loyalty",
+)
+
+INTERVIEW_ANSWER_COLUMNS = (
+    "EMP_CODE",
+    "SUBMITTED_AT",
+    "Q1_SCORE", "Q1_DETAIL",
+    "Q2_SCORE", "Q2_DETAIL",
+    "Q3_SCORE", "Q3_DETAIL",
+    "Q4_CHOICE", "Q4_DETAIL",
+    "Q5_SCORE", "Q5_DETAIL",
+    "Q6_SCORE", "Q6_DETAIL",
+    "Q7_FACTORS",
+)
+
+SURVEY_LINK_COLUMNS = ("TOKEN", "EMPCODE", "SURVEY_TYPE")
+
+
+def _insert_sql(table: str, columns, n_rows: int = 1) -> str:
+    placeholders = "(" + ", ".join("?" for _ in columns) + ")"
+    values = ", ".join(placeholders for _ in range(n_rows))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values}"
+
+
+INSERT_SURVEY_ANSWERS_SQL = _insert_sql(fq(ANSWER_TABLE), SURVEY_ANSWER_COLUMNS)
+INSERT_INTERVIEW_ANSWERS_SQL = _insert_sql(fq(INTERVIEW_TABLE), INTERVIEW_ANSWER_COLUMNS)
+
+
+def blank_to_none(v):
+    """Empty / whitespace-only text is stored as NULL."""
+    if v is None:
+        return None
+    if isinstance(v, str):
+        v = v.strip()
+        return v or None
+    return v
+
+
+# ---- Writes ----
+def survey_answer_params(row: dict) -> list:
+    """Bind values of one answer row in SURVEY_ANSWER_COLUMNS order (question columns encoded)."""
+    params = []
+    for c in SURVEY_ANSWER_COLUMNS:
+        if c in ANSWER_COLUMNS:
+            params.append(encode_answer(c, row.get(c)))  # option code / bitmask, NULL when blank
+        else:
+            params.append("" if row.get(c) is None else row.get(c))
+    return params
+
+
+def insert_survey_answers(session, row: dict):
+    """row: {column name: value} for SURVEY_ANSWER_COLUMNS; answers are label text, stored as codebook codes"""
+    collect(session, INSERT_SURVEY_ANSWERS_SQL, params=survey_answer_params(row))
+
+
+def insert_survey_answers_batch(session, rows: list):
+    """Multi-row INSERT of many answer rows in one statement (one text per batch size)."""
+    if not rows:
+        return
+    if len(rows) == 1:
+        insert_survey_answers(session, rows[0])
+        return
+    params = []
+    for row in rows:
+        params.extend(survey_answer_params(row))
+    sql = _insert_sql(fq(ANSWER_TABLE), SURVEY_ANSWER_COLUMNS, len(rows))
+    collect(session, sql, params=params)
+
+
+def insert_interview_answers(session, row: dict):
+    """row: {column name: value} for INTERVIEW_ANSWER_COLUMNS (blank values are stored as NULL)"""
+    params = [blank_to_none(row.get(c)) for c in INTERVIEW_ANSWER_COLUMNS]
+    collect(session, INSERT_INTERVIEW_ANSWERS_SQL, params=params)
+
+
+LINK_INSERT_BATCH = 500  # rows per multi-row INSERT (keeps the bind count well under Snowflake's limit)
+
+
+def insert_survey_links(session, rows):
+    """rows: (TOKEN, EMPCODE, SURVEY_TYPE) tuples, written with multi-row INSERTs."""
+    rows = list(rows)
+    for i in range(0, len(rows), LINK_INSERT_BATCH):
+        batch = rows[i:i + LINK_INSERT_BATCH]
+        sql = _insert_sql(fq(LINK_TABLE), SURVEY_LINK_COLUMNS, len(batch))
+        collect(session, sql, params=[v for row in batch for v in row])
+
+
+# ---- Reads ----
+def fetch_employees(session, watermark_column, since=None):
+    """Employee master rows (EMPLOYEE_COLUMNS), only those with watermark_column >= since if given.
+
+    >= so rows loaded later with the watermark value itself are not skipped; the caller dedupes
+    on EMPCODE.
+    """
+    q = f"SELECT {', '.join(EMPLOYEE_COLUMNS)} FROM {fq(EMPLOYEE_TABLE)}"
+    if since is None:
+        return to_pandas(session, q)
+    return to_pandas(session, q + f" WHERE {watermark_column} >= ?", params=[since])
+
+
+EMPLOYEE_CONFIRMATION_SQL = f"""
+    SELECT
+        e.EMPCODE, e.LASTNAME, e.FIRSTNAME, e.COMPANYNAME, e.HEADDEPNAME, e.POSNAME,
+        e.GROUPYEAR, e.LASTHIREDDATE,
+        (
+            SELECT COUNT(*)
+            FROM {fq(ANSWER_TABLE)} a
+            WHERE a.EMPCODE = ? AND a.SUBMITTED_AT IS NOT NULL
+        ) > 0 AS ALREADY_SUBMITTED
+    FROM {fq(EMPLOYEE_TABLE)} e
+    WHERE e.EMPCODE = ?
+    ORDER BY e.LASTHIREDDATE DESC NULLS LAST
+    LIMIT 1
+"""
+
+
+def fetch_employee_confirmation(session, empcode):
+    """Latest hire row for empcode plus an ALREADY_SUBMITTED flag, in one round trip (None if unknown)."""
+    rows = collect(session, EMPLOYEE_CONFIRMATION_SQL, params=[empcode, empcode])
+    return rows[0].as_dict() if rows else None
+
+
+ALREADY_SUBMITTED_SQL = f"""
+    SELECT COUNT(*) > 0 AS ALREADY_SUBMITTED
+    FROM {fq(ANSWER_TABLE)}
+    WHERE EMPCODE = ? AND SUBMITTED_AT IS NOT NULL
+"""
+
+
+def fetch_already_submitted(session, empcode) -> bool:
+    """Submitted flag alone, for when the employee row already comes from the in-memory directory."""
+    return bool(collect(session, ALREADY_SUBMITTED_SQL, params=[empcode])[0][0])
+
+
+EMPLOYEES_FOR_LINKS_SQL = f"""
+    WITH codes AS (
+        SELECT DISTINCT VALUE::VARCHAR AS EMPCODE FROM TABLE(FLATTEN(INPUT => PARSE_JSON(?)))
+    )
+    SELECT
+        e.EMPCODE, e.LASTNAME, e.FIRSTNAME, e.COMPANYNAME, e.HEADDEPNAME, e.POSNAME,
+        e.GROUPYEAR, e.LASTHIREDDATE,
+        e.EMPCODE IN (
+            SELECT a.EMPCODE FROM {fq(ANSWER_TABLE)} a
+            WHERE a.SUBMITTED_AT IS NOT NULL AND a.EMPCODE IN (SELECT EMPCODE FROM codes)
+        ) AS ALREADY_SUBMITTED
+    FROM {fq(EMPLOYEE_TABLE)} e
+    WHERE e.EMPCODE IN (SELECT EMPCODE FROM codes)
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY e.EMPCODE ORDER BY e.LASTHIREDDATE DESC NULLS LAST) = 1
+"""
+
+
+def fetch_employees_for_links(session, empcodes):
+    """Latest hire row + ALREADY_SUBMITTED for many empcodes in one query (one bind: a JSON array)."""
+    return to_pandas(session, EMPLOYEES_FOR_LINKS_SQL, params=[json.dumps([str(c) for c in empcodes])])
+
+
+LINK_LOOKUP_SQL = f"""
+    SELECT EMPCODE, SURVEY_TYPE
+    FROM {fq(LINK_TABLE)}
+    WHERE TOKEN = ?
+    ORDER BY CREATED_AT DESC
+    LIMIT 1
+"""
+
+
+def fetch_link(session, token):
+    """(EMPCODE, SURVEY_TYPE) of a legacy random link token, None if unknown."""
+    rows = collect(session, LINK_LOOKUP_SQL, params=[token])
+    return (rows[0][0], rows[0][1]) if rows else None
+
+
+LATEST_SURVEY_ANSWERS_SQL = f"""
+    SELECT *
+    FROM {fq(ANSWER_LABEL_VIEW)}
+    WHERE EMPCODE = ?
+    ORDER BY SUBMITTED_AT DESC
+    LIMIT 1
+"""
+
+
+def fetch_latest_survey_answers(session, empcode):
+    """The employee's latest answer row with label text, as a one-row (or empty) DataFrame."""
+    return to_pandas(session, LATEST_SURVEY_ANSWERS_SQL, params=[empcode])
+
+
+# ---- Link revocations (deny-list for signed link tokens, see survey_tokens.py) ----
+LINK_REVOCATION_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {fq(LINK_REVOCATION_TABLE)} (
+        TOKEN_ID   VARCHAR,
+        EMPCODE    VARCHAR,
+        REVOKED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    )
+"""
+# REVOKED_AT holds the session's wall clock (the column default); as LTZ it is an instant again
+REVOCATIONS_SQL = f"""
+    SELECT TOKEN_ID, EMPCODE, DATE_PART(EPOCH_MILLISECOND, REVOKED_AT::TIMESTAMP_LTZ) / 1000
+    FROM {fq(LINK_REVOCATION_TABLE)}
+"""
+INSERT_REVOCATION_SQL = f"INSERT INTO {fq(LINK_REVOCATION_TABLE)} (TOKEN_ID, EMPCODE) VALUES (?, ?)"
+
+
+def fetch_revocations(session) -> list:
+    """[(TOKEN_ID, EMPCODE, REVOKED_AT epoch seconds)] of every revocation (either id may be NULL)."""
+    return [(r[0], r[1], None if r[2] is None else float(r[2])) for r in collect(session, REVOCATIONS_SQL)]
+
+
+def insert_revocation(session, token_id=None, empcode=None):
+    collect(session, INSERT_REVOCATION_SQL, params=[token_id, None if empcode is None else str(empcode)])
+
+
+# ---- HR list: submitted surveys ----
+# Read from the APU_EXIT_SUMMARY table (exit_summary.py) when it is fresh, else live.
+SUBMITTED_SURVEYS_FROM = f"""
+    FROM {fq(ANSWER_TABLE)} a
+    LEFT JOIN (SELECT DISTINCT EMP_CODE FROM {fq(INTERVIEW_TABLE)}) i
+        ON i.EMP_CODE = a.EMPCODE
+"""
+SUBMITTED_SURVEYS_SELECT = f"""
+    SELECT
+        a.EMPCODE                          AS EMP_CODE,
+        a.SUBMITTED_AT                     AS SUBMITTED_AT,
+        '✅'                                AS SURVEY_DONE,
+        CASE WHEN i.EMP_CODE IS NOT NULL THEN '✅' ELSE '❌' END AS INTERVIEW_DONE
+    {SUBMITTED_SURVEYS_FROM}
+"""
+SUMMARY_SURVEYS_SELECT = f"""
+    SELECT
+        a.EMPCODE                          AS EMP_CODE,
+        a.SURVEY_SUBMITTED_AT              AS SUBMITTED_AT,
+        '✅'                                AS SURVEY_DONE,
+        IFF(a.INTERVIEW_DONE, '✅', '❌')    AS INTERVIEW_DONE
+    FROM {fq(EXIT_SUMMARY_TABLE)} a
+"""
+
+
+def submitted_surveys_where(date_from=None, date_to=None, company=None, department=None,
+                            from_summary=False, empcode="a.EMPCODE"):
+    """WHERE clause + params; one fixed text per combination of filters that are set.
+
+    Shared by the HR list and the bulk exports (exports.py), so both filter alike.
+    """
+    submitted = "a.SURVEY_SUBMITTED_AT" if from_summary else "a.SUBMITTED_AT"
+    clauses = [f"{submitted} IS NOT NULL"]
+    params = []
+    if date_from is not None:
+        clauses.append(f"{submitted} >= ?")
+        params.append(date_from)
+    if date_to is not None:
+        clauses.append(f"{submitted} < DATEADD(day, 1, ?::DATE)")  # date_to is inclusive
+        params.append(date_to)
+    emp_clauses = []
+    if company:
+        emp_clauses.append("COMPANYNAME = ?")
+        params.append(company)
+    if department:
+        emp_clauses.append("DEPNAME = ?")
+        params.append(department)
+    if emp_clauses and from_summary:
+        clauses.extend(f"a.{c}" for c in emp_clauses)  # the summary row carries the attributes
+    elif emp_clauses:
+        # Company / department of the latest hire row, as in the summary (exit_summary.py)
+        clauses.append(f"""{empcode} IN (
+            SELECT EMPCODE FROM {fq(EMPLOYEE_TABLE)}
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY EMPCODE ORDER BY LASTHIREDDATE DESC NULLS LAST) = 1
+                AND {' AND '.join(emp_clauses)}
+        )""")
+    return "WHERE " + " AND ".join(clauses), params
+
+
+def fetch_submitted_surveys(session, date_from=None, date_to=None, company=None, department=None,
+                            limit=50, offset=0, from_summary=False):
+    """One page of submitted surveys (newest first) with the interview status, as a DataFrame."""
+    where, params = submitted_surveys_where(date_from, date_to, company, department, from_summary)
+    submitted = "a.SURVEY_SUBMITTED_AT" if from_summary else "a.SUBMITTED_AT"
+    q = f"""
+    {SUMMARY_SURVEYS_SELECT if from_summary else SUBMITTED_SURVEYS_SELECT}
+    {where}
+    ORDER BY {submitted} DESC, a.EMPCODE
+    LIMIT ? OFFSET ?
+    """
+    return to_pandas(session, q, params=params + [int(limit), int(offset)])
+
+
+def count_submitted_surveys(session, date_from=None, date_to=None, company=None, department=None,
+                            from_summary=False) -> int:
+    where, params = submitted_surveys_where(date_from, date_to, company, department, from_summary)
+    table = fq(EXIT_SUMMARY_TABLE) if from_summary else fq(ANSWER_TABLE)
+    q = f"SELECT COUNT(*) FROM {table} a {where}"
+    return int(collect(session, q, params=params)[0][0])
+
+
+# ---- HR list: surveys still waiting for an exit interview ----
+ANSWER_WATERMARKS_SQL = f"""
+    SELECT
+        (SELECT MAX(SUBMITTED_AT) FROM {fq(ANSWER_TABLE)})    AS SURVEY_WATERMARK,
+        (SELECT MAX(SUBMITTED_AT) FROM {fq(INTERVIEW_TABLE)}) AS INTERVIEW_WATERMARK
+"""
+
+SUMMARY_ANSWER_WATERMARKS_SQL = f"""
+    SELECT MAX(SURVEY_SUBMITTED_AT) AS SURVEY_WATERMARK, MAX(INTERVIEW_SUBMITTED_AT) AS INTERVIEW_WATERMARK
+    FROM {fq(EXIT_SUMMARY_TABLE)}
+"""
+
+PENDING_INTERVIEWS_SQL = f"""
+    SELECT a.EMPCODE AS EMP_CODE, MAX(a.SUBMITTED_AT) AS SUBMITTED_AT
+    FROM {fq(ANSWER_TABLE)} a
+    WHERE a.SUBMITTED_AT IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM {fq(INTERVIEW_TABLE)} i WHERE i.EMP_CODE = a.EMPCODE)
+    GROUP BY a.EMPCODE
+"""
+
+SUMMARY_PENDING_INTERVIEWS_SQL = f"""
+    SELECT EMPCODE AS EMP_CODE, SURVEY_SUBMITTED_AT AS SUBMITTED_AT
+    FROM {fq(EXIT_SUMMARY_TABLE)}
+    WHERE SURVEY_DONE AND NOT INTERVIEW_DONE
+"""
+
+NEW_PENDING_INTERVIEWS_SQL = f"""
+    SELECT a.EMPCODE AS EMP_CODE, MAX(a.SUBMITTED_AT) AS SUBMITTED_AT
+    FROM {fq(ANSWER_TABLE)} a
+    WHERE a.SUBMITTED_AT >= ?
+      AND NOT EXISTS (SELECT 1 FROM {fq(INTERVIEW_TABLE)} i WHERE i.EMP_CODE = a.EMPCODE)
+    GROUP BY a.EMPCODE
+"""
+
+INTERVIEWED_SQL = f"""
+    SELECT DISTINCT EMP_CODE
+    FROM {fq(INTERVIEW_TABLE)}
+"""
+
+
+def fetch_answer_watermarks(session, from_summary=False):
+    """(latest survey SUBMITTED_AT, latest interview SUBMITTED_AT); None for an empty table.
+
+    from_summary reads them from APU_EXIT_SUMMARY, to pair with a pending set loaded from it.
+    """
+    row = collect(session, SUMMARY_ANSWER_WATERMARKS_SQL if from_summary else ANSWER_WATERMARKS_SQL)[0]
+    return row[0], row[1]
+
+
+def fetch_pending_interviews(session, since=None, from_summary=False) -> list:
+    """[(EMP_CODE, SUBMITTED_AT)] of surveyed employees without an interview (only since onwards, if given)."""
+    if since is None:
+        rows = collect(session, SUMMARY_PENDING_INTERVIEWS_SQL if from_summary else PENDING_INTERVIEWS_SQL)
+    else:
+        rows = collect(session, NEW_PENDING_INTERVIEWS_SQL, params=[since])
+    return [(str(r[0]), r[1]) for r in rows]
+
+
+def fetch_new_interviews(session, since=None) -> list:
+    """EMP_CODEs interviewed at or after since (all of them if since is None)."""
+    if since is None:
+        rows = collect(session, INTERVIEWED_SQL)
+    else:
+        rows = collect(session, INTERVIEWED_SQL + "    WHERE SUBMITTED_AT >= ?", params=[since])
+    return [str(r[0]) for r in rows]
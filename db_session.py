@@ -0,0 +1,221 @@
+# db_session.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+from snowflake.snowpark import Session
+
+
+# ---- Pool defaults (override under [session_pool] in secrets.toml) ----
+DEFAULT_MAX_SIZE = 4
+DEFAULT_IDLE_TIMEOUT = 600          # seconds an idle session is kept before it is closed
+DEFAULT_HEALTH_CHECK_INTERVAL = 60  # seconds between "SELECT 1" pings of an idle session
+DEFAULT_CHECKOUT_TIMEOUT = 30       # seconds to wait for a free session when the pool is full
+
+# Snowflake error codes / messages that mean the login is gone and we must reconnect
+_EXPIRED_ERRNOS = {390111, 390112, 390114}
+_EXPIRED_MESSAGES = (
+    "authentication token has expired",
+    "session no longer exists",
+    "session has been closed",
+    "connection is closed",
+)
+
+
+def is_expired_session_error(e: Exception) -> bool:
+    if getattr(e, "errno", None) in _EXPIRED_ERRNOS:
+        return True
+    msg = str(e).lower()
+    return any(m in msg for m in _EXPIRED_MESSAGES)
+
+
+class SessionPool:
+    """Bounded pool of Snowpark sessions shared by every script run and user."""
+
+    def __init__(self, factory, max_size=DEFAULT_MAX_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+                 checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT):
+        self._factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = deque()  # (session, last_used, last_checked), most recently used on the right
+        self._size = 0        # sessions created and not yet closed (idle + checked out)
+        self._cond = threading.Condition()
+        self._metrics = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+            "created": 0,
+            "reconnects": 0,
+            "health_check_failures": 0,
+            "idle_evictions": 0,
+        }
+
+    # ---- public API ----
+    @contextmanager
+    def session(self):
+        """Check a session out for the duration of a `with` block."""
+        session = self._checkout()
+        broken = False
+        try:
+            yield session
+        except Exception as e:
+            broken = is_expired_session_error(e)
+            raise
+        finally:
+            self._checkin(session, broken)
+
+    def run(self, fn):
+        """Call fn(session); on an expired login, reconnect once and retry."""
+        for attempt in range(2):
+            session = self._checkout()
+            try:
+                result = fn(session)
+            except Exception as e:
+                expired = is_expired_session_error(e)
+                self._checkin(session, broken=expired)
+                if expired and attempt == 0:
+                    with self._cond:
+                        self._metrics["reconnects"] += 1
+                    continue
+                raise
+            self._checkin(session)
+            return result
+
+    def metrics(self) -> dict:
+        with self._cond:
+            snapshot = dict(self._metrics)
+            snapshot["size"] = self._size
+            snapshot["idle"] = len(self._idle)
+            snapshot["in_use"] = self._size - len(self._idle)
+            snapshot["max_size"] = self.max_size
+        return snapshot
+
+    def close(self):
+        with self._cond:
+            idle = [s for s, _, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for s in idle:
+            _close_quietly(s)
+
+    # ---- internals ----
+    def _checkout(self):
+        deadline = None
+        waited_since = None
+        while True:
+            self._evict_idle()
+            with self._cond:
+                if self._idle:
+                    session, _, last_checked = self._idle.pop()
+                    self._record_checkout_locked(waited_since)
+                elif self._size < self.max_size:
+                    self._size += 1
+                    self._record_checkout_locked(waited_since)
+                    session, last_checked = None, None
+                else:
+                    if deadline is None:
+                        deadline = time.monotonic() + self.checkout_timeout
+                        waited_since = time.monotonic()
+                        self._metrics["waits"] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise TimeoutError(
+                            f"No Snowflake session free after {self.checkout_timeout}s "
+                            f"(pool size {self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+            # Connect / ping outside the lock so other runs aren't blocked on the network
+            if session is None:
+                return self._create()
+            if time.monotonic() - last_checked < self.health_check_interval:
+                return session
+            if self._ping(session):
+                return session
+
+            with self._cond:
+                self._metrics["health_check_failures"] += 1
+                self._metrics["reconnects"] += 1
+            _close_quietly(session)
+            return self._create()
+
+    def _checkin(self, session, broken=False):
+        if broken:
+            _close_quietly(session)
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            return
+        now = time.monotonic()
+        with self._cond:
+            self._idle.append((session, now, now))
+            self._cond.notify()
+
+    def _create(self):
+        try:
+            session = self._factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._metrics["created"] += 1
+        return session
+
+    def _ping(self, session) -> bool:
+        try:
+            session.sql("SELECT 1").collect()
+            return True
+        except Exception:
+            return False
+
+    def _record_checkout_locked(self, waited_since):
+        self._metrics["checkouts"] += 1
+        if waited_since is not None:
+            self._metrics["wait_seconds"] += time.monotonic() - waited_since
+
+    def _evict_idle(self):
+        # Oldest sessions sit on the left of the deque; popped under the lock, closed outside
+        # it so a slow close (a network round trip) does not block the other runs
+        evicted = []
+        now = time.monotonic()
+        with self._cond:
+            while self._idle and now - self._idle[0][1] > self.idle_timeout:
+                session, _, _ = self._idle.popleft()
+                self._size -= 1
+                self._metrics["idle_evictions"] += 1
+                evicted.append(session)
+        for session in evicted:
+            _close_quietly(session)
+
+
+def _close_quietly(session):
+    try:
+        session.close()
+    except Exception:
+        pass
+
+
+@st.cache_resource
+def get_session_pool() -> SessionPool:
+    """One pool per Streamlit server process."""
+    cfg = st.secrets.get("session_pool", {})
+    conn = dict(st.secrets["connections"]["snowflake"])
+    return SessionPool(
+        lambda: Session.builder.configs(conn).create(),
+        max_size=int(cfg.get("max_size", DEFAULT_MAX_SIZE)),
+        idle_timeout=float(cfg.get("idle_timeout", DEFAULT_IDLE_TIMEOUT)),
+        health_check_interval=float(cfg.get("health_check_interval", DEFAULT_HEALTH_CHECK_INTERVAL)),
+        checkout_timeout=float(cfg.get("checkout_timeout", DEFAULT_CHECKOUT_TIMEOUT)),
+    )
@@ -0,0 +1,144 @@
+# employee_directory.py
+# Process-wide copy of the employee master (APU_EMP_DATA_*), keyed by EMPCODE.
+# The table changes at most daily, so HR lookups are served from memory and only
+# rows at or after the watermark are pulled on refresh (deduped on EMPCODE).
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from data_access import EMPLOYEE_COLUMNS
+from storage import get_storage
+
+
+# ---- Directory defaults (override under [employee_directory] in secrets.toml) ----
+DEFAULT_TTL = 24 * 3600            # seconds before the whole frame is dropped and reloaded
+DEFAULT_REFRESH_INTERVAL = 15 * 60 # seconds between incremental (watermark) refreshes
+DEFAULT_WATERMARK_COLUMN = "LASTHIREDDATE"
+
+DIRECTORY_COLUMNS = EMPLOYEE_COLUMNS
+# Low-cardinality text columns are stored as pandas categoricals to keep the frame small
+_CATEGORY_COLUMNS = ("COMPANYNAME", "HEADDEPNAME", "DEPNAME", "POSNAME", "GROUPYEAR")
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Latest hire row per EMPCODE, indexed by EMPCODE, with categorical text columns.
+
+    On equal hire dates the row that comes first in df wins (the stable sort keeps the order).
+    """
+    df = (
+        df.sort_values("LASTHIREDDATE", ascending=False, na_position="last", kind="stable")
+          .drop_duplicates("EMPCODE", keep="first")
+    )
+    df["EMPCODE"] = df["EMPCODE"].astype(str)
+    for col in _CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df.set_index("EMPCODE", drop=False)
+
+
+class EmployeeDirectory:
+    """In-memory employee master with TTL eviction and incremental watermark refresh."""
+
+    def __init__(self, load_fn, ttl=DEFAULT_TTL, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 watermark_column=DEFAULT_WATERMARK_COLUMN):
+        self._load_fn = load_fn  # load_fn(watermark_column, since_value_or_None) -> DataFrame
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.watermark_column = watermark_column
+
+        self._lock = threading.Lock()
+        self._df = None
+        self._watermark = None
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+
+    # ---- lookups ----
+    def lookup(self, empcode):
+        """Employee row as a dict, or None if the code is not in the directory."""
+        df = self.frame()
+        key = str(empcode)
+        if key not in df.index:
+            return None
+        # Categorical columns hold NULLs as NaN; hand them out as None like a query row
+        return {k: (None if pd.isna(v) else v) for k, v in df.loc[key].items()}
+
+    def frame(self) -> pd.DataFrame:
+        """The whole directory (refreshing it first if it is stale)."""
+        self._maybe_refresh()
+        return self._df
+
+    def attach(self, df: pd.DataFrame, key_column: str,
+               columns=("LASTNAME", "FIRSTNAME", "COMPANYNAME", "DEPNAME", "POSNAME")) -> pd.DataFrame:
+        """LEFT JOIN employee columns onto df by its empcode column, done in memory."""
+        emp = self.frame()[list(columns)]
+        return (
+            df.assign(_empcode=df[key_column].astype(str))
+              .join(emp, on="_empcode")
+              .drop(columns="_empcode")
+        )
+
+    def info(self) -> dict:
+        df = self._df
+        return {
+            "rows": 0 if df is None else len(df),
+            "memory_bytes": 0 if df is None else int(df.memory_usage(deep=True).sum()),
+            "watermark": None if self._watermark is None else str(self._watermark),
+            "loaded_at": self._loaded_at,
+            "refreshed_at": self._refreshed_at,
+        }
+
+    # ---- refresh ----
+    def refresh_now(self):
+        """Manual "refresh now": drop everything and reload the full table."""
+        with self._lock:
+            self._full_load_locked()
+
+    def _maybe_refresh(self):
+        now = time.time()
+        if self._df is not None and now - self._refreshed_at < self.refresh_interval \
+                and now - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            now = time.time()
+            if self._df is None or now - self._loaded_at >= self.ttl:
+                self._full_load_locked()
+            elif now - self._refreshed_at >= self.refresh_interval:
+                self._incremental_locked()
+
+    def _full_load_locked(self):
+        df = _compact(self._load_fn(self.watermark_column, None))
+        self._swap_locked(df)
+        self._loaded_at = self._refreshed_at
+
+    def _incremental_locked(self):
+        new_rows = self._load_fn(self.watermark_column, self._watermark)
+        if new_rows.empty:
+            self._refreshed_at = time.time()
+            return
+        # Re-hires replace the old row: keep the latest hire per EMPCODE. The rows at the
+        # watermark come back every time; listed first, the fresh copy wins over the held one.
+        merged = pd.concat(
+            [new_rows.astype(object), self._df.reset_index(drop=True).astype(object)],
+            ignore_index=True,
+        )
+        self._swap_locked(_compact(merged))
+
+    def _swap_locked(self, df):
+        wm = df[self.watermark_column].dropna()
+        self._watermark = wm.max() if not wm.empty else None
+        self._df = df
+        self._refreshed_at = time.time()
+
+
+@st.cache_resource
+def get_employee_directory() -> EmployeeDirectory:
+    """One directory per Streamlit server process."""
+    cfg = st.secrets.get("employee_directory", {})
+    return EmployeeDirectory(
+        get_storage().load_employees,
+        ttl=float(cfg.get("ttl", DEFAULT_TTL)),
+        refresh_interval=float(cfg.get("refresh_interval", DEFAULT_REFRESH_INTERVAL)),
+        watermark_column=cfg.get("watermark_column", DEFAULT_WATERMARK_COLUMN),
+    )
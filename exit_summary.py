@@ -0,0 +1,223 @@
+# exit_summary.py
+# APU_EXIT_SUMMARY: one narrow row per surveyed EMPCODE with the survey / interview flags and
+# the employee attributes the HR lists show. The app creates it, keeps it current with MERGEs
+# of the employees whose latest survey / interview differs from the one it already holds, and
+# the HR readers fall back to the live answer/interview queries whenever it is missing or stale.
+import threading
+import time
+
+import streamlit as st
+
+from config import ANSWER_TABLE, EMPLOYEE_TABLE, EXIT_SUMMARY_TABLE, INTERVIEW_TABLE, fq
+from db_session import get_session_pool
+from query_telemetry import collect
+from storage import get_storage
+
+
+# ---- Defaults (override under [exit_summary] in secrets.toml) ----
+DEFAULT_REFRESH_INTERVAL = 120.0      # seconds between incremental MERGEs
+DEFAULT_REBUILD_INTERVAL = 24 * 3600  # seconds between full rebuilds (picks up employee master edits)
+DEFAULT_MAX_STALENESS = 15 * 60       # readers fall back to live queries past this age
+
+SUMMARY_COLUMNS = (
+    "EMPCODE", "SURVEY_SUBMITTED_AT", "INTERVIEW_SUBMITTED_AT", "SURVEY_DONE", "INTERVIEW_DONE",
+    "LASTNAME", "FIRSTNAME", "COMPANYNAME", "DEPNAME", "POSNAME", "REFRESHED_AT",
+)
+
+EXIT_SUMMARY_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {fq(EXIT_SUMMARY_TABLE)} (
+        EMPCODE                VARCHAR NOT NULL,
+        SURVEY_SUBMITTED_AT    TIMESTAMP_NTZ,
+        INTERVIEW_SUBMITTED_AT TIMESTAMP_NTZ,
+        SURVEY_DONE            BOOLEAN,
+        INTERVIEW_DONE         BOOLEAN,
+        LASTNAME               VARCHAR,
+        FIRSTNAME              VARCHAR,
+        COMPANYNAME            VARCHAR,
+        DEPNAME                VARCHAR,
+        POSNAME                VARCHAR,
+        REFRESHED_AT           TIMESTAMP_NTZ
+    )
+    CLUSTER BY (SURVEY_SUBMITTED_AT)
+"""
+
+# Live rows in summary shape; {where} narrows it to the EMPCODEs being merged
+_SUMMARY_SOURCE_SQL = f"""
+    WITH s AS (
+        SELECT EMPCODE, MAX(SUBMITTED_AT) AS SURVEY_SUBMITTED_AT
+        FROM {fq(ANSWER_TABLE)}
+        WHERE SUBMITTED_AT IS NOT NULL
+        GROUP BY EMPCODE
+    ),
+    i AS (
+        SELECT EMP_CODE, MAX(SUBMITTED_AT) AS INTERVIEW_SUBMITTED_AT
+        FROM {fq(INTERVIEW_TABLE)}
+        GROUP BY EMP_CODE
+    ),
+    e AS (
+        SELECT EMPCODE, LASTNAME, FIRSTNAME, COMPANYNAME, DEPNAME, POSNAME
+        FROM {fq(EMPLOYEE_TABLE)}
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY EMPCODE ORDER BY LASTHIREDDATE DESC NULLS LAST) = 1
+    )
+    SELECT
+        s.EMPCODE,
+        s.SURVEY_SUBMITTED_AT,
+        i.INTERVIEW_SUBMITTED_AT,
+        TRUE                     AS SURVEY_DONE,
+        i.EMP_CODE IS NOT NULL   AS INTERVIEW_DONE,
+        e.LASTNAME, e.FIRSTNAME, e.COMPANYNAME, e.DEPNAME, e.POSNAME,
+        CURRENT_TIMESTAMP()::TIMESTAMP_NTZ AS REFRESHED_AT
+    FROM s
+    LEFT JOIN i ON i.EMP_CODE = s.EMPCODE
+    LEFT JOIN e ON e.EMPCODE = s.EMPCODE
+    {{where}}
+"""
+
+REBUILD_EXIT_SUMMARY_SQL = (
+    f"INSERT OVERWRITE INTO {fq(EXIT_SUMMARY_TABLE)} ({', '.join(SUMMARY_COLUMNS)})"
+    + _SUMMARY_SOURCE_SQL.format(where="")
+)
+
+# Each summary row records the SUBMITTED_ATs merged for its EMPCODE. Answers reach Snowflake
+# through the write-behind queue, so a row can land later than newer ones; comparing with what
+# was merged (not with the newest SUBMITTED_AT) still picks it up.
+_NOT_MERGED_WHERE = f"""
+    WHERE NOT EXISTS (
+        SELECT 1 FROM {fq(EXIT_SUMMARY_TABLE)} m
+        WHERE m.EMPCODE = s.EMPCODE
+          AND m.SURVEY_SUBMITTED_AT = s.SURVEY_SUBMITTED_AT
+          AND m.INTERVIEW_SUBMITTED_AT IS NOT DISTINCT FROM i.INTERVIEW_SUBMITTED_AT
+    )
+"""
+
+MERGE_EXIT_SUMMARY_SQL = f"""
+    MERGE INTO {fq(EXIT_SUMMARY_TABLE)} t
+    USING ({_SUMMARY_SOURCE_SQL.format(where=_NOT_MERGED_WHERE)}) src
+    ON t.EMPCODE = src.EMPCODE
+    WHEN MATCHED THEN UPDATE SET
+        {', '.join(f't.{c} = src.{c}' for c in SUMMARY_COLUMNS[1:])}
+    WHEN NOT MATCHED THEN INSERT ({', '.join(SUMMARY_COLUMNS)})
+        VALUES ({', '.join(f'src.{c}' for c in SUMMARY_COLUMNS)})
+"""
+
+SUMMARY_EMPTY_SQL = f"SELECT COUNT(*) = 0 FROM (SELECT 1 FROM {fq(EXIT_SUMMARY_TABLE)} LIMIT 1)"
+
+
+class SnowflakeSummaryStore:
+    """The summary table in Snowflake; every method runs one statement through run()."""
+
+    def __init__(self, run):
+        self._run = run  # run(fn(session)) -> result, e.g. SessionPool.run
+
+    def ensure(self):
+        self._run(lambda s: collect(s, EXIT_SUMMARY_DDL))
+
+    def empty(self) -> bool:
+        return bool(self._run(lambda s: collect(s, SUMMARY_EMPTY_SQL))[0][0])
+
+    def rebuild(self):
+        self._run(lambda s: collect(s, REBUILD_EXIT_SUMMARY_SQL))
+
+    def merge_changed(self):
+        self._run(lambda s: collect(s, MERGE_EXIT_SUMMARY_SQL))
+
+
+class ExitSummary:
+    """Creates and refreshes the summary through a store; tells readers whether it can be used."""
+
+    def __init__(self, store, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 rebuild_interval=DEFAULT_REBUILD_INTERVAL, max_staleness=DEFAULT_MAX_STALENESS):
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.max_staleness = max_staleness
+
+        self._lock = threading.Lock()
+        self._ensured = False
+        self._rebuilt_at = 0.0
+        self._refreshed_at = 0.0
+        self._last_error = None
+        self.version = 0  # bumped after every successful refresh; part of reader cache keys
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def ready(self) -> bool:
+        """True while the table exists and was refreshed within max_staleness."""
+        return self._ensured and time.time() - self._refreshed_at < self.max_staleness
+
+    def refresh_once(self):
+        """Create the table if needed, then MERGE what changed (or rebuild when due)."""
+        with self._lock:
+            try:
+                if not self._ensured:
+                    self.store.ensure()
+                    self._ensured = True
+                if time.time() - self._rebuilt_at >= self.rebuild_interval or self.store.empty():
+                    self.store.rebuild()
+                    self._rebuilt_at = time.time()
+                else:
+                    self.store.merge_changed()
+            except Exception as e:
+                self._last_error = str(e)
+                raise
+            self._last_error = None
+            self._refreshed_at = time.time()
+            self.version += 1
+
+    def request_refresh(self):
+        """Ask the background thread to refresh now (after a submit)."""
+        self._wake.set()
+
+    def info(self) -> dict:
+        return {
+            "ready": self.ready(),
+            "version": self.version,
+            "refreshed_at": self._refreshed_at,
+            "rebuilt_at": self._rebuilt_at,
+            "last_error": self._last_error,
+        }
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="exit-summary-refresh", daemon=True)
+        self._thread.start()
+        self._wake.set()  # first refresh right away
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh_once()
+            except Exception:
+                pass  # readers use the live queries until a refresh succeeds (see info())
+
+
+@st.cache_resource
+def get_exit_summary() -> ExitSummary:
+    """One summary maintainer + refresh thread per Streamlit server process.
+
+    Only with the Snowflake storage backend; otherwise it never becomes ready and readers stay live.
+    """
+    cfg = st.secrets.get("exit_summary", {})
+    summary = ExitSummary(
+        SnowflakeSummaryStore(lambda fn: get_session_pool().run(fn)),
+        refresh_interval=float(cfg.get("refresh_interval", DEFAULT_REFRESH_INTERVAL)),
+        rebuild_interval=float(cfg.get("rebuild_interval", DEFAULT_REBUILD_INTERVAL)),
+        max_staleness=float(cfg.get("max_staleness", DEFAULT_MAX_STALENESS)),
+    )
+    if cfg.get("enabled", True) and get_storage().name == "snowflake":
+        summary.start()
+    return summary
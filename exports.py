@@ -0,0 +1,148 @@
+# exports.py
+# Bulk export of survey / interview answers joined with the employee master. Rows are pulled
+# with Snowpark's to_pandas_batches() and appended to a CSV / Parquet file on local disk one
+# batch at a time, so memory stays at one batch however large the date range is. The file is
+# then offered through st.download_button, which holds it in memory: exports over
+# MAX_DOWNLOAD_BYTES are stopped while they are written and HR is asked to narrow the filters.
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from config import ANSWER_LABEL_VIEW, EMPLOYEE_TABLE, INTERVIEW_TABLE, fq
+from data_access import INTERVIEW_ANSWER_COLUMNS, SURVEY_ANSWER_COLUMNS, submitted_surveys_where
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional: without it only CSV is offered
+    pa = pq = None
+
+
+DEFAULT_EXPORT_DIR = ".spool/exports"
+EXPORT_MAX_AGE = 3600  # seconds an export file is kept on disk for its download
+MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024  # largest file handed to st.download_button
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_EMPLOYEE_COLUMNS = ("LASTNAME", "FIRSTNAME", "COMPANYNAME", "HEADDEPNAME", "DEPNAME", "POSNAME")
+
+_LATEST_EMPLOYEE_CTE = f"""
+    WITH e AS (
+        SELECT EMPCODE, {', '.join(_EMPLOYEE_COLUMNS)}
+        FROM {fq(EMPLOYEE_TABLE)}
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY EMPCODE ORDER BY LASTHIREDDATE DESC NULLS LAST) = 1
+    )
+"""
+
+# kind -> (FROM clause, empcode column, answer columns); survey answers come back as label text
+_EXPORT_SOURCES = {
+    "survey": (f"{fq(ANSWER_LABEL_VIEW)} a", "a.EMPCODE", SURVEY_ANSWER_COLUMNS[1:]),
+    "interview": (f"{fq(INTERVIEW_TABLE)} a", "a.EMP_CODE", INTERVIEW_ANSWER_COLUMNS[1:]),
+}
+
+
+def export_query(kind, date_from=None, date_to=None, company=None, department=None):
+    """SELECT text + params for one export (same filters as the HR list)."""
+    source, empcode, columns = _EXPORT_SOURCES[kind]
+    where, params = submitted_surveys_where(date_from, date_to, company, department, empcode=empcode)
+    q = f"""
+    {_LATEST_EMPLOYEE_CTE}
+    SELECT
+        {empcode} AS EMPCODE,
+        {', '.join(f'e.{c}' for c in _EMPLOYEE_COLUMNS)},
+        {', '.join(f'a.{c}' for c in columns)}
+    FROM {source}
+    LEFT JOIN e ON e.EMPCODE = {empcode}
+    {where}
+    ORDER BY a.SUBMITTED_AT, {empcode}
+    """
+    return q, params
+
+
+class ExportTooLarge(ValueError):
+    """The export passed max_bytes while it was being written (the partial file is deleted)."""
+
+
+def available_formats():
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or pq is not None]
+
+
+def _parquet_schema(table):
+    # A column that is all NULL in the first batch would be typed "null"; widen it to string
+    return pa.schema([
+        pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in table.schema
+    ])
+
+
+def write_batches(batches, path, fmt, max_bytes=None) -> int:
+    """Append DataFrame batches to `path` as CSV (UTF-8 with BOM for Excel) or Parquet; returns rows.
+
+    ExportTooLarge once the file is over max_bytes.
+    """
+    rows = 0
+    writer = None
+    try:
+        for batch in batches:
+            if batch.empty:
+                continue
+            if fmt == "csv":
+                first = rows == 0
+                batch.to_csv(path, mode="a", index=False, header=first, encoding="utf-8-sig" if first else "utf-8")
+            else:
+                table = pa.Table.from_pandas(batch, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, _parquet_schema(table))
+                writer.write_table(table.cast(writer.schema))
+            rows += len(batch)
+            if max_bytes is not None and os.path.getsize(path) > max_bytes:
+                raise ExportTooLarge(f"export is over {max_bytes // (1024 * 1024)} MB")
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def cleanup_exports(export_dir=DEFAULT_EXPORT_DIR, max_age=EXPORT_MAX_AGE):
+    """Delete export files older than max_age seconds."""
+    cutoff = time.time() - max_age
+    for f in Path(export_dir).glob("*"):
+        try:
+            if f.stat().st_mtime < cutoff:
+                f.unlink()
+        except OSError:
+            pass
+
+
+def export_answers(session, kind, fmt="csv", date_from=None, date_to=None, company=None, department=None,
+                   export_dir=DEFAULT_EXPORT_DIR, max_bytes=MAX_DOWNLOAD_BYTES) -> dict:
+    """Stream one export to a file under export_dir; returns {path, file_name, mime, rows, bytes}.
+
+    No file is written when nothing matches (rows == 0); ExportTooLarge past max_bytes.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"unsupported export format: {fmt}")
+    cleanup_exports(export_dir)
+    Path(export_dir).mkdir(parents=True, exist_ok=True)
+
+    q, params = export_query(kind, date_from, date_to, company, department)
+    path = str(Path(export_dir) / f"{kind}-{uuid.uuid4().hex}.{fmt}")  # created by the first batch
+    try:
+        rows = write_batches(session.sql(q, params=params).to_pandas_batches(), path, fmt, max_bytes)
+    except Exception:
+        if os.path.exists(path):
+            os.unlink(path)
+        raise
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M")
+    return {
+        "path": path,
+        "file_name": f"apu_{kind}_answers_{stamp}.{fmt}",
+        "mime": EXPORT_FORMATS[fmt],
+        "rows": rows,
+        "bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+    }
@@ -0,0 +1,60 @@
+# hr_views.py
+# Cached reads behind the HR list pages and the confirm step's already-submitted flag. Results
+# are kept for a few minutes and dropped as soon as new answers land (the submission queue /
+# interview submit call invalidate_*).
+# While APU_EXIT_SUMMARY is fresh the pages read it; its version is part of the cache key,
+# so every summary refresh starts a new cache generation.
+import streamlit as st
+
+from exit_summary import get_exit_summary
+from storage import get_storage
+
+SUBMITTED_CACHE_TTL = 300  # seconds
+ALREADY_SUBMITTED_CACHE_TTL = 60  # seconds; bounds staleness for answers flushed by another process
+SUBMITTED_PAGE_SIZE = 50
+
+
+def _summary_source():
+    """(use the summary table?, its version) for the current request."""
+    summary = get_exit_summary()
+    ready = summary.ready()
+    return ready, (summary.version if ready else None)
+
+
+@st.cache_data(ttl=SUBMITTED_CACHE_TTL, show_spinner=False)
+def _submitted_page(date_from, date_to, company, department, page, page_size, from_summary, summary_version):
+    return get_storage().submitted_surveys(
+        date_from, date_to, company, department,
+        limit=page_size, offset=page * page_size, from_summary=from_summary,
+    )
+
+
+@st.cache_data(ttl=SUBMITTED_CACHE_TTL, show_spinner=False)
+def _submitted_count(date_from, date_to, company, department, from_summary, summary_version):
+    return get_storage().count_submitted_surveys(
+        date_from, date_to, company, department, from_summary=from_summary,
+    )
+
+
+def load_submitted_page(date_from, date_to, company, department, page, page_size=SUBMITTED_PAGE_SIZE):
+    """Rows of one page of the submitted-surveys list (filters are applied in the database)."""
+    from_summary, version = _summary_source()
+    return _submitted_page(date_from, date_to, company, department, page, page_size, from_summary, version)
+
+
+def load_submitted_count(date_from, date_to, company, department):
+    from_summary, version = _summary_source()
+    return _submitted_count(date_from, date_to, company, department, from_summary, version)
+
+
+@st.cache_data(ttl=ALREADY_SUBMITTED_CACHE_TTL, show_spinner=False)
+def load_already_submitted(empcode) -> bool:
+    """Whether empcode has a stored survey (the employee confirm step blocks on it)."""
+    return get_storage().already_submitted(empcode)
+
+
+def invalidate_submitted_surveys():
+    """Drop every cached page/count/flag (call after answers or interviews are written)."""
+    _submitted_page.clear()
+    _submitted_count.clear()
+    load_already_submitted.clear()
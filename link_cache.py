@@ -0,0 +1,124 @@
+# link_cache.py
+# Process-wide cache of survey link resolutions (token -> empcode, survey type, employee row,
+# submitted flag). Respondents refresh / reopen their link a lot; each open after the first is
+# served from memory. Unknown / invalid tokens are cached too (shorter TTL, separate LRU), so a
+# bad or scraped link cannot keep hitting the warehouse. A submitted survey drops every entry
+# of that empcode.
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+
+# ---- Defaults (override under [link_cache] in secrets.toml) ----
+DEFAULT_MAX_ENTRIES = 5000           # resolved links kept (LRU beyond that)
+DEFAULT_MAX_NEGATIVE_ENTRIES = 5000  # unknown tokens kept, in their own LRU
+DEFAULT_TTL = 15 * 60                # seconds a resolved link is reused
+DEFAULT_NEGATIVE_TTL = 5 * 60        # seconds an unknown token is answered from memory
+
+
+class LinkTokenCache:
+    """LRU + TTL map of token -> resolution; values with an "error" key are negative entries.
+
+    A positive value may carry "expires" (epoch seconds, signed tokens): it is never served
+    past that, whatever the TTL.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_negative_entries=DEFAULT_MAX_NEGATIVE_ENTRIES,
+                 ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL):
+        self.max_entries = max_entries
+        self.max_negative_entries = max_negative_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self._lock = threading.Lock()
+        self._positive = OrderedDict()  # token -> (stored_at, value), least recently used first
+        self._negative = OrderedDict()
+        self._by_empcode = {}           # empcode -> {tokens}
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "invalidations": 0}
+
+    def get_or_resolve(self, token, resolve):
+        """Cached resolution of token, else resolve(token) (a dict) stored and returned.
+
+        Exceptions from resolve (e.g. Snowflake unreachable) are not cached.
+        """
+        now = time.time()
+        with self._lock:
+            value = self._lookup_locked(token, now)
+            if value is not None:
+                return value
+            self._stats["misses"] += 1
+
+        value = resolve(token)
+
+        with self._lock:
+            if "error" in value:
+                self._negative[token] = (now, value)
+                self._negative.move_to_end(token)
+                while len(self._negative) > self.max_negative_entries:
+                    self._negative.popitem(last=False)
+            else:
+                self._positive[token] = (now, value)
+                self._positive.move_to_end(token)
+                self._by_empcode.setdefault(str(value["empcode"]), set()).add(token)
+                while len(self._positive) > self.max_entries:
+                    evicted, (_, old) = self._positive.popitem(last=False)
+                    self._forget_locked(evicted, old)
+        return value
+
+    def _lookup_locked(self, token, now):
+        hit = self._positive.get(token)
+        if hit is not None:
+            stored_at, value = hit
+            if now - stored_at < self.ttl and value.get("expires", now + 1) > now:
+                self._positive.move_to_end(token)
+                self._stats["hits"] += 1
+                return value
+            del self._positive[token]
+            self._forget_locked(token, value)
+        hit = self._negative.get(token)
+        if hit is not None:
+            stored_at, value = hit
+            if now - stored_at < self.negative_ttl:
+                self._negative.move_to_end(token)
+                self._stats["negative_hits"] += 1
+                return value
+            del self._negative[token]
+        return None
+
+    def _forget_locked(self, token, value):
+        tokens = self._by_empcode.get(str(value["empcode"]))
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_empcode[str(value["empcode"])]
+
+    def invalidate_empcode(self, empcode):
+        """Survey submitted: the next open of any of this employee's links resolves again."""
+        with self._lock:
+            for token in self._by_empcode.pop(str(empcode), ()):
+                self._positive.pop(token, None)
+                self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._positive.clear()
+            self._negative.clear()
+            self._by_empcode.clear()
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._positive), "negative_entries": len(self._negative), **self._stats}
+
+
+@st.cache_resource
+def get_link_cache() -> LinkTokenCache:
+    """One link cache per Streamlit server process."""
+    cfg = st.secrets.get("link_cache", {})
+    return LinkTokenCache(
+        max_entries=int(cfg.get("max_entries", DEFAULT_MAX_ENTRIES)),
+        max_negative_entries=int(cfg.get("max_negative_entries", DEFAULT_MAX_NEGATIVE_ENTRIES)),
+        ttl=float(cfg.get("ttl", DEFAULT_TTL)),
+        negative_ttl=float(cfg.get("negative_ttl", DEFAULT_NEGATIVE_TTL)),
+    )
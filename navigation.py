@@ -0,0 +1,115 @@
+# navigation.py
+# Survey page order, compiled once. A plan is the ordered tuple of question pages one
+# respondent sees; next / previous / progress are dict lookups instead of re-deriving
+# offsets from start_idx / skip_idx / total_questions on every click.
+from functools import lru_cache
+
+from questions import QUESTIONS
+
+SURVEY_END = "survey_end"
+FIRST_QUESTION_PAGE = 3  # page numbers below this are the login / setup screens
+
+# ---- Total questions number dictionary by survey type & employment duration ----
+# start_idx + 2 is the first page, skip_idx + 2 (when non-zero) is left out; the same three
+# numbers travel in survey links, so they stay the source the plans are compiled from.
+total_questions_number_dict = {
+    "КОМПАНИЙН САНААЧИЛГААР": {"1 жил хүртэл" : {"start_idx": 2,"skip_idx": 0, "total_questions": 11}, "1-ээс дээш": {"start_idx": 3,"skip_idx": 0, "total_questions": 10}},
+    "АЖИЛТНЫ САНААЧИЛГААР": {"1 жил хүртэл" : {"start_idx": 1,"skip_idx": 0,"total_questions": 13}, "1-ээс дээш": {"start_idx": 1, "skip_idx": 2, "total_questions": 12}}
+}
+
+
+class NavigationPlan:
+    """Ordered question pages for one (category, tenure) with O(1) next / previous / progress."""
+
+    def __init__(self, pages):
+        self.pages = tuple(pages)
+        self._index = {page: i for i, page in enumerate(self.pages)}
+        self._next = dict(zip(self.pages, self.pages[1:] + (SURVEY_END,)))
+        self._prev = dict(zip(self.pages[1:], self.pages))
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __contains__(self, page):
+        return page in self._index
+
+    @property
+    def first(self):
+        return self.pages[0] if self.pages else SURVEY_END
+
+    def next(self, page):
+        """Page after `page` ("survey_end" after the last question or for pages off the plan)."""
+        return self._next.get(page, SURVEY_END)
+
+    def previous(self, page):
+        """Page before `page`, or None on the first question."""
+        return self._prev.get(page)
+
+    def position(self, page):
+        """1-based question number of `page` (0 if it is not a question of this plan)."""
+        i = self._index.get(page)
+        return 0 if i is None else i + 1
+
+    def progress(self, page) -> int:
+        """Percent of the survey done once `page` is answered, 0-100."""
+        if not self.pages:
+            return 0
+        return int(self.position(page) * 100 / len(self.pages))
+
+
+def _pages(start_idx, skip_idx, total_questions):
+    """Pages in the order the original page arithmetic visits them, for any triple a link carries.
+
+    The survey opens on start_idx + 2 and steps one page at a time, jumping over skip_idx + 2,
+    until it passes start_idx + total_questions + 1 (one page later when skip_idx is set).
+    """
+    first = start_idx + FIRST_QUESTION_PAGE - 1
+    last = first + total_questions - 1 + (1 if skip_idx else 0)
+    skipped = skip_idx + FIRST_QUESTION_PAGE - 1
+    pages = [first]
+    page = first
+    while page < last:
+        page += 1
+        if page == skipped:
+            page += 1
+        pages.append(page)
+    return pages
+
+
+@lru_cache(maxsize=64)
+def compile_plan(start_idx, skip_idx, total_questions) -> NavigationPlan:
+    """Plan for one start/skip/total triple (links carry these, so any triple is allowed)."""
+    return NavigationPlan(_pages(int(start_idx), int(skip_idx), int(total_questions)))
+
+
+def plan_for(total_questions_order) -> NavigationPlan:
+    """Plan for a total_questions_order dict as stored in session state ({} -> empty plan)."""
+    order = total_questions_order or {}
+    if not order:
+        return EMPTY_PLAN
+    return compile_plan(
+        order.get("start_idx", 0),
+        order.get("skip_idx", 0),
+        order.get("total_questions", 0),
+    )
+
+
+def check_plans(plans, questions=QUESTIONS):
+    """Every page of every plan must be a registered question; raises ValueError otherwise."""
+    for key, plan in plans.items():
+        missing = [page for page in plan.pages if page not in questions]
+        if missing:
+            raise ValueError(f"navigation plan {key} uses unknown question pages {missing}")
+        if len(set(plan.pages)) != len(plan.pages):
+            raise ValueError(f"navigation plan {key} repeats a page")
+
+
+EMPTY_PLAN = NavigationPlan(())
+
+# ---- Plans per (category, tenure bucket), built once at import ----
+NAVIGATION_PLANS = {
+    (category, tenure): plan_for(order)
+    for category, by_tenure in total_questions_number_dict.items()
+    for tenure, order in by_tenure.items()
+}
+check_plans(NAVIGATION_PLANS)
@@ -0,0 +1,173 @@
+# pending_interviews.py
+# Process-wide set of employees who finished the survey but have no exit interview yet.
+# Loaded once with an anti-join, then kept current in place (interview saved / answers
+# flushed) and by a background refresh that only re-reads rows from just before the SUBMITTED_AT
+# watermarks, so the interview picker never waits on the warehouse while HR ticks rows.
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+import streamlit as st
+
+from exit_summary import get_exit_summary
+from storage import get_storage
+
+
+# ---- Defaults (override under [pending_interviews] in secrets.toml) ----
+DEFAULT_REFRESH_INTERVAL = 60.0  # seconds between incremental refreshes
+DEFAULT_TTL = 6 * 3600           # seconds before the set is rebuilt from scratch
+DEFAULT_OVERLAP = 300.0          # seconds re-read before each watermark (late flushes, equal timestamps)
+
+
+class PendingInterviews:
+    """EMP_CODE -> latest survey SUBMITTED_AT for surveys without an interview."""
+
+    def __init__(self, storage, refresh_interval=DEFAULT_REFRESH_INTERVAL, ttl=DEFAULT_TTL, summary=None,
+                 overlap=DEFAULT_OVERLAP):
+        self._storage = storage  # storage.py backend
+        self._summary = summary  # ExitSummary: full loads read it while it is fresh
+        self.refresh_interval = refresh_interval
+        self.ttl = ttl
+        self.overlap = overlap
+
+        self._lock = threading.Lock()          # guards the in-memory state
+        self._refresh_lock = threading.Lock()  # one Snowflake refresh at a time
+        self._pending = None       # dict EMP_CODE -> SUBMITTED_AT
+        self._interviewed = set()  # codes dropped since the last full load (late rows must not re-add them)
+        self._survey_wm = None
+        self._interview_wm = None
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+        self._version = 0
+        self._frame = None
+        self._frame_version = -1
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---- reads ----
+    def frame(self) -> pd.DataFrame:
+        """EMP_CODE / SUBMITTED_AT, newest first. Only the very first call queries Snowflake."""
+        if self._pending is None:
+            self.refresh_now()
+        with self._lock:
+            if self._frame_version != self._version:
+                df = pd.DataFrame(list(self._pending.items()), columns=["EMP_CODE", "SUBMITTED_AT"])
+                self._frame = df.sort_values("SUBMITTED_AT", ascending=False, ignore_index=True)
+                self._frame_version = self._version
+            return self._frame
+
+    def info(self) -> dict:
+        return {
+            "pending": 0 if self._pending is None else len(self._pending),
+            "survey_watermark": None if self._survey_wm is None else str(self._survey_wm),
+            "interview_watermark": None if self._interview_wm is None else str(self._interview_wm),
+            "loaded_at": self._loaded_at,
+            "refreshed_at": self._refreshed_at,
+        }
+
+    # ---- in-place updates ----
+    def mark_interviewed(self, emp_code):
+        """Interview saved: drop the employee right away."""
+        with self._lock:
+            self._interviewed.add(str(emp_code))
+            if self._pending is not None and self._pending.pop(str(emp_code), None) is not None:
+                self._version += 1
+
+    def add_submitted(self, rows):
+        """Survey rows just written (dicts with EMPCODE / SUBMITTED_AT): add them to the set."""
+        with self._lock:
+            if self._pending is None:
+                return
+            for row in rows:
+                code = str(row.get("EMPCODE"))
+                if code in self._interviewed or not row.get("SUBMITTED_AT"):
+                    continue
+                self._pending[code] = max(row["SUBMITTED_AT"], self._pending.get(code, row["SUBMITTED_AT"]))
+            self._version += 1
+
+    # ---- refresh ----
+    # Queries run under _refresh_lock only; _lock is held just long enough to apply the
+    # result, so readers never wait on Snowflake.
+    def refresh_now(self):
+        """Rebuild from scratch (first use, manual refresh, TTL expiry)."""
+        with self._refresh_lock:
+            # Watermarks first, from the same source as the set: rows landing during the load
+            # are re-read by the next increment
+            from_summary = self._summary is not None and self._summary.ready()
+            survey_wm, interview_wm = self._storage.answer_watermarks(from_summary=from_summary)
+            pending = dict(self._storage.pending_interviews(from_summary=from_summary))
+            with self._lock:
+                self._pending = pending
+                self._interviewed = set()
+                self._survey_wm, self._interview_wm = survey_wm, interview_wm
+                self._loaded_at = self._refreshed_at = time.time()
+                self._version += 1
+
+    def refresh_once(self):
+        """Incremental refresh (or a full reload once the TTL has passed)."""
+        if self._pending is None:
+            return  # nobody has opened the page yet
+        if time.time() - self._loaded_at >= self.ttl:
+            self.refresh_now()
+            return
+        with self._refresh_lock:
+            # Re-read an overlap window before each watermark: rows flushed late or stamped with
+            # the watermark itself are picked up; the merge dedupes on EMP_CODE
+            survey_since, interview_since = self._since(self._survey_wm), self._since(self._interview_wm)
+            survey_wm, interview_wm = self._storage.answer_watermarks()
+            interviewed = self._storage.new_interviews(interview_since)
+            added = self._storage.pending_interviews(survey_since)
+            with self._lock:
+                changed = False
+                for code in interviewed:
+                    self._interviewed.add(code)
+                    changed = self._pending.pop(code, None) is not None or changed
+                for code, submitted_at in added:
+                    held = self._pending.get(code)
+                    if code not in self._interviewed and (held is None or submitted_at > held):
+                        self._pending[code] = submitted_at
+                        changed = True
+                self._survey_wm = survey_wm or self._survey_wm
+                self._interview_wm = interview_wm or self._interview_wm
+                self._refreshed_at = time.time()
+                if changed:
+                    self._version += 1
+
+    def _since(self, watermark):
+        return None if watermark is None else watermark - timedelta(seconds=self.overlap)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="pending-interviews-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh_once()
+            except Exception:
+                pass  # keep serving the last good set; next tick retries
+
+
+@st.cache_resource
+def get_pending_interviews() -> PendingInterviews:
+    """One pending-interview set + refresh thread per Streamlit server process."""
+    cfg = st.secrets.get("pending_interviews", {})
+    pending = PendingInterviews(
+        get_storage(),
+        refresh_interval=float(cfg.get("refresh_interval", DEFAULT_REFRESH_INTERVAL)),
+        ttl=float(cfg.get("ttl", DEFAULT_TTL)),
+        summary=get_exit_summary(),
+        overlap=float(cfg.get("overlap", DEFAULT_OVERLAP)),
+    )
+    pending.start()
+    return pending
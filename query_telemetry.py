@@ -0,0 +1,283 @@
+# query_telemetry.py
+# One executor for every Snowflake statement the app runs (data_access.py, codebook.py,
+# analytics.py, exit_summary.py). Each statement is tagged with its call site (the calling
+# function, e.g. data_access.fetch_link) and the page whose rerun ran it (rerun_timing.py;
+# "background" for the maintainer threads), and adds to per (page, site) totals:
+#   compile  - building the Snowpark DataFrame for the SQL text (client side)
+#   execute  - until Snowflake has run the statement (Snowpark notifies its query listeners then)
+#   fetch    - downloading the result and turning it into Rows / a pandas DataFrame
+#   rows, bytes (in-memory size of the fetched result), errors
+#   unsplit  - statements no listener notification came for (failed before running, or a
+#              Snowpark change): their whole time after compile counts as execute
+# The latest statements keep their Snowflake query id, to look up in QUERY_HISTORY.
+#
+# The totals are exported in the Prometheus text format: shown on the submitted-surveys page
+# and, with `textfile_path` under [query_telemetry] in secrets.toml, rewritten every
+# `export_interval` seconds for node_exporter's textfile collector.
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import streamlit as st
+from snowflake.snowpark.query_history import QueryListener
+
+from rerun_timing import current_page
+
+
+# ---- Defaults (override under [query_telemetry] in secrets.toml) ----
+DEFAULT_ENABLED = True
+DEFAULT_MAX_RECENT = 200        # latest statements kept with their query id
+DEFAULT_EXPORT_INTERVAL = 15.0  # seconds between rewrites of the Prometheus text file
+
+METRIC_PREFIX = "apu_exit_survey_query"
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # seconds, compile + execute + fetch
+BACKGROUND = "background"  # page label of statements run outside a script run
+
+_COUNTERS = (
+    # (field, metric suffix, help)
+    ("statements", "statements_total", "Statements run."),
+    ("errors", "errors_total", "Statements that raised."),
+    ("unsplit", "unsplit_total", "Statements without an execute / fetch split (all counted as execute)."),
+    ("compile_seconds", "compile_seconds_total", "Seconds building the Snowpark DataFrame."),
+    ("execute_seconds", "execute_seconds_total", "Seconds until Snowflake finished the statement."),
+    ("fetch_seconds", "fetch_seconds_total", "Seconds downloading and converting results."),
+    ("rows", "rows_total", "Rows fetched."),
+    ("bytes", "bytes_total", "In-memory bytes of the fetched results."),
+)
+
+
+class _SiteStats:
+    __slots__ = ("statements", "errors", "unsplit", "compile_seconds", "execute_seconds", "fetch_seconds", "rows",
+                 "bytes", "buckets")
+
+    def __init__(self):
+        self.statements = self.errors = self.unsplit = self.rows = self.bytes = 0
+        self.compile_seconds = self.execute_seconds = self.fetch_seconds = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)  # cumulative, Prometheus style
+
+    def add(self, compile_s, execute_s, fetch_s, rows, size, failed, unsplit):
+        self.statements += 1
+        self.errors += failed
+        self.unsplit += unsplit
+        self.compile_seconds += compile_s
+        self.execute_seconds += execute_s
+        self.fetch_seconds += fetch_s
+        self.rows += rows
+        self.bytes += size
+        total = compile_s + execute_s + fetch_s
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if total <= bound:
+                self.buckets[i] += 1
+
+
+class QueryTelemetry:
+    """Per (page, call site) statement totals for one server process."""
+
+    def __init__(self, enabled=DEFAULT_ENABLED, max_recent=DEFAULT_MAX_RECENT, textfile_path=None,
+                 export_interval=DEFAULT_EXPORT_INTERVAL):
+        self.enabled = enabled
+        self.textfile_path = textfile_path
+        self.export_interval = export_interval
+
+        self._lock = threading.Lock()
+        self._sites = {}  # (page, site) -> _SiteStats
+        self._recent = deque(maxlen=max_recent)
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---- executor ----
+    def collect(self, session, sql, params=None, site=None) -> list:
+        """session.sql(sql, params).collect(), measured."""
+        return self._run(session, sql, params, site or _caller(), lambda df: df.collect())
+
+    def to_pandas(self, session, sql, params=None, site=None):
+        """session.sql(sql, params).to_pandas(), measured."""
+        return self._run(session, sql, params, site or _caller(), lambda df: df.to_pandas())
+
+    def _run(self, session, sql, params, site, fetch):
+        if not self.enabled:
+            return fetch(session.sql(sql, params=params))
+        started = time.perf_counter()
+        compiled = None
+        stamp = _ExecuteStamp()
+        result = None
+        failed = False
+        try:
+            df = session.sql(sql, params=params)
+            compiled = time.perf_counter()
+            session._conn.add_query_listener(stamp)
+            try:
+                result = fetch(df)
+            finally:
+                session._conn.remove_query_listener(stamp)
+            return result
+        except Exception:
+            failed = True
+            raise
+        finally:
+            done = time.perf_counter()
+            compiled = compiled or done
+            unsplit = not stamp.executed
+            executed_at, query_id = stamp.executed[-1] if stamp.executed else (done, None)
+            self.record(
+                str(current_page() or BACKGROUND), site,
+                compiled - started, executed_at - compiled, done - executed_at,
+                0 if result is None else len(result), _size(result), failed, query_id, unsplit,
+            )
+
+    def record(self, page, site, compile_s, execute_s, fetch_s, rows=0, size=0, failed=False, query_id=None,
+               unsplit=False):
+        with self._lock:
+            stats = self._sites.get((page, site))
+            if stats is None:
+                stats = self._sites[(page, site)] = _SiteStats()
+            stats.add(compile_s, execute_s, fetch_s, rows, size, failed, unsplit)
+            self._recent.append({
+                "at": datetime.now().isoformat(timespec="seconds"),
+                "page": page,
+                "site": site,
+                "query_id": query_id,
+                "ms": round((compile_s + execute_s + fetch_s) * 1000, 1),
+                "rows": rows,
+                "error": failed,
+                "split": not unsplit,
+            })
+
+    # ---- reporting ----
+    def info(self) -> list:
+        """One dict per (page, site) with the totals, most execute time first."""
+        with self._lock:
+            rows = [
+                {"page": page, "site": site, **{f: getattr(s, f) for f, _, _ in _COUNTERS}}
+                for (page, site), s in self._sites.items()
+            ]
+        return sorted(rows, key=lambda r: r["execute_seconds"], reverse=True)
+
+    def recent(self) -> list:
+        with self._lock:
+            return list(reversed(self._recent))
+
+    def prometheus(self) -> str:
+        """The totals in the Prometheus text exposition format."""
+        with self._lock:
+            sites = [
+                (_labels(page, site), {f: getattr(s, f) for f, _, _ in _COUNTERS}, list(s.buckets))
+                for (page, site), s in sorted(self._sites.items(), key=lambda kv: (str(kv[0][0]), kv[0][1]))
+            ]
+        lines = []
+        for field, suffix, help_text in _COUNTERS:
+            name = f"{METRIC_PREFIX}_{suffix}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f"{name}{{{labels}}} {totals[field]}" for labels, totals, _ in sites]
+        name = f"{METRIC_PREFIX}_duration_seconds"
+        lines += [f"# HELP {name} Compile + execute + fetch seconds per statement.", f"# TYPE {name} histogram"]
+        for labels, totals, buckets in sites:
+            lines += [f'{name}_bucket{{{labels},le="{bound}"}} {n}' for bound, n in zip(DURATION_BUCKETS, buckets)]
+            lines += [
+                f'{name}_bucket{{{labels},le="+Inf"}} {totals["statements"]}',
+                f"{name}_sum{{{labels}}} "
+                f"{totals['compile_seconds'] + totals['execute_seconds'] + totals['fetch_seconds']}",
+                f"{name}_count{{{labels}}} {totals['statements']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self):
+        """Atomically replace textfile_path with the current Prometheus text."""
+        path = self.textfile_path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+            self._recent.clear()
+
+    # ---- text file exporter ----
+    def start(self):
+        if not self.textfile_path or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="query-telemetry-export", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.wait(self.export_interval):
+            try:
+                self.write_textfile()
+            except OSError:
+                pass  # unwritable right now; try again next interval
+
+
+class _ExecuteStamp(QueryListener):
+    """Query listener for one statement: Snowpark notifies it once the statement has run, before the fetch.
+
+    Registered on the session's connection only around that statement; notifications from other
+    threads sharing the connection are ignored.
+    """
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.executed = []  # (perf_counter(), query id) per statement Snowpark reports
+
+    def _notify(self, query_record, **kwargs):
+        if threading.get_ident() == self.thread:
+            self.executed.append((time.perf_counter(), query_record.query_id))
+
+
+def _caller() -> str:
+    """module.function of the code that called collect() / to_pandas() (a lambda counts as its function)."""
+    frame = sys._getframe(2)
+    name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name).replace(".<locals>.<lambda>", "")
+    return f"{frame.f_globals.get('__name__', '?')}.{name}"
+
+
+def _size(result) -> int:
+    if result is None:
+        return 0
+    if hasattr(result, "memory_usage"):
+        return int(result.memory_usage(index=False, deep=True).sum())
+    return sum(sys.getsizeof(v) for row in result for v in row)
+
+
+def _labels(page, site) -> str:
+    def esc(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'page="{esc(page)}",site="{esc(site)}"'
+
+
+@st.cache_resource
+def get_query_telemetry() -> QueryTelemetry:
+    """One query telemetry (and text file exporter thread) per Streamlit server process."""
+    try:
+        cfg = st.secrets.get("query_telemetry", {})
+    except Exception:  # no secrets.toml at all
+        cfg = {}
+    telemetry = QueryTelemetry(
+        enabled=bool(cfg.get("enabled", DEFAULT_ENABLED)),
+        max_recent=int(cfg.get("max_recent", DEFAULT_MAX_RECENT)),
+        textfile_path=cfg.get("textfile_path"),
+        export_interval=float(cfg.get("export_interval", DEFAULT_EXPORT_INTERVAL)),
+    )
+    telemetry.start()
+    return telemetry
+
+
+def collect(session, sql, params=None, site=None) -> list:
+    """session.sql(sql, params).collect() through the process's query telemetry."""
+    return get_query_telemetry().collect(session, sql, params, site or _caller())
+
+
+def to_pandas(session, sql, params=None, site=None):
+    """session.sql(sql, params).to_pandas() through the process's query telemetry."""
+    return get_query_telemetry().to_pandas(session, sql, params, site or _caller())
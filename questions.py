@@ -0,0 +1,213 @@
+# questions.py
+# Survey question registry: one entry per question page, keyed by the page number the
+# navigation in streamlit_app.py uses. The page renderer reads everything it needs from
+# here, so adding / editing a question only touches this file.
+#
+# Entry fields:
+#   answer_key  column in APU_SURVEY_ANSWERS the answer is stored under
+#   kind        "multi_select" (checkbox grid), "image_choice" (picture buttons) or "radio"
+#   title       question text (HTML, shown in the left column)
+#   title_style style of the title <h1> (TITLE_* below)
+#   options     answer labels; for "image_choice" a list of {"label", "image"} dicts
+#   image_height / label_size   ("image_choice") rendered picture height in px, label font size
+#   max_choices / style         ("multi_select") selection cap, "compact" for long option lists
+
+
+# ---- Title styles ----
+TITLE_PADDED = "font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3; padding: 1rem;"
+TITLE_PLAIN = "font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;"
+TITLE_CENTERED = "font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3; display:flex; height:50vh; align-items: center;"
+
+IMAGE_DIR = "static/images"
+
+
+def _img(n: int) -> str:
+    return f"{IMAGE_DIR}/Image ({n}).png"
+
+
+# ---- Questions (page number -> question) ----
+QUESTIONS = {
+    3: {
+        "answer_key": "Reason_for_Leaving",
+        "kind": "multi_select",
+        "title": 'Танд ажлаас гарахад нөлөөлсөн<span style="color: #ec1c24;"> хүчин зүйл, шалтгаантай</span> хамгийн их тохирч байгаа 1-3 хариултыг сонгоно уу?',
+        "title_style": TITLE_PADDED,
+        "options": [
+            "Удирдлагын арга барил, харилцаа муу",
+            "Компанийн соёл таалагдаагүй",
+            "Цалин хөлс хангалтгүй",
+            "Хамт олны уур амьсгал, харилцаа таарамжгүй",
+            "Гүйцэтгэлийн үнэлгээ шудрага бус",
+            "Ажлын ачаалал их",
+            "Ажлын цагийн хуваарь таарамжгүй, хэцүү байсан",
+            "Дасан зохицуулах хөтөлбөрийн хэрэгжилт муу",
+            "Өөр хот, аймаг, улсад шилжих, амьдрах",
+            "Тэтгэвэрт гарч байгаа",
+            "Үндсэн мэргэжлийн дагуу ажиллах болсон",
+            "Албан тушаал/мэргэжлийн хувьд өсөх, суралцах боломж байхгүй",
+            "Эрүүл мэндийн байдлаас",
+            "Хөдөлмөрийн нөхцөл хэвийн бус/хүнд хортой байсан",
+            "Хувийн шалтгаан/Personal Reasons",
+            "Илүү боломжийн өөр ажлын байрны санал авсан",
+            "Ажлын орчин нөхцөл муу",
+            "Ар гэрийн асуудал үүссэн",
+            "Гадаадад улсад ажиллах/суралцах",
+        ],
+        "max_choices": 3,
+        "style": "compact",
+    },
+    4: {
+        "answer_key": "Onboarding_Effectiveness",
+        "kind": "image_choice",
+        "title": 'Дасан зохицох хөтөлбөрийн хэрэгжилт эсвэл баг хамт олон, шууд удирдлага танд өдөр тутмын ажил, үүрэг даалгавруудыг хурдан ойлгоход туслах <span style="color: #ec1c24;"> хангалттай мэдээлэл, заавар</span> өгч чадсан уу?',
+        "title_style": TITLE_PADDED,
+        "options": [
+            {"label": "Хангалттай чадсан", "image": _img(15)},
+            {"label": "Огт чадаагүй", "image": _img(16)},
+        ],
+        "image_height": 200,
+    },
+    5: {
+        "answer_key": "Unexpected_Responsibilities",
+        "kind": "image_choice",
+        "title": 'Ажлын байрны тодорхойлолт таны <span style="color: #ec1c24;"> өдөр тутмын </span> ажил үүрэгтэй нийцэж байсан уу??',
+        "title_style": TITLE_PLAIN,
+        "options": [
+            {"label": "Тийм", "image": _img(28)},
+            {"label": "Үгүй", "image": _img(11)},
+        ],
+        "image_height": 200,
+    },
+    6: {
+        "answer_key": "Feedback",
+        "kind": "image_choice",
+        "title": 'Таны шууд удирдлага санал зөвлөгөө өгч, <span style="color: #ec1c24;"> эргэх холбоотой </span>ажилладаг байсан уу?',
+        "title_style": TITLE_PLAIN,
+        "options": [
+            {"label": "Тийм", "image": _img(25)},
+            {"label": "Үгүй", "image": _img(16)},
+        ],
+        "image_height": 200,
+    },
+    7: {
+        "answer_key": "Leadership_Style",
+        "kind": "image_choice",
+        "title": "Таны шууд удирдлага ихэвчлэн аль зан төлвийг гаргадаг вэ?",
+        "title_style": TITLE_PLAIN,
+        "options": [
+            {"label": "Би Би гэдэг", "image": _img(19)},
+            {"label": "Бид Бид гэдэг", "image": _img(22)},
+        ],
+        "image_height": 200,
+    },
+    8: {
+        "answer_key": "Team_Collaboration_Satisfaction",
+        "kind": "radio",
+        "title": 'Таны харъяалагдаж буй баг доторх <span style="color: #ec1c24;">хамтын ажиллагаа,</span> хоорондын харилцаанд хэр сэтгэл хангалуун байсан бэ?',
+        "title_style": TITLE_PLAIN,
+        "options": [
+            "⭐\nОгт сэтгэл ханамжгүй",
+            "⭐⭐\nСэтгэл ханамжгүй",
+            "⭐⭐⭐\nДундаж",
+            "⭐⭐⭐⭐\nСэтгэл хангалуун",
+            "⭐⭐⭐⭐⭐\nМаш сэтгэл хангалуун",
+        ],
+    },
+    9: {
+        "answer_key": "Motivation_In_Daily_Work",
+        "kind": "multi_select",
+        "title": 'Танд өдөр тутмын ажлаа <span style="color: #ec1c24;">урам зоригтой </span> хийхэд ямар хүчин зүйлс нөлөөлдөг байсан бэ?',
+        "title_style": TITLE_CENTERED,
+        "options": [
+            "Цалин",
+            "Баг хамт олны дэмжлэг",
+            "Сурч хөгжих боломжоор хангагддаг байсан нь",
+            "Олон нийтийн үйл ажиллагаа",
+            "Шударга нээлттэй харилцаа",
+            "Шагнал урамшуулал",
+            "Ажлын орчин",
+            "Төсөл",
+            "Хөтөлбөрүүд",
+        ],
+        "max_choices": 3,
+    },
+    10: {
+        "answer_key": "Work_Life_Balance",
+        "kind": "image_choice",
+        "title": 'Байгууллага танд ажиллах <span style="color: #ec1c24;"> таатай нөхцөл</span>, ажил амьдралын тэнцвэртэй байдлаар ханган дэмждэг байсан уу? /Жнь: уян хатан цагийн хуваарь, ажлын байрны орчин/',
+        "title_style": TITLE_PLAIN,
+        "options": [
+            {"label": "Тийм", "image": _img(28)},
+            {"label": "Үгүй", "image": _img(2)},
+        ],
+        "image_height": 200,
+    },
+    11: {
+        "answer_key": "Value_Of_Benefits",
+        "kind": "radio",
+        "title": "Танд компаниас олгосон тэтгэмж, хөнгөлөлтүүд (эрүүл мэндийн даатгал, цалинтай чөлөө, тэтгэмж гэх мэт) нь үнэ цэнтэй, ач холбогдолтой байсан уу?",
+        "title_style": TITLE_CENTERED,
+        "options": [
+            "⭐⭐⭐\nТийм, үнэ цэнтэй ач холбогдолтой",
+            "⭐⭐\n Сайн, гэхдээ сайжруулах шаардлагатай ",
+            "⭐\nАч холбогдолгүй, үр ашиггүй",
+        ],
+    },
+    12: {
+        "answer_key": "Accuracy_Of_KPI_Evaluation",
+        "kind": "radio",
+        "title": 'Таны ажлын гүйцэтгэлийг (<span style="color: #ec1c24;">KPI, LTI</span>) үнэн зөв, шударга үнэлэн дүгнэдэг байсан уу?',
+        "title_style": TITLE_CENTERED,
+        "options": [
+            "⭐⭐⭐⭐\nШударга, үнэн зөв үнэлдэг",
+            "⭐⭐⭐\n Зарим нэг үзүүлэлт зөрүүтэй үнэлдэг ",
+            "⭐⭐\nҮнэлгээ миний гүйцэтгэлтэй нийцдэггүй ",
+            "⭐\nМиний гүйцэтгэлийг хэрхэн үнэлснийг би ойлгодоггүй",
+        ],
+    },
+    13: {
+        "answer_key": "Career_Growth_Opportunities",
+        "kind": "radio",
+        "title": 'Таны бодлоор компанидаа ажил, мэргэжлийн хувьд <span style="color: #ec1c24;">өсөж, хөгжих</span> боломж хангалттай байсан уу?',
+        "title_style": TITLE_CENTERED,
+        "options": [
+            "⭐⭐⭐\nӨсөж хөгжих боломж хангалттай байдаг",
+            "⭐⭐\nХангалттай биш",
+            "⭐\nӨсөж хөгжих боломж байдаггүй",
+        ],
+    },
+    14: {
+        "answer_key": "Quality_Of_Training_Programs",
+        "kind": "image_choice",
+        "title": 'Компаниас зохион байгуулдаг <span style="color: #ec1c24;"> сургалтууд </span> чанартай үр дүнтэй байж таныг ажил мэргэжлийн ур чадвараа нэмэгдүүлэхэд дэмжлэг үзүүлж чадсан уу?',
+        "title_style": TITLE_CENTERED,
+        "options": [
+            {"label": "Маш сайн", "image": _img(15)},
+            {"label": "Сайн, гэхдээ сайжруулах шаардлагатай", "image": _img(5)},
+            {"label": "Үр дүнгүй", "image": _img(9)},
+        ],
+        "image_height": 150,
+        "label_size": "1rem",
+    },
+    15: {
+        "answer_key": "Loyalty",
+        "kind": "image_choice",
+        "title": 'Та ойрын хүрээлэлдээ "<span style="color: #ec1c24;">АПУ ХХК</span>" -т ажилд орохыг санал болгох уу?',
+        "title_style": TITLE_CENTERED,
+        "options": [
+            {"label": "Тийм", "image": _img(25)},
+            {"label": "Үгүй", "image": _img(16)},
+        ],
+        "image_height": 180,
+    },
+}
+
+
+def question_images():
+    """(image path, rendered height) for every picture the registry shows."""
+    found = set()
+    for q in QUESTIONS.values():
+        if q["kind"] == "image_choice":
+            for opt in q["options"]:
+                found.add((opt["image"], q["image_height"]))
+    return sorted(found)
@@ -0,0 +1,46 @@
+# reason_codes.py
+# Stable integer codes for the Reason_for_Leaving options (page 3). The analytics rollup
+# already has one row per selected reason (the BITAND split in analytics.py), so reason
+# frequencies and top-N per segment are plain group-bys over these codes.
+import pandas as pd
+
+from codebook import CODEBOOK
+from questions import QUESTIONS
+
+REASON_PAGE = 3
+REASON_KEY = QUESTIONS[REASON_PAGE]["answer_key"]
+REASON_COLUMN = REASON_KEY.upper()
+OTHER_REASON_CODE = 0  # text that is not one of the options (edited / legacy answers)
+
+# The codebook codes (1-based option positions), so these match what APU_SURVEY_ANSWERS stores
+REASON_CODES = CODEBOOK[REASON_KEY]
+REASON_LABELS = {code: label for label, code in REASON_CODES.items()}
+REASON_LABELS[OTHER_REASON_CODE] = "Бусад"
+
+
+def encode_reasons(labels: pd.Series) -> pd.Series:
+    """Reason label -> code (OTHER_REASON_CODE for unknown text), as int16."""
+    return labels.astype(str).str.strip().map(REASON_CODES).fillna(OTHER_REASON_CODE).astype("int16")
+
+
+def top_reasons(reasons: pd.DataFrame, by=(), n=3, weight=None) -> pd.DataFrame:
+    """Top `n` reason codes per `by` segment from one-reason-per-row data (rows, or `weight` column summed).
+
+    Columns: *by, REASON_CODE, REASON, RESPONSES, SHARE (of that segment's reason mentions).
+    """
+    by = list(by)
+    keys = by + ["REASON_CODE"]
+    if weight is None:
+        counts = reasons.groupby(keys, observed=True).size()
+    else:
+        counts = reasons.groupby(keys, observed=True)[weight].sum()
+    counts = counts[counts > 0].rename("RESPONSES").reset_index()
+    if counts.empty:
+        return counts.assign(REASON=pd.Series(dtype=str), SHARE=pd.Series(dtype=float))
+
+    totals = counts.groupby(by, observed=True)["RESPONSES"].transform("sum") if by else counts["RESPONSES"].sum()
+    counts["SHARE"] = counts["RESPONSES"] / totals
+    counts = counts.sort_values(by + ["RESPONSES", "REASON_CODE"], ascending=[True] * len(by) + [False, True])
+    top = counts.groupby(by, observed=True).head(n) if by else counts.head(n)
+    top.insert(len(keys), "REASON", top["REASON_CODE"].map(REASON_LABELS))
+    return top.reset_index(drop=True)
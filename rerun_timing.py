@@ -0,0 +1,237 @@
+# rerun_timing.py
+# Where a rerun's time goes. Spans (`with span("name"):` or the @timed("name") decorator) wrap
+# the hot path - font injection, the CSS st.markdown blocks, image sources, components.html,
+# storage calls - and every finished rerun adds its span times to per-page histograms kept in
+# process memory. HR admins see them in a panel on the submitted-surveys page; each rerun can
+# also be appended as one JSON line to a log file.
+#
+# Off by default. Enable under [rerun_timing] in secrets.toml:
+#   enabled = true
+#   admins = ["hr_user"]                     # HR logins that see the timing panel
+#   log_path = ".spool/rerun_timing.jsonl"   # optional JSON-lines log, one line per rerun
+# When off, no rerun is open: span() hands back a shared no-op context manager and @timed
+# functions call straight through after one thread-local lookup.
+#
+# Span times are inclusive (a storage call inside another span counts in both). A rerun cut
+# short by st.stop() / st.rerun() before the routing at the bottom of the app is not recorded.
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+
+# ---- Defaults (override under [rerun_timing] in secrets.toml) ----
+DEFAULT_MAX_SAMPLES = 500   # recent durations kept per (page, span) for the percentiles
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)  # histogram upper bounds
+
+RERUN = "rerun"  # span name of the whole script run
+
+_local = threading.local()  # .rerun: the open rerun of this script thread (None when off); .page
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("spans", "name", "started")
+
+    def __init__(self, spans, name):
+        self.spans = spans
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        entry = self.spans.get(self.name)
+        if entry is None:
+            self.spans[self.name] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+        return False
+
+
+def span(name):
+    """Context manager timing its block as `name` in the current rerun (no-op when off)."""
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        return _NO_SPAN
+    return _Span(rerun["spans"], name)
+
+
+def timed(name):
+    """Decorator: every call of the function is a span."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            rerun = getattr(_local, "rerun", None)
+            if rerun is None:
+                return fn(*args, **kwargs)
+            with _Span(rerun["spans"], name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def current_page():
+    """Page label of the rerun on this thread (None outside a script run), enabled or not."""
+    return getattr(_local, "page", None)
+
+
+def instrumented(prefix):
+    """Class decorator: every public method is a span "<prefix>.<method>"."""
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if callable(value) and not attr.startswith("_"):
+                setattr(cls, attr, timed(f"{prefix}.{attr}")(value))
+        return cls
+    return decorate
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "max", "buckets", "samples")
+
+    def __init__(self, max_samples):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # the last one is "over the largest bound"
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.samples.append(ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, q):
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+    def info(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "max_ms": round(self.max, 2),
+            "buckets": dict(zip([f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"], self.buckets)),
+        }
+
+
+class RerunTimings:
+    """Per-page histograms of rerun and span durations for one server process."""
+
+    def __init__(self, enabled=False, admins=(), log_path=None, max_samples=DEFAULT_MAX_SAMPLES):
+        self.enabled = enabled
+        self.admins = frozenset(admins)
+        self.log_path = log_path
+        self.max_samples = max_samples
+
+        self._lock = threading.Lock()
+        self._pages = {}  # page -> {span name -> _Histogram}
+        self._log = None
+
+    # ---- per rerun ----
+    def begin(self, page=None):
+        """Open a rerun on this script thread (only when enabled); page labels it until page()."""
+        _local.page = page
+        _local.rerun = {"started": time.perf_counter(), "spans": {}} if self.enabled else None
+
+    @contextmanager
+    def page(self, name):
+        """Around the page routing: on exit the open rerun is recorded under page `name`."""
+        _local.page = name
+        outcome = "ok"
+        try:
+            yield
+        except BaseException as e:  # st.stop() / st.rerun() end most pages with an exception
+            outcome = {"StopException": "stop", "RerunException": "rerun"}.get(type(e).__name__, "error")
+            raise
+        finally:
+            rerun = getattr(_local, "rerun", None)
+            _local.rerun = None
+            if rerun is not None:
+                self.record(str(name), time.perf_counter() - rerun["started"], rerun["spans"], outcome)
+
+    def record(self, page, seconds, spans, outcome="ok"):
+        with self._lock:
+            histograms = self._pages.setdefault(page, {})
+            for name, elapsed in ((RERUN, seconds), *((n, s) for n, (_, s) in spans.items())):
+                hist = histograms.get(name)
+                if hist is None:
+                    hist = histograms[name] = _Histogram(self.max_samples)
+                hist.add(elapsed)
+            if self.log_path:
+                self._write_log_locked({
+                    "ts": datetime.now().isoformat(timespec="milliseconds"),
+                    "page": page,
+                    "outcome": outcome,
+                    "ms": round(seconds * 1000, 2),
+                    "spans": {n: {"count": c, "ms": round(s * 1000, 2)} for n, (c, s) in spans.items()},
+                })
+
+    def _write_log_locked(self, entry):
+        try:
+            if self._log is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                self._log = open(self.log_path, "a", encoding="utf-8", buffering=1)
+            self._log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            self.log_path = None  # unwritable: keep the in-memory histograms only
+
+    # ---- admin panel ----
+    def is_admin(self, user) -> bool:
+        return self.enabled and user in self.admins
+
+    def info(self) -> dict:
+        """{page: {span name: count / mean / p50 / p95 / max ms and bucket counts}}"""
+        with self._lock:
+            return {page: {name: h.info() for name, h in spans.items()} for page, spans in self._pages.items()}
+
+    def reset(self):
+        with self._lock:
+            self._pages.clear()
+
+
+def _timing_config() -> dict:
+    try:
+        return st.secrets.get("rerun_timing", {})
+    except Exception:  # no secrets.toml at all
+        return {}
+
+
+@st.cache_resource
+def get_rerun_timings() -> RerunTimings:
+    """One set of rerun timings per Streamlit server process."""
+    cfg = _timing_config()
+    return RerunTimings(
+        enabled=bool(cfg.get("enabled", False)),
+        admins=tuple(cfg.get("admins", ())),
+        log_path=cfg.get("log_path"),
+        max_samples=int(cfg.get("max_samples", DEFAULT_MAX_SAMPLES)),
+    )
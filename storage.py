@@ -0,0 +1,395 @@
+# storage.py
+# Storage backends for the employee master, survey answers, links, interviews and link
+# revocations. SnowflakeStorage runs the data_access statements through the session pool;
+# SQLiteStorage keeps the same tables in one local SQLite file, so the app, benchmarks and
+# load tests run without a Snowflake account. Pick one with `backend` under [storage] in
+# secrets.toml ("snowflake", the default, or "sqlite").
+#
+# Both return the same shapes: DataFrames with the Snowflake column names, dicts for single
+# rows, datetimes for SUBMITTED_AT. The summary table, analytics rollup and bulk exports are
+# Snowflake features and are not part of this interface.
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import data_access as da
+from codebook import ANSWER_COLUMNS, answer_codes_ready, decode_answer
+from config import ANSWER_TABLE, EMPLOYEE_TABLE, INTERVIEW_TABLE, LINK_REVOCATION_TABLE, LINK_TABLE
+from db_session import get_session_pool
+from query_telemetry import collect
+from rerun_timing import instrumented
+
+DEFAULT_BACKEND = "snowflake"
+DEFAULT_SQLITE_PATH = ".spool/apu_exit_survey.sqlite3"
+
+
+@instrumented("storage")
+class SnowflakeStorage:
+    """The Snowflake tables; every method runs data_access statements through run()."""
+
+    name = "snowflake"
+
+    def __init__(self, run):
+        self._run = run  # run(fn(session)) -> result, e.g. SessionPool.run
+        self._revocations_ensured = False
+        self._answer_codes_ready = False
+
+    def answer_codes_ready(self) -> bool:
+        """Has tools/migrate_answer_codes.py run? (checked until it says yes, then remembered)"""
+        if not self._answer_codes_ready:
+            self._answer_codes_ready = self._run(answer_codes_ready)
+        return self._answer_codes_ready
+
+    # ---- employees ----
+    def load_employees(self, watermark_column, since=None) -> pd.DataFrame:
+        return self._run(lambda s: da.fetch_employees(s, watermark_column, since))
+
+    def employee_confirmation(self, empcode):
+        return self._run(lambda s: da.fetch_employee_confirmation(s, empcode))
+
+    def already_submitted(self, empcode) -> bool:
+        return self._run(lambda s: da.fetch_already_submitted(s, empcode))
+
+    def employees_for_links(self, empcodes) -> pd.DataFrame:
+        return self._run(lambda s: da.fetch_employees_for_links(s, empcodes))
+
+    # ---- survey answers ----
+    def insert_survey_answers(self, rows):
+        self._run(lambda s: da.insert_survey_answers_batch(s, rows))
+
+    def latest_survey_answers(self, empcode) -> pd.DataFrame:
+        return self._run(lambda s: da.fetch_latest_survey_answers(s, empcode))
+
+    # ---- links ----
+    def insert_survey_links(self, rows):
+        rows = list(rows)
+        self._run(lambda s: da.insert_survey_links(s, rows))
+
+    def link_for_token(self, token):
+        return self._run(lambda s: da.fetch_link(s, token))
+
+    def revocations(self) -> list:
+        def _load(session):
+            self._ensure_revocations(session)
+            return da.fetch_revocations(session)
+        return self._run(_load)
+
+    def revoke(self, token_id=None, empcode=None):
+        def _insert(session):
+            self._ensure_revocations(session)
+            da.insert_revocation(session, token_id, empcode)
+        self._run(_insert)
+
+    def _ensure_revocations(self, session):
+        if not self._revocations_ensured:
+            collect(session, da.LINK_REVOCATION_DDL)
+            self._revocations_ensured = True
+
+    # ---- interviews ----
+    def insert_interview_answers(self, row: dict):
+        self._run(lambda s: da.insert_interview_answers(s, row))
+
+    def answer_watermarks(self, from_summary=False):
+        return self._run(lambda s: da.fetch_answer_watermarks(s, from_summary=from_summary))
+
+    def pending_interviews(self, since=None, from_summary=False) -> list:
+        return self._run(lambda s: da.fetch_pending_interviews(s, since, from_summary=from_summary))
+
+    def new_interviews(self, since=None) -> list:
+        return self._run(lambda s: da.fetch_new_interviews(s, since))
+
+    # ---- HR list ----
+    def submitted_surveys(self, date_from=None, date_to=None, company=None, department=None,
+                          limit=50, offset=0, from_summary=False) -> pd.DataFrame:
+        return self._run(lambda s: da.fetch_submitted_surveys(
+            s, date_from, date_to, company, department, limit=limit, offset=offset, from_summary=from_summary,
+        ))
+
+    def count_submitted_surveys(self, date_from=None, date_to=None, company=None, department=None,
+                                from_summary=False) -> int:
+        return self._run(lambda s: da.count_submitted_surveys(
+            s, date_from, date_to, company, department, from_summary=from_summary,
+        ))
+
+
+# ---- SQLite ----
+_SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {EMPLOYEE_TABLE} (
+    {', '.join(f'{c} TEXT' for c in da.EMPLOYEE_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS employees_empcode ON {EMPLOYEE_TABLE} (EMPCODE, LASTHIREDDATE);
+
+CREATE TABLE IF NOT EXISTS {ANSWER_TABLE} (
+    EMPCODE TEXT, SURVEY_TYPE TEXT, SUBMITTED_AT TEXT,
+    {', '.join(f'{c} INTEGER' for c in ANSWER_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS answers_empcode ON {ANSWER_TABLE} (EMPCODE, SUBMITTED_AT);
+CREATE INDEX IF NOT EXISTS answers_submitted_at ON {ANSWER_TABLE} (SUBMITTED_AT);
+
+CREATE TABLE IF NOT EXISTS {LINK_TABLE} (
+    TOKEN TEXT, EMPCODE TEXT, SURVEY_TYPE TEXT,
+    CREATED_AT TEXT DEFAULT (STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))
+);
+CREATE INDEX IF NOT EXISTS links_token ON {LINK_TABLE} (TOKEN);
+
+CREATE TABLE IF NOT EXISTS {INTERVIEW_TABLE} (
+    {', '.join(f'{c}' for c in da.INTERVIEW_ANSWER_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS interviews_emp_code ON {INTERVIEW_TABLE} (EMP_CODE, SUBMITTED_AT);
+
+CREATE TABLE IF NOT EXISTS {LINK_REVOCATION_TABLE} (
+    TOKEN_ID TEXT, EMPCODE TEXT,
+    REVOKED_AT TEXT DEFAULT (STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))
+);
+"""
+
+# Latest hire row per EMPCODE (NULL hire dates last), like the Snowflake QUALIFY
+_LATEST_EMPLOYEE_SQL = f"""
+    SELECT * FROM (
+        SELECT e.*, ROW_NUMBER() OVER (
+            PARTITION BY EMPCODE ORDER BY LASTHIREDDATE IS NULL, LASTHIREDDATE DESC
+        ) AS _RN
+        FROM {EMPLOYEE_TABLE} e
+        {{where}}
+    ) WHERE _RN = 1
+"""
+_SUBMITTED_FLAG_SQL = f"""
+    EXISTS (SELECT 1 FROM {ANSWER_TABLE} a WHERE a.EMPCODE = e.EMPCODE AND a.SUBMITTED_AT IS NOT NULL)
+"""
+_CONFIRMATION_COLUMNS = (
+    "EMPCODE", "LASTNAME", "FIRSTNAME", "COMPANYNAME", "HEADDEPNAME", "POSNAME", "GROUPYEAR", "LASTHIREDDATE",
+)
+
+
+def _param(v):
+    """Bind value for SQLite: timestamps / dates as ISO text (they compare in time order)."""
+    if isinstance(v, (datetime, pd.Timestamp)):
+        return v.isoformat(sep=" ")
+    if isinstance(v, date):
+        return v.isoformat()
+    return v
+
+
+def _ts(v):
+    return None if v is None else datetime.fromisoformat(v)
+
+
+@instrumented("storage")
+class SQLiteStorage:
+    """The same tables in a local SQLite file (answers stored as codebook codes, like Snowflake).
+
+    from_summary is accepted and ignored: there is no summary table, the live queries are cheap.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        self.statements = 0             # statements run by script runs so far (benchmarks read it per step)
+        self.background_statements = 0  # ... and by threads outside a script run (queue flusher, refreshers)
+        self._count_lock = threading.Lock()
+        self._local = threading.local()  # one connection per thread
+        db_dir = os.path.dirname(path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SQLITE_SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        return conn
+
+    def _count(self):
+        with self._count_lock:
+            if get_script_run_ctx(suppress_warning=True) is None:
+                self.background_statements += 1
+            else:
+                self.statements += 1
+
+    def _all(self, q, params=()):
+        self._count()
+        return self._connect().execute(q, [_param(p) for p in params]).fetchall()
+
+    def _frame(self, q, params=()):
+        self._count()
+        cur = self._connect().execute(q, [_param(p) for p in params])
+        return pd.DataFrame(cur.fetchall(), columns=[d[0] for d in cur.description])
+
+    def _insert(self, table, columns, rows):
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        self._count()
+        with self._connect() as conn:
+            conn.executemany(sql, [[_param(v) for v in row] for row in rows])
+
+    def answer_codes_ready(self) -> bool:
+        return True  # the local schema stores codes from the start
+
+    # ---- employees ----
+    def import_employees(self, df: pd.DataFrame, replace=False):
+        """Load employee master rows (EMPLOYEE_COLUMNS; missing ones are NULL)."""
+        df = df.reindex(columns=list(da.EMPLOYEE_COLUMNS)).astype(object)
+        df = df.where(df.notna(), None)
+        df["EMPCODE"] = df["EMPCODE"].astype(str)
+        if replace:
+            with self._connect() as conn:
+                conn.execute(f"DELETE FROM {EMPLOYEE_TABLE}")
+        self._insert(EMPLOYEE_TABLE, da.EMPLOYEE_COLUMNS, df.itertuples(index=False, name=None))
+
+    def load_employees(self, watermark_column, since=None) -> pd.DataFrame:
+        q = f"SELECT {', '.join(da.EMPLOYEE_COLUMNS)} FROM {EMPLOYEE_TABLE}"
+        if since is None:
+            return self._frame(q)
+        return self._frame(q + f" WHERE {watermark_column} >= ?", [since])  # see da.fetch_employees
+
+    def employee_confirmation(self, empcode):
+        q = _LATEST_EMPLOYEE_SQL.format(where="WHERE EMPCODE = ?")
+        q = f"SELECT {', '.join(f'e.{c}' for c in _CONFIRMATION_COLUMNS)}, {_SUBMITTED_FLAG_SQL} FROM ({q}) e"
+        rows = self._all(q, [str(empcode)])
+        if not rows:
+            return None
+        return {**dict(zip(_CONFIRMATION_COLUMNS, rows[0])), "ALREADY_SUBMITTED": bool(rows[0][-1])}
+
+    def already_submitted(self, empcode) -> bool:
+        q = f"SELECT 1 FROM {ANSWER_TABLE} WHERE EMPCODE = ? AND SUBMITTED_AT IS NOT NULL LIMIT 1"
+        return bool(self._all(q, [str(empcode)]))
+
+    def employees_for_links(self, empcodes) -> pd.DataFrame:
+        q = _LATEST_EMPLOYEE_SQL.format(where="WHERE EMPCODE IN (SELECT value FROM json_each(?))")
+        q = f"SELECT {', '.join(f'e.{c}' for c in _CONFIRMATION_COLUMNS)}, {_SUBMITTED_FLAG_SQL} AS ALREADY_SUBMITTED FROM ({q}) e"
+        df = self._frame(q, [json.dumps([str(c) for c in empcodes])])
+        df["ALREADY_SUBMITTED"] = df["ALREADY_SUBMITTED"].astype(bool)
+        return df
+
+    # ---- survey answers ----
+    def insert_survey_answers(self, rows):
+        self._insert(ANSWER_TABLE, da.SURVEY_ANSWER_COLUMNS, [da.survey_answer_params(row) for row in rows])
+
+    def latest_survey_answers(self, empcode) -> pd.DataFrame:
+        df = self._frame(
+            f"SELECT {', '.join(da.SURVEY_ANSWER_COLUMNS)} FROM {ANSWER_TABLE} "
+            "WHERE EMPCODE = ? ORDER BY SUBMITTED_AT DESC LIMIT 1",
+            [str(empcode)],
+        )
+        for key in ANSWER_COLUMNS:
+            df[key] = [decode_answer(key, None if pd.isna(v) else v) for v in df[key]]
+        df["SUBMITTED_AT"] = pd.to_datetime(df["SUBMITTED_AT"])
+        return df
+
+    # ---- links ----
+    def insert_survey_links(self, rows):
+        self._insert(LINK_TABLE, da.SURVEY_LINK_COLUMNS, rows)
+
+    def link_for_token(self, token):
+        rows = self._all(
+            f"SELECT EMPCODE, SURVEY_TYPE FROM {LINK_TABLE} WHERE TOKEN = ? ORDER BY CREATED_AT DESC LIMIT 1",
+            [token],
+        )
+        return rows[0] if rows else None
+
+    def revocations(self) -> list:
+        return self._all(
+            f"SELECT TOKEN_ID, EMPCODE, (JULIANDAY(REVOKED_AT) - 2440587.5) * 86400.0 FROM {LINK_REVOCATION_TABLE}"
+        )
+
+    def revoke(self, token_id=None, empcode=None):
+        self._insert(LINK_REVOCATION_TABLE, ("TOKEN_ID", "EMPCODE"),
+                     [(token_id, None if empcode is None else str(empcode))])
+
+    # ---- interviews ----
+    def insert_interview_answers(self, row: dict):
+        self._insert(INTERVIEW_TABLE, da.INTERVIEW_ANSWER_COLUMNS,
+                     [[da.blank_to_none(row.get(c)) for c in da.INTERVIEW_ANSWER_COLUMNS]])
+
+    def answer_watermarks(self, from_summary=False):
+        row = self._all(
+            f"SELECT (SELECT MAX(SUBMITTED_AT) FROM {ANSWER_TABLE}), (SELECT MAX(SUBMITTED_AT) FROM {INTERVIEW_TABLE})"
+        )[0]
+        return _ts(row[0]), _ts(row[1])
+
+    def pending_interviews(self, since=None, from_summary=False) -> list:
+        q = f"""
+            SELECT a.EMPCODE, MAX(a.SUBMITTED_AT)
+            FROM {ANSWER_TABLE} a
+            WHERE a.SUBMITTED_AT {'IS NOT NULL' if since is None else '>= ?'}
+              AND NOT EXISTS (SELECT 1 FROM {INTERVIEW_TABLE} i WHERE i.EMP_CODE = a.EMPCODE)
+            GROUP BY a.EMPCODE
+        """
+        return [(str(r[0]), _ts(r[1])) for r in self._all(q, [] if since is None else [since])]
+
+    def new_interviews(self, since=None) -> list:
+        q = f"SELECT DISTINCT EMP_CODE FROM {INTERVIEW_TABLE}"
+        if since is None:
+            return [str(r[0]) for r in self._all(q)]
+        return [str(r[0]) for r in self._all(q + " WHERE SUBMITTED_AT >= ?", [since])]
+
+    # ---- HR list ----
+    def _submitted_where(self, date_from, date_to, company, department):
+        clauses, params = ["a.SUBMITTED_AT IS NOT NULL"], []
+        if date_from is not None:
+            clauses.append("a.SUBMITTED_AT >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("a.SUBMITTED_AT < DATE(?, '+1 day')")  # date_to is inclusive
+            params.append(date_to)
+        emp_clauses = []
+        if company:
+            emp_clauses.append("COMPANYNAME = ?")
+            params.append(company)
+        if department:
+            emp_clauses.append("DEPNAME = ?")
+            params.append(department)
+        if emp_clauses:
+            latest = _LATEST_EMPLOYEE_SQL.format(where="")
+            clauses.append(f"a.EMPCODE IN (SELECT EMPCODE FROM ({latest}) WHERE {' AND '.join(emp_clauses)})")
+        return "WHERE " + " AND ".join(clauses), params
+
+    def submitted_surveys(self, date_from=None, date_to=None, company=None, department=None,
+                          limit=50, offset=0, from_summary=False) -> pd.DataFrame:
+        where, params = self._submitted_where(date_from, date_to, company, department)
+        df = self._frame(f"""
+            SELECT
+                a.EMPCODE      AS EMP_CODE,
+                a.SUBMITTED_AT AS SUBMITTED_AT,
+                '✅'           AS SURVEY_DONE,
+                CASE WHEN EXISTS (SELECT 1 FROM {INTERVIEW_TABLE} i WHERE i.EMP_CODE = a.EMPCODE)
+                     THEN '✅' ELSE '❌' END AS INTERVIEW_DONE
+            FROM {ANSWER_TABLE} a
+            {where}
+            ORDER BY a.SUBMITTED_AT DESC, a.EMPCODE
+            LIMIT ? OFFSET ?
+        """, params + [int(limit), int(offset)])
+        df["SUBMITTED_AT"] = pd.to_datetime(df["SUBMITTED_AT"])
+        return df
+
+    def count_submitted_surveys(self, date_from=None, date_to=None, company=None, department=None,
+                                from_summary=False) -> int:
+        where, params = self._submitted_where(date_from, date_to, company, department)
+        return int(self._all(f"SELECT COUNT(*) FROM {ANSWER_TABLE} a {where}", params)[0][0])
+
+
+def _storage_config() -> dict:
+    try:
+        return st.secrets.get("storage", {})
+    except Exception:  # no secrets.toml at all
+        return {}
+
+
+@st.cache_resource
+def get_storage():
+    """The configured storage backend, one per Streamlit server process."""
+    cfg = _storage_config()
+    backend = cfg.get("backend", DEFAULT_BACKEND)
+    if backend == "sqlite":
+        return SQLiteStorage(cfg.get("path", DEFAULT_SQLITE_PATH))
+    if backend == "snowflake":
+        return SnowflakeStorage(get_session_pool().run)
+    raise ValueError(f"unknown storage backend: {backend!r}")
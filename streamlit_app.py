@@ -1,47 +1,55 @@
 import streamlit as st
-from snowflake.snowpark import Session
 from app_setup import apply_custom_font
+from db_session import get_session_pool
 import streamlit.components.v1 as components
+from rerun_timing import get_rerun_timings, span
 
 
-apply_custom_font()
+# ---- TIMING PAGE NAMES ----
+TIMING_PAGE_NAMES = {-2: "analytics", -1: "submitted_list", -0.5: "directory", 0: "category"}
+
 
-def get_session():
-    return Session.builder.configs(st.secrets["connections"]["snowflake"]).create()
+def timing_page_name():
+    """Page label the rerun timings (rerun_timing.py) are grouped by."""
+    if not st.session_state.get("logged_in"):
+        return "link" if st.query_params.get("mode") == "link" else "login"
+    page = st.session_state.get("page")
+    return TIMING_PAGE_NAMES.get(page, page)
 
-# ---- CONFIGURATION ----
-COMPANY_NAME = "АПУ ХК"
-SCHEMA_NAME = "APU"
-EMPLOYEE_TABLE = "APU_EMP_DATA"
-LOGO_URL = "https://i.imgur.com/DgCfZ9B.png"
 
-# --- Snowflake credentials (replace with your actual or use Streamlit secrets) ---
-SNOWFLAKE_USER = "YOUR_USER"
-SNOWFLAKE_PASSWORD = "YOUR_PASSWORD"
-SNOWFLAKE_ACCOUNT = "YOUR_ACCOUNT"
-SNOWFLAKE_WAREHOUSE = "YOUR_WAREHOUSE"
-SNOWFLAKE_DATABASE = "CDNA_HR_DATA"
+get_rerun_timings().begin(timing_page_name())
+apply_custom_font()
 
 
 # ---- CONFIG ----
-
-COMPANY_NAME = "АПУ ХК"
-SCHEMA_NAME = "APU"
-EMPLOYEE_TABLE = "APU_EMP_DATA_JULY2025"
-ANSWER_TABLE = f"{SCHEMA_NAME}_SURVEY_ANSWERS"
-DATABASE_NAME = "CDNA_HR_DATA"
-LOGO_URL = "https://i.imgur.com/DgCfZ9B.png"
-LINK_TABLE = f"{SCHEMA_NAME}_SURVEY_LINKS"  # -> APU_SURVEY_LINKS
-BASE_URL = "https://apu-exit-survey-cggmobn4x6kmsmpavyuu5z.streamlit.app/"  
-# BASE_URL = "http://localhost:8501/"  
-INTERVIEW_TABLE = f"{SCHEMA_NAME}_INTERVIEW_ANSWERS"
+from config import BASE_URL, COMPANY_NAME, LOGO_URL
 
 
 # ---- Answer storing ----
+import os
 from datetime import datetime
+from string import Template
+from data_access import SURVEY_ANSWER_COLUMNS
+from storage import get_storage
+from employee_directory import get_employee_directory
+from assets import image_src
+from questions import QUESTIONS
+from navigation import SURVEY_END, plan_for, total_questions_number_dict
+from survey_types import survey_types, categorize_employment_duration, choose_survey_type_for_db, total_months_from_mn_duration
+from pending_interviews import get_pending_interviews
+from exit_summary import get_exit_summary
+from analytics import answer_counts, filter_rollup, get_exit_rollup, likert_means, load_rollup, monthly_responses, question_label, top_reasons_by_segment
+from exports import MAX_DOWNLOAD_BYTES, ExportTooLarge, available_formats, export_answers
+from hr_views import SUBMITTED_PAGE_SIZE, invalidate_submitted_surveys, load_already_submitted, load_submitted_count, load_submitted_page
+from survey_links import LINK_CATEGORIES, STATUS_CREATED, generate_links, issue_link, parse_link_requests, read_link_requests_csv
+from link_cache import get_link_cache
+from query_telemetry import get_query_telemetry
+from survey_tokens import InvalidToken, get_revocation_list, get_token_signer, is_signed_token
+from submission_queue import get_submission_queue, PENDING, FLUSHED
 
 # # CSS animation
-st.markdown("""
+with span("st.markdown css"):
+    st.markdown("""
 <style>
 .stHorizontalBlock, .stElementContainer,.stMarkdown, .stMarkdownContainer, .stColumn,h1>p {
     animation: fadeIn 1s ease-in-out;
@@ -57,62 +65,28 @@ st.markdown("""
 
 
 
+def build_survey_answer_row() -> dict:
+    """Answers collected in session_state, keyed by APU_SURVEY_ANSWERS column."""
+    row = {
+        "EMPCODE": st.session_state.get("confirmed_empcode"),
+        "SURVEY_TYPE": st.session_state.get("survey_type", ""),
+        "SUBMITTED_AT": datetime.utcnow(),
+    }
+    for col in SURVEY_ANSWER_COLUMNS[3:]:
+        row[col] = st.session_state.answers.get(col, "")
+    return row
+
+
 def submit_answers():
-    emp_code = st.session_state.get("confirmed_empcode")
-    first_name = st.session_state.get("confirmed_firstname")
-    survey_type = st.session_state.get("survey_type", "")
-    schema = SCHEMA_NAME
-    table = f"{schema}_SURVEY_ANSWERS"
-    submitted_at = datetime.utcnow()
-    a = st.session_state.answers
-
-    values = [
-        emp_code,
-        survey_type,
-        submitted_at,
-        a.get("Reason_for_Leaving", ""),
-        a.get("Onboarding_Effectiveness", ""),
-        a.get("Unexpected_Responsibilities", ""),
-        a.get("Feedback", ""),
-        a.get("Leadership_Style", ""),
-        a.get("Team_Collaboration_Satisfaction", ""),
-        a.get("Motivation_In_Daily_Work", ""),
-        a.get("Work_Life_Balance", ""),
-        a.get("Value_Of_Benefits", ""),
-        a.get("Accuracy_Of_KPI_Evaluation", ""),
-        a.get("Career_Growth_Opportunities", ""),
-        a.get("Quality_Of_Training_Programs", ""),
-        a.get("Loyalty", ""),
-    ]
+    """Hand the answers to the write-behind queue; the flush to Snowflake happens in the background."""
+    row = build_survey_answer_row()
+    if st.session_state.get("submission_id") and st.session_state.get("submission_empcode") == row["EMPCODE"]:
+        return True  # already queued on an earlier rerun
 
     try:
-        session = get_session()
-
-        escaped_values = ["'{}'".format(str(v).replace("'", "''")) if v is not None else "''" for v in values]
-
-        insert_query = f"""
-            INSERT INTO {table} (
-                EMPCODE, 
-                SURVEY_TYPE, 
-                SUBMITTED_AT,
-                Reason_for_Leaving,
-                Onboarding_Effectiveness,
-                Unexpected_Responsibilities,
-                Feedback,
-                Leadership_Style,
-                Team_Collaboration_Satisfaction,
-                Motivation_In_Daily_Work,
-                Work_Life_Balance,
-                Value_Of_Benefits,
-                Accuracy_Of_KPI_Evaluation,
-                Career_Growth_Opportunities,
-                Quality_Of_Training_Programs,
-                Loyalty
-            )
-            VALUES ({','.join(escaped_values)})
-        """
-
-        session.sql(insert_query).collect()
+        st.session_state.submission_id = get_submission_queue().enqueue(row)
+        st.session_state.submission_empcode = row["EMPCODE"]
+        get_link_cache().invalidate_empcode(row["EMPCODE"])
         return True
 
     except Exception as e:
@@ -122,76 +96,6 @@ def submit_answers():
 
 
 
-# ---- Survey types per category ----
-survey_types = {
-    "КОМПАНИЙН САНААЧИЛГААР": ["1 жил хүртэл", "1-ээс дээш"],
-    "АЖИЛТНЫ САНААЧИЛГААР": [
-        "6 сар дотор гарч байгаа", "7 сараас 3 жил ",
-        "4-10 жил", "11 болон түүнээс дээш"
-    ],
-}
-
-# ---- Total questions number dictionary by survey type & employment duration ----
-total_questions_number_dict = {
-    "КОМПАНИЙН САНААЧИЛГААР": {"1 жил хүртэл" : {"start_idx": 2,"skip_idx": 0, "total_questions": 11}, "1-ээс дээш": {"start_idx": 3,"skip_idx": 0, "total_questions": 10}},
-    "АЖИЛТНЫ САНААЧИЛГААР": {"1 жил хүртэл" : {"start_idx": 1,"skip_idx": 0,"total_questions": 13}, "1-ээс дээш": {"start_idx": 1, "skip_idx": 2, "total_questions": 12}}
-}
-
-
-def choose_survey_type(category: str, total_months: int) -> str:
-    # КОМПАНИЙН САНААЧИЛГААР
-    if category == "КОМПАНИЙН САНААЧИЛГААР":
-        if total_months <= 12:
-            return "1 жил хүртэл"
-        else:
-            return "1-ээс дээш"
-    if category == "АЖИЛТНЫ САНААЧИЛГААР":
-        if total_months <= 12:
-            return "1 жил хүртэл"
-        else:
-            return "1-ээс дээш"
-
-    # Ажил хаяж явсан → always this type
-    if category == "Ажил хаяж явсан":
-        return "Мэдээлэл бүртгэх"
-
-    # fallback
-    return ""
-
-def choose_survey_type_for_db(category: str, total_months: int) -> str:
-    # Компанийн санаачилгаар
-    if category == "КОМПАНИЙН САНААЧИЛГААР":
-        if total_months <= 12:
-            return "1 жил хүртэл"
-        else:
-            return "1-ээс дээш"
-
-    # Ажилтны санаачлагаар
-    if category == "АЖИЛТНЫ САНААЧИЛГААР":
-        if total_months <= 6:
-            return "6 сар дотор гарч байгаа"
-        elif total_months <= 36:
-            return "7 сараас 3 жил "
-        elif total_months <= 120:
-            return "4-10 жил"
-        else:
-            return "11 болон түүнээс дээш"
-
-    # Ажил хаяж явсан → always this type
-    if category == "Ажил хаяж явсан":
-        return "Мэдээлэл бүртгэх"
-
-    # fallback
-    return ""
-
-
-def categorize_employment_duration(total_months: int) -> str:
-    if total_months <= 12:
-            return "1 жил хүртэл"
-    else:
-        return "1-ээс дээш"
-    
-
 # ---- PAGE SETUP ----
 st.set_page_config(page_title=f"{COMPANY_NAME} Судалгаа", layout="wide")
 
@@ -206,7 +110,8 @@ def logo():
 def header():
     col1, col2 = st.columns(2)
 
-    st.markdown("""
+    with span("st.markdown css"):
+        st.markdown("""
     <style>
             div[data-testid="stHorizontalBlock"] {
                 align-items: center;
@@ -235,75 +140,37 @@ def header():
                 """, unsafe_allow_html=True)
 
 def progress_chart():
-    print(st.session_state.survey_type, '       session state')
-    st.markdown("""
+    with span("st.markdown css"):
+        st.markdown("""
             <style>
             div[data-testid="stProgress"] {
                 position: relative;
                 top: clamp(4rem, 5rem, 6rem);   
             }
             </style>""", unsafe_allow_html=True)
-    
-    total_questions_order = st.session_state.total_questions_order
 
-    if(total_questions_order != {}):
-        total_questions_number = total_questions_order.get("total_questions", 12)
+    plan = plan_for(st.session_state.total_questions_order)
+    if st.session_state.page not in plan:
+        return  # Skip showing progress outside the question pages
 
+    st.progress(plan.progress(st.session_state.page))
 
-    if st.session_state.page < 3:
-        return  # Skip showing progress before Q1 starts
-
-    current_page = st.session_state.page
-    question_index = max(1, current_page - 3)  # Never below 1
-    progress = min(100, max(0, int((question_index / total_questions_number) * 100)))  # Clamp between 0–100
-    
-    st.progress(progress)
+def _advance():
+    plan = plan_for(st.session_state.total_questions_order)
+    st.session_state.page = plan.next(st.session_state.page)
 
 def goToNextPage():
-    curr_page = st.session_state.page
-    total_questions_order= st.session_state.total_questions_order
-
-    start_idx = total_questions_order.get("start_idx", 0)
-    skip_idx = total_questions_order.get("skip_idx", 0)
-    total_questions = total_questions_order.get("total_questions", 0)
-    last_page_idx = start_idx + total_questions + 1
-    if(skip_idx != 0 ): 
-        last_page_idx+=1
-    
-    if(curr_page < last_page_idx):
-        next_page = curr_page + 1
-        if(next_page == skip_idx + 2):
-            st.session_state.page = next_page + 1
-        else:
-            st.session_state.page = next_page 
-    else: 
-        st.session_state.page = "survey_end"
+    _advance()
     st.rerun()
 
 def goToNextPageForRadio():
-    curr_page = st.session_state.page
-    total_questions_order= st.session_state.total_questions_order
-
-    start_idx = total_questions_order.get("start_idx", 0)
-    skip_idx = total_questions_order.get("skip_idx", 0)
-    total_questions = total_questions_order.get("total_questions", 0)
-    last_page_idx = start_idx + total_questions + 1
-    if(skip_idx != 0 ): 
-        last_page_idx+=1
-    
-    if(curr_page < last_page_idx):
-        next_page = curr_page + 1
-        if(next_page == skip_idx + 2):
-            st.session_state.page = next_page + 1
-        else:
-            st.session_state.page = next_page 
-    else: 
-        st.session_state.page = "survey_end"
-    # st.rerun()
+    # on_change callback: Streamlit reruns by itself afterwards
+    _advance()
 
 def nextPageBtn(disabled, answer_key, answer):
     col1,col2 = st.columns([5,1])
-    st.markdown("""
+    with span("st.markdown css"):
+        st.markdown("""
         <style>
                div[data-testid="stButton"] button{
                     justify-self: end;
@@ -329,121 +196,394 @@ def nextPageBtn(disabled, answer_key, answer):
 
 
 def begin_survey():
-    total_questions_order = st.session_state.total_questions_order
-    start_idx = total_questions_order.get("start_idx",1) 
-    st.session_state.page = start_idx + 2 #survey Q1 starts from page 3 
+    st.session_state.page = plan_for(st.session_state.total_questions_order).first
 
 
-def confirmEmployeeActions(empcode):
-    from datetime import date, datetime as dt  # for tenure calculation
-    def _to_date_safe(v):
-        try:
-            if isinstance(v, dt):
-                return v.date()
-            if isinstance(v, date):
-                return v
-            if v is None or str(v).strip() == "":
-                return None
-            return dt.fromisoformat(str(v).split(" ")[0]).date()
-        except Exception:
+# ---- QUESTION PAGES (rendered from the questions.py registry) ----
+ALIGN_COLUMNS_CSS = """
+    <style>
+            div[data-testid="stHorizontalBlock"] {
+                align-items: center;
+            }
+    </style>
+"""
+
+HIDE_TRIGGER_BUTTONS_CSS = """
+    <style>
+        div[data-testid="stButton"] button {
+            display: none !important;
+        }
+
+    /* Mobile layout */
+    @media (max-width: 900px) {
+        div[data-testid="stHorizontalBlock"] {
+            flex-direction: column !important;
+        }
+    }
+    </style>
+"""
+
+# --- Styling: make checkboxes look like buttons ---
+MULTI_SELECT_CSS = Template("""
+    <style>
+        /* Hide default checkbox icons */
+        div[data-testid="stCheckbox"] > label > span {
+            display: none;
+        }
+
+        div[data-testid="stVerticalBlock"]  {
+            display: flex !important;
+            flex-direction: row;
+            flex-wrap: wrap !important;
+        }
+
+        div[data-testid="stCheckbox"]  {
+            margin: 0 !important;
+            width: 100% !important;
+        }
+
+        /* Hide native checkbox */
+        div[data-testid="stCheckbox"] input {
+            position: absolute;
+            opacity: 0;
+            pointer-events: none;
+            width: 100% !important;
+        }
+
+        /* Style each label like a button */
+        div[data-testid="stCheckbox"] label {
+            border: 1px solid #d1d5db;
+            border-radius: 20px;
+            padding: $padding;
+            text-align: center;
+            cursor: pointer;
+            width: 100% !important;
+            transition: all 0.15s ease-in-out;
+            user-select: none;
+            white-space: pre-line;  /* Respect newline in label */
+        }
+
+        /* Subtitle */
+        div[data-testid="stCheckbox"] p {
+            font-size: $font_size;
+            color: #4b5563;
+        }
+
+        /* Hover effect */
+        div[data-testid="stCheckbox"] label:hover {
+            border-color: red !important;
+        }
+
+        div[data-testid="stCheckbox"] input[type="checkbox"]:checked + div,
+        div[data-testid="stCheckbox"] input[type="checkbox"]:checked ~ div,
+        div[data-testid="stCheckbox"] label:has(input[type="checkbox"]:checked) > div,
+        div[data-testid="stCheckbox"] label:has(input[type="checkbox"]:checked) {
+            border-color: #ec1c24;
+        }
+    </style>
+""")
+MULTI_SELECT_STYLES = {
+    "default": {"padding": "14px 20px", "font_size": "clamp(0.5rem, 1vw, 1rem)"},
+    # long option lists (Reason_for_Leaving) need tighter buttons to fit on one screen
+    "compact": {
+        "padding": "clamp(0.1rem, 0.5rem, 1.5rem) clamp(0.2rem, 0.6rem, 1.5rem)",
+        "font_size": "clamp(0.25rem, 0.8vw, 1rem)",
+    },
+}
+
+RADIO_CSS = """
+    <style>
+        /* Hide default radio buttons */
+        div[data-testid="stRadio"] > div > label > div:first-child {
+            display: none !important;
+        }
+
+        /* area that contains the text (Streamlit wraps text inside a div) */
+        div[data-testid="stRadio"] label > div {
+            /* respect newline characters in the option strings */
+            white-space: pre-line;
+        }
+
+        /* Style radio group container */
+        div[data-testid="stRadio"] > div {
+            gap: 10px;
+            justify-content: center;
+            align-items: center;
+        }
+        /* "H1"-like first line */
+        div[data-testid="stRadio"] label > div::first-line {
+            font-size: clamp(0.5rem, 1.5rem, 2rem);
+        }
+
+        /* Style each radio option like a button */
+        div[data-testid="stRadio"] label {
+            background-color: #fff;       /* default background */
+            width: 60%;
+            padding: 8px 16px;
+            border-radius: 8px;
+            cursor: pointer;
+            border: 1px solid #ccc;
+            transition: background-color 0.2s;
+            text-align: center;
+            justify-content: center;
+        }
+
+        label[data-testid="stWidgetLabel"]{
+            border: 0px !important;
+            font-size: 2px !important;
+            color: #898989;
+        }
+
+        /* Hover effect */
+        div[data-testid="stRadio"] label:hover {
+            border-color: #ec1c24;
+        }
+
+        /* Checked/selected option */
+        div[data-testid="stRadio"] input:checked + label {
+            background-color: #FF0000 !important; /* selected color */
+            color: white !important;
+            border-color: #ec1c24 !important;
+        }
+
+        /* Hide default radio circle */
+        div[data-testid="stRadio"] input[type="radio"] {
+            display: none;
+        }
+    </style>
+"""
+
+# Picture button drawn in an iframe; clicking it clicks the i-th hidden Streamlit trigger button
+IMAGE_BUTTON_HTML = """
+    <button id="imgBtn" style="
+        background: #fff;
+        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
+        border: 1px solid #ccc;
+        border-radius: 15px;
+        cursor: pointer;
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        justify-content: center;
+        gap: 1rem;
+        width: 100%;
+        max-width: 420px;
+        height: 25rem;
+    ">
+        <img src="{src}" width="auto" height="{height}">
+        <span style="font-size: {label_size}">{label}</span>
+    </button>
+
+    <script>
+        document.getElementById("imgBtn").onclick = () => {{
+            const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
+            if (btn.length > {index}) btn[{index}].click();
+        }};
+    </script>
+"""
+
+
+def question_title(question):
+    st.markdown(f"""
+        <h1 style="{question['title_style']}">
+                <p> {question['title']}</p>
+        </h1>
+    """, unsafe_allow_html=True)
+
+
+def render_multi_select(question):
+    col1, col2 = st.columns(2)
+    with col1:
+        question_title(question)
+    with col2:
+        style = MULTI_SELECT_STYLES[question.get("style", "default")]
+        with span("st.markdown css"):
+            st.markdown(MULTI_SELECT_CSS.substitute(style), unsafe_allow_html=True)
+
+        answer_key = question["answer_key"]
+        max_choices = question.get("max_choices", 3)
+        selected = []
+        for i, opt in enumerate(question["options"]):
+            if st.checkbox(opt, key=f"{answer_key}_{i}", disabled=len(selected) == max_choices):
+                selected.append(opt)
+
+    if selected:
+        nextPageBtn(len(selected) > max_choices, question["answer_key"], "; ".join(selected))
+    if len(selected) > max_choices:
+        st.warning(f"Хамгийн ихдээ {max_choices} төрлийг сонгоно уу")
+
+
+def render_image_choice(question):
+    col1, col2 = st.columns(2)
+    with col1:
+        question_title(question)
+    with col2:
+        with span("st.markdown css"):
+            st.markdown(HIDE_TRIGGER_BUTTONS_CSS, unsafe_allow_html=True)
+        options = question["options"]
+        height = question["image_height"]
+        label_size = question.get("label_size", "clamp(1.2rem, 2vw, 2rem)")
+
+        for i, (col, opt) in enumerate(zip(st.columns(len(options)), options)):
+            with col, span("components.html"):
+                components.html(IMAGE_BUTTON_HTML.format(
+                    src=image_src(opt["image"], height=height),
+                    height=height,
+                    label_size=label_size,
+                    label=opt["label"],
+                    index=i,
+                ), height=450)
+
+        answer_key = question["answer_key"]
+        pressed = False
+        for i, opt in enumerate(options):
+            pressed |= st.button(f"trigger{i + 1}", key=f"{answer_key}_{i}",
+                                 on_click=submitAnswer, args=(answer_key, opt["label"]))
+        if pressed:
+            goToNextPage()
+
+
+def _on_radio_change(answer_key):
+    submitAnswer(answer_key, st.session_state.get(answer_key))
+    goToNextPageForRadio()
+
+
+def render_radio(question):
+    col1, col2 = st.columns(2)
+    with col1:
+        question_title(question)
+    with col2:
+        with span("st.markdown css"):
+            st.markdown(RADIO_CSS, unsafe_allow_html=True)
+        answer_key = question["answer_key"]
+        st.radio(
+            "",
+            question["options"],
+            horizontal=True,
+            key=answer_key,
+            index=None,
+            on_change=_on_radio_change,
+            args=(answer_key,),
+        )
+
+
+QUESTION_RENDERERS = {
+    "multi_select": render_multi_select,
+    "image_choice": render_image_choice,
+    "radio": render_radio,
+}
+
+
+def question_page(question):
+    header()
+    with span("st.markdown css"):
+        st.markdown(ALIGN_COLUMNS_CSS, unsafe_allow_html=True)
+    QUESTION_RENDERERS[question["kind"]](question)
+    progress_chart()
+
+
+# ---- Employee confirmation ----
+from datetime import date
+
+CONFIRM_CACHE_TTL = 60  # seconds; repeated "Баталгаажуулах" clicks reuse the result
+
+
+def _to_date_safe(v):
+    try:
+        if isinstance(v, datetime):
+            return v.date()
+        if isinstance(v, date):
+            return v
+        if v is None or str(v).strip() == "":
             return None
+        return datetime.fromisoformat(str(v).split(" ")[0]).date()
+    except Exception:
+        return None
+
+
+def _fmt_tenure(start_dt: date, end_dt: date) -> str:
+    if not start_dt:
+        return ""
+    days = (end_dt - start_dt).days
+    if days < 0:
+        return "0 сар"
+    years = int(days // 365.25)
+    rem_days = days - int(years * 365.25)
+    months = int(rem_days // 30.44)
+    parts = []
+    if years > 0:
+        parts.append(f"{years} жил")
+    parts.append(f"{months} сар")
+    return " ".join(parts)
+
+
+@st.cache_data(ttl=CONFIRM_CACHE_TTL, show_spinner=False)
+def load_employee_confirmation(empcode, category):
+    """Employee details the confirm step needs for one empcode + category (None if no such employee).
+
+    Whether the survey was already submitted is not part of it: that comes from
+    load_already_submitted, which is dropped as soon as answers are flushed.
+    """
+    emp = get_employee_directory().lookup(empcode)
+    if emp is None:
+        # Not in the directory yet (hired after the last refresh)
+        emp = get_storage().employee_confirmation(empcode)
 
-    def _fmt_tenure(start_dt: date, end_dt: date) -> str:
-        if not start_dt:
-            return ""
-        days = (end_dt - start_dt).days
-        if days < 0:
-            return "0 сар"
-        years = int(days // 365.25)
-        rem_days = days - int(years * 365.25)
-        months = int(rem_days // 30.44)
-        parts = []
-        if years > 0:
-            parts.append(f"{years} жил")
-        parts.append(f"{months} сар")
-        return " ".join(parts)
-
-    def total_months_from_mn_duration(text: str) -> int:
-        import re
-        years = 0
-        months = 0
-
-        year_match = re.search(r"(\d+)\s*жил", text)
-        month_match = re.search(r"(\d+)\s*сар", text)
-
-        if year_match:
-            years = int(year_match.group(1))
-
-        if month_match:
-            months = int(month_match.group(1))
-
-        return years * 12 + months
-    
+    if emp is None:
+        return None
+
+    groupYear = emp["GROUPYEAR"]
+    hire_dt = _to_date_safe(emp["LASTHIREDDATE"])
+    tenure_str = _fmt_tenure(hire_dt, date.today()) if hire_dt else ""
+
+    if hire_dt:
+        days = (date.today() - hire_dt).days
+        total_months = max(0, int(days // 30.44))
+    else:
+        total_months = 0
+
+    if groupYear:
+        total_months = total_months_from_mn_duration(groupYear)
+
+    total_duration_in_str = categorize_employment_duration(total_months)
+
+    return {
+        "firstname": emp["FIRSTNAME"],
+        "emp_info": {
+            "Компани": emp["COMPANYNAME"],
+            "Алба хэлтэс": emp["HEADDEPNAME"],
+            "Албан тушаал": emp["POSNAME"],
+            "Овог": emp["LASTNAME"],
+            "Нэр": emp["FIRSTNAME"],
+            "Ажилласан хугацаа": tenure_str,
+        },
+        "tenure_months": total_months,
+        "total_questions_order": total_questions_number_dict.get(category, {}).get(total_duration_in_str),
+        "survey_type": choose_survey_type_for_db(category, total_months) if category else None,
+    }
 
+
+def confirmEmployeeActions(empcode):
     with st.spinner("Loading"):
         try:
-            session = get_session()
-
-            # 1) Pull ONLY the latest hire row for this empcode
-            df = session.table(f"{DATABASE_NAME}.{SCHEMA_NAME}.{EMPLOYEE_TABLE}")
-            match = (
-                df.filter(df["EMPCODE"] == empcode)
-                  .sort(df["LASTHIREDDATE"].desc_nulls_last())
-                  .limit(1)
-                  .collect()
-            )
+            category = st.session_state.get("category_selected")
+            result = load_employee_confirmation(empcode, category)
 
-            if not match:
+            if result is None:
                 st.session_state.emp_confirmed = False
                 return
 
-            emp = match[0]
-
-            # 2) Block if this employee already submitted
-            answers_df = session.table(f"{DATABASE_NAME}.{SCHEMA_NAME}.{ANSWER_TABLE}")
-            already = (
-                answers_df
-                  .filter(
-                      (answers_df["EMPCODE"] == empcode) &
-                      (answers_df["SUBMITTED_AT"].is_not_null())
-                  )
-                  .limit(1)
-                  .collect()
-            )
-
-            if already:
+            # Block if this employee already submitted (Snowflake, or still in the local queue)
+            if get_submission_queue().has_submission(empcode) or load_already_submitted(empcode):
                 st.session_state.emp_confirmed = False
                 st.error("❌ Энэ ажилтан өмнө нь судалгаа бөглөсөн байна.")
                 return
 
-            groupYear = emp["GROUPYEAR"]
-            hire_dt = _to_date_safe(emp["LASTHIREDDATE"])
-            tenure_str = _fmt_tenure(hire_dt, date.today()) if hire_dt else ""
-
-            if hire_dt:
-                days = (date.today() - hire_dt).days
-                total_months = max(0, int(days // 30.44))
-            else:
-                total_months = 0
-
-            if groupYear:
-                total_months = total_months_from_mn_duration(groupYear)
-
             st.session_state.emp_confirmed = True
             st.session_state.confirmed_empcode = empcode
-            st.session_state.confirmed_firstname = emp["FIRSTNAME"]
-            st.session_state.emp_info = {
-                "Компани": emp["COMPANYNAME"],
-                "Алба хэлтэс": emp["HEADDEPNAME"],
-                "Албан тушаал": emp["POSNAME"],
-                "Овог": emp["LASTNAME"],
-                "Нэр": emp["FIRSTNAME"],
-                "Ажилласан хугацаа": tenure_str,
-            }
-            st.session_state.tenure_months = total_months
-
-            category = st.session_state.get("category_selected")
-            total_duration_in_str = categorize_employment_duration(total_months)
+            st.session_state.confirmed_firstname = result["firstname"]
+            st.session_state.emp_info = dict(result["emp_info"])
+            st.session_state.tenure_months = result["tenure_months"]
 
             if category == "АЖИЛ ХАЯЖ ЯВСАН":
                 st.session_state.survey_type = "АЖИЛ ХАЯЖ ЯВСАН"
@@ -451,12 +591,12 @@ def confirmEmployeeActions(empcode):
                     st.success("Амжилттай хадгаллаа")
                     return
 
-            total_questions_order = total_questions_number_dict[category][total_duration_in_str]
-            st.session_state.total_questions_order = total_questions_order
+            if result["total_questions_order"] is None:
+                raise KeyError(category)
+            st.session_state.total_questions_order = dict(result["total_questions_order"])
 
             if category:
-                auto_type = choose_survey_type_for_db(category, total_months)
-                st.session_state.survey_type = auto_type
+                st.session_state.survey_type = result["survey_type"]
 
         except Exception as e:
             st.error(f"❌ Snowflake холболтын алдаа: {e}")
@@ -486,24 +626,15 @@ def confirmEmployeeActions(empcode):
             st.session_state.survey_link = ""
             
         def onCreateLink():
-            import uuid
             try:
-                # session = get_session()
-                token = uuid.uuid4().hex
-
                 survey_type = st.session_state.get("survey_type", "")
                 empcode_confirmed = st.session_state.get("confirmed_empcode", "")
                 total_questions_order = st.session_state.get("total_questions_order", {})
 
-                session.sql(f"""
-                    INSERT INTO {DATABASE_NAME}.{SCHEMA_NAME}.{LINK_TABLE}
-                        (TOKEN, EMPCODE, SURVEY_TYPE)
-                    VALUES
-                        ('{token}', '{empcode_confirmed}', '{survey_type}')
-                """).collect()
+                token, link = issue_link(get_token_signer(), empcode_confirmed, survey_type, total_questions_order)
+                get_storage().insert_survey_links([(token, empcode_confirmed, survey_type)])
 
-                survey_link = f"{BASE_URL}?mode=link&token={token}&start_idx={total_questions_order['start_idx']}&skip_idx={total_questions_order['skip_idx']}&total_questions={total_questions_order['total_questions']}"
-                st.session_state.survey_link = survey_link
+                st.session_state.survey_link = link
                 st.session_state.create_link = True
 
             except Exception as e:
@@ -529,12 +660,110 @@ def confirmEmployeeActions(empcode):
         st.error("❌ Идэвхтэй ажилтан олдсонгүй. Кодоо шалгана уу.")
 
 
+def bulk_links_section():
+    """Links for a pasted / uploaded list of empcodes, created in one go."""
+    st.caption("Мөр бүрт: ажилтны код, ангилал (ангилалгүй мөрөнд доорх ангиллыг хэрэглэнэ). "
+               "CSV файл бол EMPCODE, CATEGORY баганатай байна.")
+    default_category = st.selectbox("Ангилал", LINK_CATEGORIES, key="bulk_link_category")
+    pasted = st.text_area("Ажилтны кодууд", key="bulk_link_codes", height=150)
+    uploaded = st.file_uploader("эсвэл CSV файл", type=["csv"], key="bulk_link_file")
+
+    if st.button("🔗 Линкүүд үүсгэх", key="btn_bulk_links"):
+        try:
+            if uploaded is not None:
+                requests = read_link_requests_csv(uploaded.getvalue(), default_category)
+            else:
+                requests = parse_link_requests(pasted, default_category)
+            if requests.empty:
+                st.warning("Ажилтны код оруулна уу.")
+                return
+            with st.spinner("Линк үүсгэж байна..."):
+                queue = get_submission_queue()
+                st.session_state.bulk_links = generate_links(
+                    get_storage(), requests, queued=queue.has_submission, signer=get_token_signer()
+                )
+        except Exception as e:
+            st.error(f"❌ Линк үүсгэх үед алдаа гарлаа: {e}")
+
+    result = st.session_state.get("bulk_links")
+    if result is not None:
+        created = int((result["STATUS"] == STATUS_CREATED).sum())
+        st.success(f"{created} / {len(result)} ажилтанд линк үүслээ.")
+        st.dataframe(result, hide_index=True, width="stretch")
+        st.download_button(
+            "⬇️ Линкүүдийг CSV-ээр татах",
+            data=result.to_csv(index=False).encode("utf-8-sig"),
+            file_name=f"survey_links_{date.today():%Y%m%d}.csv",
+            mime="text/csv",
+            key="btn_bulk_links_download",
+        )
+
+    if get_token_signer() is not None:
+        st.divider()
+        r1, r2 = st.columns([3, 1])
+        revoke_code = r1.text_input("Линк цуцлах (ажилтны код)", key="revoke_empcode")
+        if r2.button("🚫 Цуцлах", key="btn_revoke_links") and revoke_code.strip():
+            try:
+                get_revocation_list().revoke(empcode=revoke_code.strip())
+                st.success(f"{revoke_code.strip()} кодтой ажилтанд одоог хүртэл илгээсэн бүх линк цуцлагдлаа.")
+            except Exception as e:
+                st.error(f"❌ Линк цуцлах үед алдаа гарлаа: {e}")
+
+
 # ---- Link Handling ----
+LINK_INVALID_MESSAGE = "Энэ линк хүчингүй болсон эсвэл олдсонгүй."
+
+
+def resolve_link_token(token) -> dict:
+    """Everything a link open needs, for the link cache; {"error": message} if the token is no good.
+
+    Signed tokens are verified locally; legacy random tokens are looked up in APU_SURVEY_LINKS.
+    """
+    signer = get_token_signer()
+    resolved = {}
+    if signer is not None and is_signed_token(token):
+        try:
+            claims = signer.verify(token)
+        except InvalidToken as e:
+            return {"error": "Линкний хугацаа дууссан байна." if str(e) == "expired" else LINK_INVALID_MESSAGE}
+        empcode = claims["empcode"]
+        survey_type = claims["survey_type"]
+        resolved = {
+            "token_id": claims["token_id"],
+            "issued": claims["issued"],
+            "expires": claims["expires"],
+            "total_questions_order": claims["total_questions_order"],
+        }
+    else:
+        link = get_storage().link_for_token(token)
+        if link is None:
+            return {"error": LINK_INVALID_MESSAGE}
+        empcode, survey_type = link
+
+    # Employee info from the in-memory directory (the database only on a miss), with the submitted flag
+    storage = get_storage()
+    row = get_employee_directory().lookup(empcode)
+    if row is None:
+        row = storage.employee_confirmation(empcode)
+    else:
+        row["ALREADY_SUBMITTED"] = storage.already_submitted(empcode)
+    if row is None:
+        return {"error": "Ажилтны мэдээлэл олдсонгүй."}
+
+    return {
+        **resolved,
+        "empcode": empcode,
+        "survey_type": survey_type,
+        "already_submitted": bool(row["ALREADY_SUBMITTED"]),
+        "employee": {c: row[c] for c in ("LASTNAME", "FIRSTNAME", "COMPANYNAME", "HEADDEPNAME", "POSNAME")},
+    }
+
+
 def init_from_link_token():
     """
     If URL has ?mode=link&token=..., we:
-    - Look up EMPCODE + SURVEY_TYPE from APU_SURVEY_LINKS
-    - Load employee info
+    - Resolve the token + employee info through the link cache (resolve_link_token)
+    - Stop on revoked links and surveys that were already submitted
     - Fill session_state
     - Jump to page 2 (intro)
     """
@@ -564,37 +793,22 @@ def init_from_link_token():
         return
 
     try:
-        session = get_session()
-
-        # 1) Find EMPCODE + SURVEY_TYPE from link table
-        link_df = session.sql(f"""
-            SELECT EMPCODE, SURVEY_TYPE
-            FROM {DATABASE_NAME}.{SCHEMA_NAME}.{LINK_TABLE}
-            WHERE TOKEN = '{token}'
-            ORDER BY CREATED_AT DESC
-            LIMIT 1
-        """).to_pandas()
-
-        if link_df.empty:
-            st.error("Энэ линк хүчингүй болсон эсвэл олдсонгүй.")
+        resolved = get_link_cache().get_or_resolve(token, resolve_link_token)
+        if "error" in resolved:
+            st.error(resolved["error"])
             return
-
-        empcode = link_df.iloc[0]["EMPCODE"]
-        survey_type = link_df.iloc[0]["SURVEY_TYPE"]
-
-        # 2) Load employee info from EMP table
-        emp_df = session.sql(f"""
-            SELECT EMPCODE, LASTNAME, FIRSTNAME, COMPANYNAME, HEADDEPNAME, POSNAME
-            FROM {DATABASE_NAME}.{SCHEMA_NAME}.{EMPLOYEE_TABLE}
-            WHERE EMPCODE = '{empcode}'
-            LIMIT 1
-        """).to_pandas()
-
-        if emp_df.empty:
-            st.error("Ажилтны мэдээлэл олдсонгүй.")
+        empcode = resolved["empcode"]
+        if get_revocation_list().is_revoked(resolved.get("token_id"), empcode, resolved.get("issued")):
+            st.error(LINK_INVALID_MESSAGE)
             return
-
-        row = emp_df.iloc[0]
+        if resolved["already_submitted"] or get_submission_queue().has_submission(empcode):
+            st.error("❌ Энэ линкээр судалгаа бөглөгдсөн байна.")
+            return
+        survey_type = resolved["survey_type"]
+        row = resolved["employee"]
+        # Signed tokens carry their plan; legacy links pass it in the URL
+        total_questions_order = resolved.get("total_questions_order") or \
+            {'start_idx': start_idx, 'total_questions':total_questions, 'skip_idx':skip_idx}
 
         # 3) Hydrate session_state so it behaves like HR-confirmed
         st.session_state.logged_in = True       # 🔑 bypass HR login
@@ -612,7 +826,7 @@ def init_from_link_token():
         st.session_state.emp_firstname = row["FIRSTNAME"]
         st.session_state.emp_code = empcode
 
-        st.session_state.total_questions_order = {'start_idx': start_idx, 'total_questions':total_questions, 'skip_idx':skip_idx}
+        st.session_state.total_questions_order = total_questions_order
 
         if(st.session_state.total_questions_order):
         # Always go to intro page for link users
@@ -621,6 +835,18 @@ def init_from_link_token():
         st.error(f"❌ Линкээр нэвтрэх үед алдаа гарлаа: {e}")
 
 
+# ---- DEPLOY CHECK: answers stored as codebook codes (tools/migrate_answer_codes.py) ----
+def answer_codes_missing() -> bool:
+    try:
+        return not get_storage().answer_codes_ready()
+    except Exception:
+        return False  # Snowflake unreachable: answers still queue locally, the pages report their own errors
+
+
+if answer_codes_missing():
+    st.error("❌ Өгөгдлийн сангийн шилжүүлэг хийгдээгүй байна: `python tools/migrate_answer_codes.py`-г ажиллуулна уу.")
+    st.stop()
+
 # 🔹 NEW: try to initialize from link token (if any)
 init_from_link_token()
 
@@ -714,6 +940,7 @@ def login_page():
         if st.button("Нэвтрэх", width="stretch"):
             if username in valid_users and password == valid_users[username]:
                 st.session_state.logged_in = True
+                st.session_state.hr_user = username
                 st.session_state.page = -1
                 st.rerun()
             else:
@@ -725,50 +952,43 @@ def table_view_page():
     logo()
     st.title("🧾 Бөглөсөн судалгааны жагсаалт")
 
+    # ---- Filters (applied in Snowflake) ----
+    try:
+        directory_df = get_employee_directory().frame()
+    except Exception as e:
+        st.error(f"❌ Snowflake холболтын алдаа: {e}")
+        directory_df = pd.DataFrame(columns=["COMPANYNAME", "DEPNAME"])
+    f1, f2, f3, f4 = st.columns(4)
+    with f1:
+        date_from = st.date_input("Эхлэх огноо", value=None, key="flt_date_from")
+    with f2:
+        date_to = st.date_input("Дуусах огноо", value=None, key="flt_date_to")
+    with f3:
+        companies = sorted(directory_df["COMPANYNAME"].dropna().unique().tolist())
+        company = st.selectbox("Компани", ["Бүгд"] + companies, key="flt_company")
+        company = None if company == "Бүгд" else company
+    with f4:
+        deps = directory_df["DEPNAME"] if company is None else \
+            directory_df.loc[directory_df["COMPANYNAME"] == company, "DEPNAME"]
+        department = st.selectbox("Хэлтэс", ["Бүгд"] + sorted(deps.dropna().unique().tolist()), key="flt_department")
+        department = None if department == "Бүгд" else department
+
+    filters = (date_from, date_to, company, department)
+    if st.session_state.get("submitted_filters") != filters:
+        st.session_state.submitted_filters = filters
+        st.session_state.submitted_page = 0
+    page = st.session_state.get("submitted_page", 0)
+
     with st.spinner("Loading"):
         try:
-            session = get_session()
-            schema = SCHEMA_NAME
-            db = DATABASE_NAME
-
-            # Join survey answers with employee master and check interview status
-            q = f"""
-            WITH answers AS (
-                SELECT
-                    EMPCODE,
-                    SUBMITTED_AT
-                FROM {db}.{schema}.APU_SURVEY_ANSWERS
-                WHERE SUBMITTED_AT IS NOT NULL
-            ),
-            interviews AS (
-                SELECT DISTINCT
-                    EMP_CODE
-                FROM {db}.{schema}.{INTERVIEW_TABLE}
-            )
-            SELECT
-                a.EMPCODE                         AS EMP_CODE,
-                a.SUBMITTED_AT                    AS SUBMITTED_AT,
-                '✅'                               AS SURVEY_DONE,         -- always yes, from survey table
-                CASE 
-                    WHEN i.EMP_CODE IS NOT NULL THEN '✅'
-                    ELSE '❌'
-                END                                AS INTERVIEW_DONE,
-                e.LASTNAME,
-                e.FIRSTNAME,
-                e.COMPANYNAME,
-                e.DEPNAME,
-                e.POSNAME
-            FROM answers a
-            LEFT JOIN interviews i
-                ON i.EMP_CODE = a.EMPCODE
-            LEFT JOIN {db}.{schema}.APU_EMP_DATA_JULY2025 e
-                ON e.EMPCODE = a.EMPCODE
-            ORDER BY a.SUBMITTED_AT DESC
-            """
-            df = session.sql(q).to_pandas()
+            total = load_submitted_count(*filters)
+            n_pages = max(1, -(-total // SUBMITTED_PAGE_SIZE))
+            page = min(page, n_pages - 1)
+            df = load_submitted_page(*filters, page)
+            df = get_employee_directory().attach(df, "EMP_CODE")
 
             # Rename columns to Mongolian labels
-            df.rename(columns={
+            df = df.rename(columns={
                 "EMP_CODE": "Ажилтны код",
                 "SUBMITTED_AT": "Бөглөсөн огноо",
                 "SURVEY_DONE": "Судалгаа бөглөсөн",
@@ -778,7 +998,7 @@ def table_view_page():
                 "COMPANYNAME": "Компани",
                 "DEPNAME": "Хэлтэс",
                 "POSNAME": "Албан тушаал",
-            }, inplace=True)
+            })
 
             if not df.empty:
                 # ⏱ Only show date part for submitted_at
@@ -787,6 +1007,19 @@ def table_view_page():
             # Show table
             st.dataframe(df, width="stretch")
 
+            # ---- Pagination ----
+            p1, p2, p3 = st.columns([1, 2, 1])
+            with p1:
+                if st.button("← Өмнөх", key="btn_prev_page", disabled=page == 0):
+                    st.session_state.submitted_page = page - 1
+                    st.rerun()
+            with p2:
+                st.caption(f"Хуудас {page + 1} / {n_pages} · нийт {total} судалгаа")
+            with p3:
+                if st.button("Дараах →", key="btn_next_page", disabled=page >= n_pages - 1):
+                    st.session_state.submitted_page = page + 1
+                    st.rerun()
+
         except Exception as e:
             st.error(f"❌ Snowflake холболтын алдаа: {e}")
 
@@ -794,49 +1027,208 @@ def table_view_page():
         if st.button("Үргэлжлүүлэх → Судалгааны сонголт"):
             st.session_state.page = -0.5
             st.rerun()
+        if st.button("📊 Аналитик", key="btn_analytics"):
+            st.session_state.page = -2
+            st.rerun()
+
+    with st.expander("⬇️ Бүх хариултыг татах"):
+        st.caption("Дээрх огноо, компани, хэлтсийн шүүлтүүрээр бүх мөрийг файл болгон татна.")
+        e1, e2 = st.columns(2)
+        kinds = {"survey": "Судалгааны хариулт", "interview": "Ярилцлагын хариулт"}
+        kind = e1.radio("Өгөгдөл", list(kinds), format_func=kinds.get, key="export_kind")
+        fmt = e2.radio("Формат", available_formats(), format_func=str.upper, key="export_format")
+        if st.button("📦 Файл бэлтгэх", key="btn_export"):
+            with st.spinner("Файл бэлтгэж байна..."):
+                try:
+                    st.session_state.export = get_session_pool().run(
+                        lambda session: export_answers(session, kind, fmt, *filters)
+                    )
+                except ExportTooLarge:
+                    st.session_state.export = None
+                    st.error(
+                        f"❌ Файл {MAX_DOWNLOAD_BYTES // (1024 * 1024)} MB-аас их байна. "
+                        "Огнооны хүрээ эсвэл шүүлтүүрээ багасгана уу."
+                    )
+                except Exception as e:
+                    st.session_state.export = None
+                    st.error(f"❌ Экспорт хийхэд алдаа гарлаа: {e}")
+        export = st.session_state.get("export")
+        if export and export["rows"] == 0:
+            st.info("Шүүлтүүрт тохирох мөр алга.")
+        elif export and os.path.exists(export["path"]):
+            # Read here as bytes (at most MAX_DOWNLOAD_BYTES): download_button keeps its data in memory
+            with open(export["path"], "rb") as f:
+                data = f.read()
+            st.download_button(
+                f"⬇️ {export['file_name']} ({export['rows']} мөр, {export['bytes'] // 1024} KB)",
+                data=data, file_name=export["file_name"], mime=export["mime"], key="btn_export_download",
+            )
+
+    # Pool sizing info for HR peak load
+    if get_storage().name == "snowflake":
+        with st.expander("⚙️ Snowflake session pool"):
+            st.json(get_session_pool().metrics())
+        with st.expander("📈 Snowflake query telemetry"):
+            query_telemetry_panel(get_query_telemetry())
+
+    with st.expander("📋 Гарах судалгааны нэгтгэл хүснэгт"):
+        summary = get_exit_summary()
+        if st.button("🔄 Одоо шинэчлэх", key="btn_refresh_summary"):
+            try:
+                summary.refresh_once()
+            except Exception as e:
+                st.error(f"❌ Нэгтгэл хүснэгт шинэчлэхэд алдаа гарлаа: {e}")
+        st.json(summary.info())
+
+    with st.expander("📮 Хариу хадгалах дараалал"):
+        queue = get_submission_queue()
+        if st.button("🔁 Амжилтгүй хариуг дахин илгээх", key="btn_requeue_failed"):
+            st.success(f"{queue.requeue_failed()} хариуг дахин дараалалд орууллаа.")
+        st.json(queue.stats())
+
+    with st.expander("🔗 Линкний кэш"):
+        st.json(get_link_cache().info())
+
+    with st.expander("🗂 Ажилтны мэдээллийн кэш"):
+        directory = get_employee_directory()
+        if st.button("🔄 Одоо шинэчлэх", key="btn_refresh_directory"):
+            directory.refresh_now()
+        st.json(directory.info())
+
+    timings = get_rerun_timings()
+    if timings.is_admin(st.session_state.get("hr_user")):
+        with st.expander("⏱ Rerun хугацааны хэмжилт"):
+            rerun_timing_panel(timings)
+
+
+def query_telemetry_panel(telemetry):
+    import pandas as pd
+    if st.button("🔄 Тэглэх", key="btn_reset_query_telemetry"):
+        telemetry.reset()
+    totals = telemetry.info()
+    if not totals:
+        st.info("Хэмжилт алга.")
+        return
+    st.dataframe(pd.DataFrame(totals), hide_index=True, width="stretch")
+    st.markdown("**Сүүлийн query-нүүд**")
+    st.dataframe(pd.DataFrame(telemetry.recent()), hide_index=True, width="stretch")
+    st.download_button("⬇️ Prometheus", data=telemetry.prometheus(), file_name="query_telemetry.prom",
+                       mime="text/plain", key="btn_query_telemetry_prom")
+
+
+def rerun_timing_panel(timings):
+    import pandas as pd
+    if st.button("🔄 Хэмжилтийг тэглэх", key="btn_reset_timings"):
+        timings.reset()
+    info = timings.info()
+    if not info:
+        st.info("Хэмжилт алга.")
+        return
+    rows = [
+        {"PAGE": page, "SPAN": name, **{k: v for k, v in h.items() if k != "buckets"}}
+        for page, spans in info.items() for name, h in spans.items()
+    ]
+    st.dataframe(pd.DataFrame(rows).sort_values(["PAGE", "mean_ms"], ascending=[True, False]),
+                 hide_index=True, width="stretch")
+    page = st.selectbox("Хуудас", sorted(info), key="timing_page")
+    span_name = st.selectbox("Хэмжилт", sorted(info[page]), key="timing_span")
+    st.bar_chart(pd.Series(info[page][span_name]["buckets"], name="reruns"), x_label="ms", sort=False)
+
+
+# ---- ANALYTICS PAGE ----
+def analytics_page():
+    logo()
+    st.title("📊 Гарах судалгааны аналитик")
+
+    if st.button("← Жагсаалт руу буцах", key="btn_analytics_back"):
+        st.session_state.page = -1
+        st.rerun()
+
+    try:
+        rollup = load_rollup()
+    except Exception as e:
+        st.error(f"❌ Snowflake холболтын алдаа: {e}")
+        return
+
+    # ---- Filters (applied in memory on the rollup) ----
+    f1, f2, f3, f4 = st.columns(4)
+    with f1:
+        companies = sorted(c for c in rollup["COMPANYNAME"].unique() if c)
+        company = st.selectbox("Компани", ["Бүгд"] + companies, key="an_company")
+        company = None if company == "Бүгд" else company
+    with f2:
+        deps = rollup["DEPNAME"] if company is None else rollup.loc[rollup["COMPANYNAME"] == company, "DEPNAME"]
+        department = st.selectbox("Хэлтэс", ["Бүгд"] + sorted(d for d in deps.unique() if d), key="an_department")
+        department = None if department == "Бүгд" else department
+    with f3:
+        tenures = sorted(t for t in rollup["TENURE_BUCKET"].unique() if t)
+        tenure = st.selectbox("Ажилласан хугацаа", ["Бүгд"] + tenures, key="an_tenure")
+        tenure = None if tenure == "Бүгд" else tenure
+    with f4:
+        month_from = st.date_input("Эхлэх сар", value=None, key="an_month_from")
+
+    df = filter_rollup(rollup, company, department, tenure, month_from)
+
+    m1, m2 = st.columns(2)
+    m1.metric("Бөглөсөн судалгаа", int(answer_counts(df, "SURVEYS").sum()))
+    m2.metric("Ярилцлага", int(answer_counts(df, "INTERVIEWS").sum()))
+
+    st.subheader("Сар бүрийн судалгаа")
+    st.line_chart(monthly_responses(df))
+
+    st.subheader("Ажлаас гарах шалтгаан (топ 10)")
+    st.bar_chart(top_reasons_by_segment(df, n=10).set_index("REASON")["RESPONSES"], horizontal=True)
+
+    segments = {"COMPANYNAME": "Компани", "DEPNAME": "Хэлтэс", "TENURE_BUCKET": "Ажилласан хугацаа"}
+    s1, s2 = st.columns([3, 1])
+    segment = s1.selectbox("Шалтгааныг бүлэглэх", list(segments), format_func=segments.get, key="an_reason_segment")
+    top_n = s2.number_input("Топ", min_value=1, max_value=19, value=3, key="an_reason_top")
+    by_segment = top_reasons_by_segment(df, segment, int(top_n))
+    st.dataframe(
+        by_segment.rename(columns={segment: segments[segment], "REASON_CODE": "Код", "REASON": "Шалтгаан",
+                                   "RESPONSES": "Тоо", "SHARE": "Хувь"}),
+        hide_index=True, width="stretch",
+        column_config={"Хувь": st.column_config.NumberColumn(format="percent")},
+    )
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader("Ажилд орохыг санал болгох уу?")
+        st.bar_chart(answer_counts(df, "Loyalty"))
+    with c2:
+        st.subheader("Ярилцлагын дундаж оноо (1-5)")
+        st.bar_chart(likert_means(df))
+
+    st.subheader("Асуулт тус бүрээр")
+    keys = [q["answer_key"] for q in QUESTIONS.values()]
+    key = st.selectbox("Асуулт", keys, format_func=question_label, key="an_question")
+    st.bar_chart(answer_counts(df, key))
+
+    with st.expander("⚙️ Rollup хүснэгт"):
+        exit_rollup = get_exit_rollup()
+        if st.button("🔄 Одоо шинэчлэх", key="btn_refresh_rollup"):
+            try:
+                exit_rollup.refresh_once()
+            except Exception as e:
+                st.error(f"❌ Rollup шинэчлэхэд алдаа гарлаа: {e}")
+        st.json(exit_rollup.info())
 
 
 def interview_table_page():
     import pandas as pd
     st.title("🎤 Гарах ярилцлагад оролцох ажилтнаа сонгоно уу")
 
+    with st.expander("⏳ Ярилцлага хүлээгдэж буй жагсаалт"):
+        pending = get_pending_interviews()
+        if st.button("🔄 Одоо шинэчлэх", key="btn_refresh_pending"):
+            pending.refresh_now()
+        st.json(pending.info())
+
     with st.spinner("Loading"):
         try:
-            session = get_session()
-            schema = SCHEMA_NAME
-            db = DATABASE_NAME
-            interview_tbl = INTERVIEW_TABLE
-
-            q = f"""
-            WITH survey AS (
-                SELECT
-                    EMPCODE    AS EMP_CODE,
-                    SUBMITTED_AT
-                FROM {db}.{schema}.APU_SURVEY_ANSWERS
-                WHERE SUBMITTED_AT IS NOT NULL
-            ),
-            interviewed AS (
-                SELECT DISTINCT EMP_CODE
-                FROM {db}.{schema}.{interview_tbl}
-            )
-            SELECT
-                s.EMP_CODE,
-                s.SUBMITTED_AT,
-                e.LASTNAME,
-                e.FIRSTNAME,
-                e.COMPANYNAME,
-                e.DEPNAME,
-                e.POSNAME
-            FROM survey s
-            LEFT JOIN interviewed i
-                ON i.EMP_CODE = s.EMP_CODE
-            LEFT JOIN {db}.{schema}.APU_EMP_DATA_JULY2025 e
-                ON e.EMPCODE = s.EMP_CODE
-            WHERE i.EMP_CODE IS NULL
-            ORDER BY s.SUBMITTED_AT DESC
-            """
-
-            df = session.sql(q).to_pandas()
+            # In-memory pending set: ticking rows in the editor below never queries Snowflake
+            df = get_pending_interviews().frame()
+            df = get_employee_directory().attach(df, "EMP_CODE")
 
             # SUBMITTED_AT → date only
             if "SUBMITTED_AT" in df.columns:
@@ -1008,6 +1400,9 @@ def directory_page():
                 if(st.session_state.employee_confirm_btn_clicked == True):
                     confirmEmployeeActions(emp_code)
 
+            with st.expander("📑 Олон ажилтанд линк үүсгэх"):
+                bulk_links_section()
+
 
         elif option1 == "ГАРАХ ЯРИЛЦЛАГА": 
             interview_table_page()
@@ -1024,18 +1419,8 @@ def show_survey_answers_page(empcode: str):
         return
     with st.spinner('loading'):
         try:
-            session = get_session()
-            db = DATABASE_NAME
-            schema = SCHEMA_NAME
-
-            q = f"""
-            SELECT *
-            FROM {db}.{schema}.APU_SURVEY_ANSWERS
-            WHERE EMPCODE = '{empcode}'
-            ORDER BY SUBMITTED_AT DESC
-            LIMIT 1
-            """
-            df = session.sql(q).to_pandas()
+            # Latest answers with label text (the table itself stores codebook codes)
+            df = get_storage().latest_survey_answers(empcode)
 
             if df.empty:
                 st.warning(f"Энэ ажилтны ({empcode}) судалгааны хариу олдсонгүй.")
@@ -1084,6 +1469,31 @@ def show_survey_answers_page(empcode: str):
         except Exception as e:
             st.error(f"❌ Судалгааны хариу унших үед алдаа гарлаа: {e}")
 # ---Thankyou
+@st.fragment(run_every=2)
+def poll_submission_status(submission_id):
+    """Polls the write-behind queue while the answers are pending; reruns the page once they are not."""
+    if get_submission_queue().status(submission_id)["status"] != PENDING:
+        st.rerun()  # the whole page: it shows the outcome and stops rendering this fragment
+    st.caption("⏳ Хариуг хадгалж байна...")
+
+
+def submission_status():
+    """Where the answers are: saved (with balloons, once), still queued (polled) or failed."""
+    submission_id = st.session_state.get("submission_id")
+    if not submission_id:
+        return
+    status = get_submission_queue().status(submission_id)
+    if status["status"] == PENDING:
+        poll_submission_status(submission_id)
+    elif status["status"] == FLUSHED:
+        if st.session_state.get("balloons_submission_id") != submission_id:
+            st.session_state.balloons_submission_id = submission_id
+            st.balloons()
+        st.caption("✅ Хариу хадгалагдлаа.")
+    else:
+        st.error(f"❌ Хариу хадгалах үед алдаа гарлаа: {status['error']}")
+
+
 def final_thank_you():
     header()
 
@@ -1101,9 +1511,9 @@ def final_thank_you():
     )
 
 
-    st.balloons()
     st.title("Судалгааг амжилттай бөглөлөө. Танд баярлалаа!🎉")
     st.write("Ажилтны мэдээлэл амжилттай бүртгэгдлээ.")
+    submission_status()
 
 
     params = st.query_params
@@ -1121,23 +1531,9 @@ def final_thank_you():
                 st.session_state.clear()
                 st.rerun()
 
-def _sql_str(v):
-    if v is None:
-        return "NULL"
-    s = str(v).strip()
-    if s == "":
-        return "NULL"
-    return "'" + s.replace("'", "''") + "'"
-
-
 def submit_interview_answers():
     """Insert interview answers into Snowflake using the NEW interview keys (1,1.1,...,7)."""
     try:
-        session = get_session()
-        db = DATABASE_NAME
-        schema = SCHEMA_NAME
-        table = INTERVIEW_TABLE
-
         emp_code = st.session_state.get("selected_emp_code")
         if not emp_code:
             st.error("Ажилтны код олдсонгүй. Хүснэгтээс ажилтан сонгосон эсэхээ шалгана уу.")
@@ -1171,32 +1567,22 @@ def submit_interview_answers():
             st.warning("7-р асуултад /ажлаас гарах шийдвэрт нөлөөлсөн 3 хүчин зүйл/ заавал хариулна уу.")
             return False
 
-        insert_sql = f"""
-            INSERT INTO {db}.{schema}.{table} (
-                EMP_CODE,
-                SUBMITTED_AT,
-                Q1_SCORE, Q1_DETAIL,
-                Q2_SCORE, Q2_DETAIL,
-                Q3_SCORE, Q3_DETAIL,
-                Q4_CHOICE, Q4_DETAIL,
-                Q5_SCORE, Q5_DETAIL,
-                Q6_SCORE, Q6_DETAIL,
-                Q7_FACTORS
-            )
-            VALUES (
-                {_sql_str(emp_code)},
-                {_sql_str(submitted_at)},
-                {_sql_str(q1_score)},  {_sql_str(q1_detail)},
-                {_sql_str(q2_score)},  {_sql_str(q2_detail)},
-                {_sql_str(q3_score)},  {_sql_str(q3_detail)},
-                {_sql_str(q4_choice)}, {_sql_str(q4_detail)},
-                {_sql_str(q5_score)},  {_sql_str(q5_detail)},
-                {_sql_str(q6_score)},  {_sql_str(q6_detail)},
-                {_sql_str(q7_factors)}
-            )
-        """
+        row = {
+            "EMP_CODE": emp_code,
+            "SUBMITTED_AT": submitted_at,
+            "Q1_SCORE": q1_score,   "Q1_DETAIL": q1_detail,
+            "Q2_SCORE": q2_score,   "Q2_DETAIL": q2_detail,
+            "Q3_SCORE": q3_score,   "Q3_DETAIL": q3_detail,
+            "Q4_CHOICE": q4_choice, "Q4_DETAIL": q4_detail,
+            "Q5_SCORE": q5_score,   "Q5_DETAIL": q5_detail,
+            "Q6_SCORE": q6_score,   "Q6_DETAIL": q6_detail,
+            "Q7_FACTORS": q7_factors,
+        }
 
-        session.sql(insert_sql).collect()
+        get_storage().insert_interview_answers(row)
+        invalidate_submitted_surveys()
+        get_pending_interviews().mark_interviewed(emp_code)
+        get_exit_summary().request_refresh()
 
         st.session_state.interview_submitted = True
         st.session_state.interview_submitted_at = submitted_at
@@ -1343,2129 +1729,70 @@ if "page" not in st.session_state:
     st.session_state.page = -1
 
 # ---- LOGIN/DIRECTORY ROUTING ----
-if not st.session_state.logged_in:
-    login_page()
-    st.stop()
-elif st.session_state.page == -0.5:
-    directory_page()
-    st.stop()
-elif st.session_state.page == -1:
-    table_view_page()
-    st.stop()
-
-
-# ---- PAGE 0: CATEGORY + SURVEY TYPE (Single Page) ----
-if st.session_state.page == 0:
-    header()
-    st.header("Ерөнхий мэдээлэл")
-    st.markdown("**Судалгааны ангилал болон төрлөө сонгоно уу.**")
-
-    # Step 1: Category (dropdown)
-    category = st.selectbox(
-        "Судалгааны ангилал:",
-        ["-- Сонгох --"] + list(survey_types.keys()),
-        index=0 if not st.session_state.category_selected else list(survey_types.keys()).index(st.session_state.category_selected) + 1,
-        key="category_select"
-    )
-    if category != "-- Сонгох --":
-        set_category(category)
-
-    # Step 2: Survey type (buttons) -- always shown if category selected
-    if st.session_state.category_selected:
-        st.markdown("**Судалгааны төрөл:**")
-        types = survey_types[st.session_state.category_selected]
-        cols = st.columns(len(types))
-        for i, survey in enumerate(types):
-            with cols[i]:
-                if st.button(survey, key=f"survey_{i}"):
-                    set_survey_type(survey)
-                    st.rerun()
-
-
-# ---- SURVEY QUESTION 1 ----
-elif st.session_state.page == 3:
-    # ✅ Check confirmed values
-    # if not st.session_state.get("confirmed_empcode") or not st.session_state.get("confirmed_firstname"):
-    #     st.error("❌ Ажилтны мэдээлэл баталгаажаагүй байна. Эхний алхмыг дахин шалгана уу.")
-    #     st.stop()
-    
-    header()
-    col1,col2 =  st.columns(2)
-    with st.spinner("loading"):
-        st.markdown("""
-            <style>
-                    div[data-testid="stHorizontalBlock"] {
-                        align-items: center;
-                    }
-            </style>
-        """, unsafe_allow_html=True)
-
-
-        with col1:
-
-            st.markdown("""
-                <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;  padding: 1rem;">
-                        <p> Танд ажлаас гарахад нөлөөлсөн<span style="color: #ec1c24;"> хүчин зүйл, шалтгаантай</span> хамгийн их тохирч байгаа 1-3 хариултыг сонгоно уу?</p>
-                </h1>
-            """, unsafe_allow_html=True)
-        with col2:
-            
-    # --- Styling: make checkboxes look like buttons ---
-            st.markdown("""
-            <style>
-                /* Hide default checkbox icons */
-                div[data-testid="stCheckbox"] > label > span {
-                    display: none;
-                }
-                        
-                div[data-testid="stVerticalBlock"]  {
-                    display: flex !important;
-                    flex-direction: row;
-                    flex-wrap: wrap !important;
-                }
-                
-                        
-                div[data-testid="stCheckbox"]  {
-                    margin: 0 !important;
-                    width: 100% !important;
-                }
-                            
-                /* Hide native checkbox */
-                div[data-testid="stCheckbox"] input {
-                    position: absolute;
-                    opacity: 0;
-                    pointer-events: none;
-                    width: 100% !important;
-                }
-
-                /* Style each label like a button */
-                div[data-testid="stCheckbox"] label {
-                    border: 1px solid #d1d5db;
-                    border-radius: 20px;
-                    padding: clamp(0.1rem, 0.5rem, 1.5rem) clamp(0.2rem, 0.6rem, 1.5rem);
-                    text-align: center;
-                    cursor: pointer;
-                    width: 100% !important;
-                    transition: all 0.15s ease-in-out;
-                    height: 100%;
-                    user-select: none;
-                    white-space: pre-line;  /* Respect newline in label */
-                }
-
-                /* Subtitle */
-                div[data-testid="stCheckbox"] p {
-                    font-size: clamp(0.25rem, 0.8vw, 1rem);
-                    color: #4b5563;
-                }
-
-                /* Hover effect */
-                div[data-testid="stCheckbox"] label:hover {
-                    border-color: red !important; 
-                }
-
-                div[data-testid="stCheckbox"] input[type="checkbox"]:checked + div,
-                div[data-testid="stCheckbox"] input[type="checkbox"]:checked ~ div,
-                div[data-testid="stCheckbox"] label:has(input[type="checkbox"]:checked) > div,
-                div[data-testid="stCheckbox"] label:has(input[type="checkbox"]:checked) {
-                    border-color: #ec1c24;
-                }
-
-            </style>
-            """, unsafe_allow_html=True)
-
-        
-            # --- OPTIONS ---
-            options = [ "Удирдлагын арга барил, харилцаа муу", 
-                        "Компанийн соёл таалагдаагүй", 
-                        "Цалин хөлс хангалтгүй", 
-                        "Хамт олны уур амьсгал, харилцаа таарамжгүй", 
-                        "Гүйцэтгэлийн үнэлгээ шудрага бус", 
-                        "Ажлын ачаалал их","Ажлын цагийн хуваарь таарамжгүй, хэцүү байсан",
-                        "Дасан зохицуулах хөтөлбөрийн хэрэгжилт муу",
-                        "Өөр хот, аймаг, улсад шилжих, амьдрах",
-                        "Тэтгэвэрт гарч байгаа",
-                        "Үндсэн мэргэжлийн дагуу ажиллах болсон",
-                        "Албан тушаал/мэргэжлийн хувьд өсөх, суралцах боломж байхгүй",
-                        "Эрүүл мэндийн байдлаас",
-                        "Хөдөлмөрийн нөхцөл хэвийн бус/хүнд хортой байсан",
-                        "Хувийн шалтгаан/Personal Reasons",
-                        "Илүү боломжийн өөр ажлын байрны санал авсан",
-                        "Ажлын орчин нөхцөл муу",
-                        "Ар гэрийн асуудал үүссэн",
-                        "Гадаадад улсад ажиллах/суралцах"]
-
-            # --- Session state for selected answers ---
-            st.session_state.selected = []
-
-            # --- Render choices ---
-            cols = st.columns(2)  # 2×3, change to st.columns(4) for 2×4 grid
-
-            for i, opt in enumerate(options):
-
-                check_for_max_choices = len(st.session_state.selected) == 3
-
-                is_checked = opt in st.session_state.selected
-                css_class = "checkbox-btn checked" if is_checked else "checkbox-btn"
-                key=f"cb_{i}"
-
-                if col2.checkbox(opt,key=key, value=is_checked, disabled=check_for_max_choices):
-                    if not is_checked:
-                        # Trying to select
-                        st.session_state.selected.append(opt)
-                    else:
-                        # Unselect
-                        st.session_state.selected.remove(opt)
-
-
-        # if(len(st.session_state.selected) > 0 and len(st.session_state.selected) <= 3):
-
-        answer_key = "Reason_for_Leaving"
-        max_choices_reached = len(st.session_state.selected) > 3
-        escaped_answer = "; ".join(st.session_state.selected)
-
-        if(len(st.session_state.selected)):
-            nextPageBtn(max_choices_reached, answer_key, escaped_answer)
-                
-        if(len(st.session_state.selected) > 3):
-            st.warning("Хамгийн ихдээ 3 төрлийг сонгоно уу")
-        
-        progress_chart()
-
-
-elif st.session_state.page == 4:
-
-    header()
-    col1, col2 = st.columns(2)
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3; padding: 1rem;">
-                    <p> Дасан зохицох хөтөлбөрийн хэрэгжилт эсвэл баг хамт олон, шууд удирдлага танд өдөр тутмын ажил, үүрэг даалгавруудыг хурдан ойлгоход туслах <span style="color: #ec1c24;"> хангалттай мэдээлэл, заавар</span> өгч чадсан уу?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        with st.spinner("Loading"):
-            import base64
-            from pathlib import Path
-
-            def load_base64(path):
-                img_bytes = Path(path).read_bytes()
-                return base64.b64encode(img_bytes).decode()
-            
-            emoji1 = load_base64("static/images/Image (15).png")
-            emoji2 = load_base64("static/images/Image (16).png")
-
-
-            c1, c2 = st.columns(2)
-            
-            st.markdown("""
-            <style>
-                div[data-testid="stButton"] button {
-                    display: none !important;
-                }
-                        
-            /* Mobile layout */
-            @media (max-width: 900px) {
-                div[data-testid="stHorizontalBlock"] {
-                    flex-direction: column !important;
-                }
-            }
-            </style>
-        """, unsafe_allow_html=True)
-
-            with c1:
-                # --- Hidden Streamlit trigger ---
-                # --- Custom HTML Button with Image + Text ---
-                
-                components.html(f"""
-                    <button id="imgBtn" style=" 
-                        background: #fff;
-                        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                        border: 1px solid #ccc;
-                        border-radius: 15px;
-                        cursor: pointer;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        justify-content: center;
-                        gap: 1rem;
-                        width: 100%;
-                        max-width: 420px;
-                        height: 400px;
-                    ">
-                        <img src="data:image/png;base64,{emoji1}" width="clamp(60px, 15vw, 130px)" height="200">
-                        <span style="font-size: clamp(1.2rem, 2vw, 2rem)">Хангалттай чадсан</span>
-                    </button>
-
-                    <script>
-                        document.getElementById("imgBtn").onclick = () => {{
-                            const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-                            if (btn) btn.click();
-                        }};
-                    </script>
-
-                """, height=450)
-
-            
-            with c2:
-                # --- Custom HTML Button with Image + Text ---
-                
-                components.html(f"""
-                    <button id="imgBtn" style=" 
-                        background: #fff;
-                        border: 1px solid #ccc;
-                        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                        border-radius: 15px;
-                        cursor: pointer;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        justify-content: center;
-                        width: 100%;
-                        max-width: 420px;
-                        height: 400px;   
-
-                    ">
-                        <img src="data:image/png;base64,{emoji2}" width="auto" height="200">
-                        <span style="font-size: clamp(1.2rem, 2vw, 2rem);">Огт чадаагүй</span>
-                    </button>   
-
-                    <script>    
-                        document.getElementById("imgBtn").onclick = () => {{
-                            const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-                            if (btn) btn[1].click();
-                        }};
-                    </script>
-
-                """, height=450)    
-                
-            
-            answer_key = "Onboarding_Effectiveness"
-
-            button1 = st.button("trigger1", key="trigger1", on_click=lambda: submitAnswer(answer_key,"Хангалттай чадсан"))
-            button2 = st.button("trigger2", key="trigger2", on_click=lambda: submitAnswer(answer_key, "Огт чадаагүй"))
-            
-            if(button1 or button2):
-                goToNextPage()
-
-    progress_chart()
-
-elif st.session_state.page == 5:
-    header()
-    col1, col2 = st.columns(2)
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-    st.markdown("""
-                    <style>
-                        div[data-testid="stButton"] button {
-                            display: none !important;
-                        }
-                                
-                    /* Mobile layout */
-                    @media (max-width: 900px) {
-                        div[data-testid="stHorizontalBlock"] {
-                            flex-direction: column !important;
-                        }
-                    }
-                    </style>
-                """, unsafe_allow_html=True)
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;">
-                    <p> Ажлын байрны тодорхойлолт таны <span style="color: #ec1c24;"> өдөр тутмын </span> ажил үүрэгтэй нийцэж байсан уу??</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        import base64
-        from pathlib import Path
-
-        def load_base64(path):
-            img_bytes = Path(path).read_bytes()
-            return base64.b64encode(img_bytes).decode()
-        
-        emoji1 = load_base64("static/images/Image (28).png")
-        emoji2 = load_base64("static/images/Image (11).png")
-
-
-        c1, c2 = st.columns(2)
-        
-        
-
-        with c1:
-             # --- Hidden Streamlit trigger ---
-            # --- Custom HTML Button with Image + Text ---
-            with st.spinner("loading"):
-                components.html(f"""
-                    <button id="imgBtn" style=" 
-                        background: #fff;
-                        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                        border: 1px solid #ccc;
-                        border-radius: 15px;
-                        cursor: pointer;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        justify-content: center;
-                        gap: 1rem;
-                        width: 100%;
-                        max-width: 420px;
-                        height: 25rem;   
-                    ">
-                        <img src="data:image/png;base64,{emoji1}" width="clamp(60px, 15vw, 130px)" height="200">
-                        <span style="font-size: clamp(1.2rem, 2vw, 2rem)">Тийм</span>
-                    </button>
-
-                    <script>
-                        document.getElementById("imgBtn").onclick = () => {{
-                            const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-                            if (btn) btn.click();
-                        }};
-                    </script>
-
-                """, height=450)
-
-        
-        with c2:
-            # --- Custom HTML Button with Image + Text ---
-            with st.spinner("loading"):
-                components.html(f"""
-                    <button id="imgBtn" style=" 
-                        background: #fff;
-                        border: 1px solid #ccc;
-                        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                        border-radius: 15px;
-                        cursor: pointer;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        justify-content: center;
-                        width: 100%;
-                        max-width: 420px;
-                        height: 25rem;   
-
-                    ">
-                        <img src="data:image/png;base64,{emoji2}" width="auto" height="200">
-                        <span style="font-size: clamp(1.2rem, 2vw, 2rem);">Үгүй</span>
-                    </button>   
-
-                    <script>    
-                        document.getElementById("imgBtn").onclick = () => {{
-                            const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-                            if (btn) btn[1].click();
-                        }};
-                    </script>
-
-                """, height=450)    
-            
-        
-        answer_key = "Unexpected_Responsibilities"
-
-        button1 = st.button("trigger1", key="trigger1", on_click=lambda: submitAnswer(answer_key,"Тийм"))
-        button2 = st.button("trigger2", key="trigger2", on_click=lambda: submitAnswer(answer_key, "Үгүй"))
-        
-        if(button1 or button2):
-            goToNextPage()
-
-    progress_chart()
-
-elif st.session_state.page == 6:
-    header()
-    col1, col2 = st.columns(2)
-    st.markdown("""
-        <style>
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;">
-                    <p> Таны шууд удирдлага санал зөвлөгөө өгч, <span style="color: #ec1c24;"> эргэх холбоотой </span>ажилладаг байсан уу?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        with st.spinner("loading"):
-            import base64
-            from pathlib import Path
-
-            def load_base64(path):
-                img_bytes = Path(path).read_bytes()
-                return base64.b64encode(img_bytes).decode()
-            
-            emoji1 = load_base64("static/images/Image (25).png")
-            emoji2 = load_base64("static/images/Image (16).png")
-
-
-            c1, c2 = st.columns(2)
-            
-            st.markdown("""
-                        <style>
-                            div[data-testid="stButton"] button {
-                                display: none !important;
-                            }
-                                    
-                        /* Mobile layout */
-                        @media (max-width: 900px) {
-                            div[data-testid="stHorizontalBlock"] {
-                                flex-direction: column !important;
-                            }
-                        }
-                        </style>
-                    """, unsafe_allow_html=True)
-
-            with c1:
-                # --- Hidden Streamlit trigger ---
-                # --- Custom HTML Button with Image + Text ---
-                with st.spinner("loading"):
-                    components.html(f"""
-                        <button id="imgBtn" style=" 
-                            background: #fff;
-                            padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                            border: 1px solid #ccc;
-                            border-radius: 15px;
-                            cursor: pointer;
-                            display: flex;
-                            flex-direction: column;
-                            align-items: center;
-                            justify-content: center;
-                            gap: 1rem;
-                            width: 100%;
-                            max-width: 420px;
-                            height: 25rem;   
-                        ">
-                            <img src="data:image/png;base64,{emoji1}" width="clamp(60px, 15vw, 130px)" height="200">
-                            <span style="font-size: clamp(1.2rem, 2vw, 2rem)">Тийм</span>
-                        </button>
-
-                        <script>
-                            document.getElementById("imgBtn").onclick = () => {{
-                                const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-                                if (btn) btn.click();
-                            }};
-                        </script>
-
-                    """, height=450)
-
-                
-            with c2:
-                # --- Custom HTML Button with Image + Text ---
-                with st.spinner("loading"):
-                    components.html(f"""
-                    <button id="imgBtn" style=" 
-                        background: #fff;
-                        border: 1px solid #ccc;
-                        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                        border-radius: 15px;
-                        cursor: pointer;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        justify-content: center;
-                        width: 100%;
-                        max-width: 420px;
-                        height: 25rem;   
-
-                    ">
-                        <img src="data:image/png;base64,{emoji2}" width="auto" height="200">
-                        <span style="font-size: clamp(1.2rem, 2vw, 2rem);">Үгүй</span>
-                    </button>   
-
-                    <script>    
-                        document.getElementById("imgBtn").onclick = () => {{
-                            const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-                            if (btn) btn[1].click();
-                        }};
-                    </script>
-
-                """, height=450)    
-                
-            
-            answer_key = "Feedback"
-
-            button1 = st.button("trigger1", key="r{answer_key}1", on_click=lambda: submitAnswer(answer_key,"Тийм"))
-            button2 = st.button("trigger2", key="r{answer_key}2", on_click=lambda: submitAnswer(answer_key, "Үгүй"))
-            
-            if(button1 or button2):
-                goToNextPage()
-                
-    progress_chart()
-
-elif st.session_state.page == 7:
-    header()
-    col1, col2 = st.columns(2)
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;">
-                    <p>Таны шууд удирдлага ихэвчлэн аль зан төлвийг гаргадаг вэ?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        import base64
-        from pathlib import Path
-
-        def load_base64(path):
-            img_bytes = Path(path).read_bytes()
-            return base64.b64encode(img_bytes).decode()
-        
-        emoji1 = load_base64("static/images/Image (19).png")
-        emoji2 = load_base64("static/images/Image (22).png")
-
-
-        c1, c2 = st.columns(2)
-        
-        st.markdown("""
-        <style>
-            div[data-testid="stButton"] button {
-                display: none !important;
-            }
-                    
-            button#imgBtn span:hover{
-                border-color: #ec1c24;
-            }
-                    
-        /* Mobile layout */
-        @media (max-width: 900px) {
-            div[data-testid="stHorizontalBlock"] {
-                flex-direction: column !important;
-            }
-        }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-        with c1:
-             # --- Hidden Streamlit trigger ---
-            # --- Custom HTML Button with Image + Text ---
-            with st.spinner("loading"):
-                components.html(f"""
-                <button id="imgBtn" style=" 
-                    background: #fff;
-                    padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                    border: 1px solid #ccc;
-                    border-radius: 15px;
-                    cursor: pointer;
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                    gap: 1rem;
-                    width: 100%;
-                    max-width: 420px;
-                    height: 25rem;   
-                ">
-                    <img src="data:image/png;base64,{emoji1}" width="clamp(60px, 15vw, 130px)" height="200">
-                    <span style="font-size: clamp(1.2rem, 2vw, 2rem)">Би Би гэдэг</span>
-                </button>
-
-                <script>
-                    document.getElementById("imgBtn").onclick = () => {{
-                        const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-                        if (btn) btn.click();
-                    }};
-                </script>
-
-            """, height=450)
-
-        
-        with c2:
-            # --- Custom HTML Button with Image + Text ---
-            with st.spinner("loading"):
-                components.html(f"""
-                <button id="imgBtn" style=" 
-                    background: #fff;
-                    border: 1px solid #ccc;
-                    padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                    border-radius: 15px;
-                    cursor: pointer;
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                    width: 100%;
-                    max-width: 420px;
-                    height: 25rem;   
-
-                ">
-                    <img src="data:image/png;base64,{emoji2}" width="auto" height="200">
-                    <span style="font-size: clamp(1.2rem, 2vw, 2rem);">Бид Бид гэдэг</span>
-                </button>   
-
-                <script>    
-                    document.getElementById("imgBtn").onclick = () => {{
-                        const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-                        if (btn) btn[1].click();
-                    }};
-                </script>
-
-            """, height=450)    
-            
-        
-        answer_key = "Leadership_Style"
-
-        button1 = st.button("trigger1", key="r{answer_key}1", on_click=lambda: submitAnswer(answer_key,"Би Би гэдэг"))
-        button2 = st.button("trigger2", key="r{answer_key}2", on_click=lambda: submitAnswer(answer_key, "Бид Бид гэдэг"))
-        
-        if(button1 or button2):
-            goToNextPage()
-    progress_chart()
-
-
-elif st.session_state.page == 8:
-    header()
-    col1,col2 =  st.columns(2)
-
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;">
-                    <p> Таны харъяалагдаж буй баг доторх <span style="color: #ec1c24;">хамтын ажиллагаа,</span> хоорондын харилцаанд хэр сэтгэл хангалуун байсан бэ?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        st.markdown("""
-            <style>
-                    
-                /* Hide default radio buttons */
-                div[data-testid="stRadio"] > div > label > div:first-child {
-                    display: none !important;
-                }
-                    
-              /* area that contains the text (Streamlit wraps text inside a div) */
-                div[data-testid="stRadio"] label > div {
-                    /* respect newline characters in the option strings */
-                    white-space: pre-line;
-                }
-
-                /* Style radio group container */
-                div[data-testid="stRadio"] > div {
-                    gap: 10px;
-                    justify-content: center;
-                    align-items: center;
-                }
-                    /* "H1"-like first line */
-                div[data-testid="stRadio"] label > div::first-line {
-                    font-size: clamp(0.5rem, 1.5rem, 2rem);
-                }
-
-                /* Style each radio option like a button */
-                div[data-testid="stRadio"] label {
-                    background-color: #fff;       /* default background */
-                    width: 60%;
-                    padding: 8px 16px;
-                    border-radius: 8px;
-                    cursor: pointer;
-                    border: 1px solid #ccc;
-                    transition: background-color 0.2s;
-                    text-align: center;
-                    justify-content: center;
-                }
-                        
-                label[data-testid="stWidgetLabel"]{
-                    border: 0px !important;
-                    font-size: 2px !important;
-                    color: #898989;
-                    
-                }
-
-                /* Hover effect */
-                div[data-testid="stRadio"] label:hover {
-                    border-color: #ec1c24;
-                }
-
-                /* Checked/selected option */
-                div[data-testid="stRadio"] input:checked + label {
-                    background-color: #FF0000 !important; /* selected color */
-                    color: white !important;
-                    border-color: #ec1c24 !important;
-                }
-
-                /* Hide default radio circle */
-                div[data-testid="stRadio"] input[type="radio"] {
-                    display: none;
-                }
-                        
-            </style>
-            """, unsafe_allow_html=True)
-        
-       
-        options = [
-           "⭐\nОгт сэтгэл ханамжгүй", "⭐⭐\nСэтгэл ханамжгүй", "⭐⭐⭐\nДундаж", "⭐⭐⭐⭐\nСэтгэл хангалуун", "⭐⭐⭐⭐⭐\nМаш сэтгэл хангалуун"
-        ]
-
-        answer_key = "Team_Collaboration_Satisfaction"
-
-        def onRadioChange():
-            submitAnswer(answer_key,st.session_state.get(answer_key))
-            goToNextPageForRadio()
-        
-        # --- Create radio group ---
-        choice = st.radio(
-            "",
-            options,
-            horizontal=True,
-            key="Team_Collaboration_Satisfaction",
-            index=None,  
-            on_change=onRadioChange
-        )
-    progress_chart()
-
-elif st.session_state.page == 9:
-    header()
-    col1,col2 =  st.columns(2)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;display:flex; height:50vh;align-items: center; ">
-                    <p> Танд өдөр тутмын ажлаа <span style="color: #ec1c24;">урам зоригтой </span> хийхэд ямар хүчин зүйлс нөлөөлдөг байсан бэ?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        
-# --- Styling: make checkboxes look like buttons ---
-        st.markdown("""
-        <style>
-            /* Hide default checkbox icons */
-            div[data-testid="stCheckbox"] > label > span {
-                display: none;
-            }
-                    
-            
-            div[data-testid="stVerticalBlock"]  {
-                display: flex !important;
-                flex-direction: row;
-                flex-wrap: wrap !important;
-            }
-            
-                    
-            div[data-testid="stCheckbox"]  {
-                margin: 0 !important;
-                width: 100% !important;
-            }
-                        
-            /* Hide native checkbox */
-            div[data-testid="stCheckbox"] input {
-                position: absolute;
-                opacity: 0;
-                pointer-events: none;
-                width: 100% !important;
-            }
-
-            /* Style each label like a button */
-            div[data-testid="stCheckbox"] label {
-                border: 1px solid #d1d5db;
-                border-radius: 20px;
-                padding: 14px 20px;
-                text-align: center;
-                cursor: pointer;
-                width: 100% !important;
-                transition: all 0.15s ease-in-out;
-                user-select: none;
-                white-space: pre-line;  /* Respect newline in label */
-            }
-
-            /* Subtitle */
-            div[data-testid="stCheckbox"] p {
-                font-size: clamp(0.5rem, 1vw, 1rem);
-                color: #4b5563;
-            }
-
-            /* Hover effect */
-            div[data-testid="stCheckbox"] label:hover {
-                border-color: red !important; 
-            }
-
-            div[data-testid="stCheckbox"] input[type="checkbox"]:checked + div,
-            div[data-testid="stCheckbox"] input[type="checkbox"]:checked ~ div,
-            div[data-testid="stCheckbox"] label:has(input[type="checkbox"]:checked) > div,
-            div[data-testid="stCheckbox"] label:has(input[type="checkbox"]:checked) {
-                border-color: #ec1c24;
-            }
-
-        </style>
-        """, unsafe_allow_html=True)
-
-       
-        # --- OPTIONS ---
-        options = [ "Цалин",
-                    "Баг хамт олны дэмжлэг",
-                    "Сурч хөгжих боломжоор хангагддаг байсан нь",
-                    "Олон нийтийн үйл ажиллагаа",
-                    "Шударга нээлттэй харилцаа",
-                    "Шагнал урамшуулал",
-                    "Ажлын орчин",
-                    "Төсөл",
-                    "Хөтөлбөрүүд",
-                ]
-
-        # --- Session state for selected answers ---
-        st.session_state.selected = []
-
-        # --- Render choices ---
-        cols = st.columns(2)  # 2×3, change to st.columns(4) for 2×4 grid
-
-        for i, opt in enumerate(options):
-
-            check_for_max_choices = len(st.session_state.selected) == 3
-
-            is_checked = opt in st.session_state.selected
-            css_class = "checkbox-btn checked" if is_checked else "checkbox-btn"
-            key=f"cb_{i}"
-
-            if col2.checkbox(opt,key=key, value=is_checked, disabled=check_for_max_choices):
-                if not is_checked:
-                    # Trying to select
-                    st.session_state.selected.append(opt)
-                else:
-                    # Unselect
-                    st.session_state.selected.remove(opt)
-
-
-    # if(len(st.session_state.selected) > 0 and len(st.session_state.selected) <= 3):
-
-    answer_key = "Motivation_In_Daily_Work"
-    max_choices_reached = len(st.session_state.selected) > 3
-    escaped_answer = "; ".join(st.session_state.selected)
-
-    if(len(st.session_state.selected)):
-        nextPageBtn(max_choices_reached, answer_key, escaped_answer)
-    if(len(st.session_state.selected) > 3):
-        st.warning("Хамгийн ихдээ 3 төрлийг сонгоно уу")
-    progress_chart()
-
-elif st.session_state.page == 10:
-    header()
-    col1, col2 = st.columns(2)
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;">
-                    <p> Байгууллага танд ажиллах <span style="color: #ec1c24;"> таатай нөхцөл</span>, ажил амьдралын тэнцвэртэй байдлаар ханган дэмждэг байсан уу? /Жнь: уян хатан цагийн хуваарь, ажлын байрны орчин/</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        import base64
-        from pathlib import Path
-
-        def load_base64(path):
-            img_bytes = Path(path).read_bytes()
-            return base64.b64encode(img_bytes).decode()
-        
-        emoji1 = load_base64("static/images/Image (28).png")
-        emoji2 = load_base64("static/images/Image (2).png")
-
-
-        c1, c2 = st.columns(2)
-        
-
-        st.markdown("""
-        <style>
-            div[data-testid="stButton"] button {
-                display: none !important;
-            }
-                    
-        /* Mobile layout */
-        @media (max-width: 900px) {
-            div[data-testid="stHorizontalBlock"] {
-                flex-direction: column !important;
-            }
-        }
-        </style>
-    """, unsafe_allow_html=True)
-
-        with c1:
-             # --- Hidden Streamlit trigger ---
-            # --- Custom HTML Button with Image + Text ---
-            
-                components.html(f"""
-                <button id="imgBtn" style=" 
-                    background: #fff;
-                    padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                    border: 1px solid #ccc;
-                    border-radius: 15px;
-                    cursor: pointer;
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                    gap: 1rem;
-                    width: 100%;
-                    max-width: 420px;
-                    height: 25rem;  
-                ">
-                    <img src="data:image/png;base64,{emoji1}" width="clamp(60px, 15vw, 130px)" height="200">
-                    <span style="font-size: clamp(1.2rem, 2vw, 2rem)">Тийм</span>
-                </button>
-
-                <script>
-                    document.getElementById("imgBtn").onclick = () => {{
-                        const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-                        if (btn) btn.click();
-                    }};
-                </script>
-
-            """, height=450)
-
-        with c2:
-            # --- Custom HTML Button with Image + Text ---
-            
-                components.html(f"""
-                <button id="imgBtn" style=" 
-                    background: #fff;
-                    border: 1px solid #ccc;
-                    padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                    border-radius: 15px;
-                    cursor: pointer;
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                    width: 100%;
-                    max-width: 420px;
-                    height: 25rem;   
-
-                ">
-                    <img src="data:image/png;base64,{emoji2}" width="auto" height="200">
-                    <span style="font-size: clamp(1.2rem, 2vw, 2rem);">Үгүй</span>
-                </button>   
-
-                <script>    
-                    document.getElementById("imgBtn").onclick = () => {{
-                        const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-                        if (btn) btn[1].click();
-                    }};
-                </script>
-
-            """, height=450)    
-            
-        
-        answer_key = "Work_Life_Balance"
-
-        button1 = st.button("trigger1", key="r{answer_key}1", on_click=lambda: submitAnswer(answer_key,"Тийм"))
-        button2 = st.button("trigger2", key="r{answer_key}2", on_click=lambda: submitAnswer(answer_key, "Үгүй"))
-        
-        if( button1 or button2):
-            goToNextPage()
-
-    progress_chart()
-
-elif st.session_state.page == 11:
-    header()
-    col1,col2 =  st.columns(2)
-
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-    
-    # st.session_state.page = 10
-    # st.rerun()
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3;display:flex; height:50vh; align-items: center; ">
-                    <p> Танд компаниас олгосон тэтгэмж, хөнгөлөлтүүд (эрүүл мэндийн даатгал, цалинтай чөлөө, тэтгэмж гэх мэт) нь үнэ цэнтэй, ач холбогдолтой байсан уу?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        # st.markdown("""
-        #     <style>
-                    
-        #         /* Hide default radio buttons */
-        #         div[data-testid="stRadio"] > div > label > div:first-child {
-        #             display: none !important;
-        #         }
-                    
-        #       /* area that contains the text (Streamlit wraps text inside a div) */
-        #         div[data-testid="stRadio"] label > div {
-        #             /* respect newline characters in the option strings */
-        #             white-space: pre-line;
-        #         }
-
-        #         /* Style radio group container */
-        #         div[data-testid="stRadio"] > div {
-        #             gap: 10px;
-        #             justify-content: center;
-        #             align-items: center;
-        #         }
-        #             /* "H1"-like first line */
-        #         div[data-testid="stRadio"] label > div::first-line {
-        #             font-size: 2em;
-        #             font-weight: 700;
-        #             color: #111827;
-        #         }
-
-        #         /* Style each radio option like a button */
-        #         div[data-testid="stRadio"] label {
-        #             background-color: #fff;       /* default background */
-        #             width: 60%;
-        #             padding: 8px 16px;
-        #             border-radius: 8px;
-        #             cursor: pointer;
-        #             border: 1px solid #ccc;
-        #             transition: background-color 0.2s;
-        #             text-align: center;
-        #             justify-content: center;
-        #         }
-                        
-        #         label[data-testid="stWidgetLabel"]{
-        #             border: 0px !important;
-        #             font-size: 2px !important;
-        #             color: #898989;
-                    
-        #         }
-
-        #         /* Hover effect */
-        #         div[data-testid="stRadio"] label:hover {
-        #             border-color: #ec1c24;
-        #         }
-
-        #         /* Checked/selected option */
-        #         div[data-testid="stRadio"] input:checked + label {
-        #             background-color: #FF0000 !important; /* selected color */
-        #             color: white !important;
-        #             border-color: #ec1c24 !important;
-        #         }
-
-        #         /* Hide default radio circle */
-        #         div[data-testid="stRadio"] input[type="radio"] {
-        #             display: none;
-        #         }
-                        
-        #     </style>
-        #     """, unsafe_allow_html=True)
-        
-
-        # #emoji1 😃
-        # #emoji2 😉
-        # #emoji3 😐
-        # #emoji4 🙁
-
-        # options = [
-        #    "😃\nТийм, үнэ цэнтэй ач холбогдолтой", "😐\nСайн, гэхдээ сайжруулах шаардлагатай", "🙁\nАч холбогдолгүй, үр ашиггүй"
-        # ]
-
-        # answer_key = "Value_Of_Benefits"
-
-        # def onRadioChange():
-        #     submitAnswer(answer_key,st.session_state.get(answer_key))
-        #     goToNextPageForRadio()
-        
-        
-        # # --- Create radio group ---
-        # choice = st.radio(
-        #     "",
-        #     options,
-        #     horizontal=True,
-        #     index=None,
-        #     key="Value_Of_Benefits",
-        #     on_change=onRadioChange
-        # )
-
-        import base64
-        from pathlib import Path
-
-        def load_base64(path):
-            img_bytes = Path(path).read_bytes()
-            return base64.b64encode(img_bytes).decode()
-        
-        emoji1 = load_base64("static/images/Image (34).png")
-        emoji2 = load_base64("static/images/Image (30).png")
-        emoji3 = load_base64("static/images/Image (38).png")
-
-
-        c1, c2, c3 = st.columns(3)
-
-        st.markdown("""
-        <style>
-            div[data-testid="stButton"] button {
-                display: none !important;
-            }
-                    
-        /* Mobile layout */
-        @media (max-width: 900px) {
-            div[data-testid="stHorizontalBlock"] {
-                flex-direction: column !important;
-            }
-        }
-        </style>
-    """, unsafe_allow_html=True)
-        
-
-        st.markdown("""
-            <style>
-                    
-                /* Hide default radio buttons */
-                div[data-testid="stRadio"] > div > label > div:first-child {
-                    display: none !important;
-                }
-                    
-              /* area that contains the text (Streamlit wraps text inside a div) */
-                div[data-testid="stRadio"] label > div {
-                    /* respect newline characters in the option strings */
-                    white-space: pre-line;
-                }
-
-                /* Style radio group container */
-                div[data-testid="stRadio"] > div {
-                    gap: 10px;
-                    justify-content: center;
-                    align-items: center;
-                }
-                    /* "H1"-like first line */
-                div[data-testid="stRadio"] label > div::first-line {
-                    font-size: clamp(0.5rem, 1.5rem, 2rem);
-                }
-
-                /* Style each radio option like a button */
-                div[data-testid="stRadio"] label {
-                    background-color: #fff;       /* default background */
-                    width: 60%;
-                    padding: 8px 16px;
-                    border-radius: 8px;
-                    cursor: pointer;
-                    border: 1px solid #ccc;
-                    transition: background-color 0.2s;
-                    text-align: center;
-                    justify-content: center;
-                }
-                        
-                label[data-testid="stWidgetLabel"]{
-                    border: 0px !important;
-                    font-size: 2px !important;
-                    color: #898989;
-                    
-                }
-
-                /* Hover effect */
-                div[data-testid="stRadio"] label:hover {
-                    border-color: #ec1c24;
-                }
-
-                /* Checked/selected option */
-                div[data-testid="stRadio"] input:checked + label {
-                    background-color: #FF0000 !important; /* selected color */
-                    color: white !important;
-                    border-color: #ec1c24 !important;
-                }
-
-                /* Hide default radio circle */
-                div[data-testid="stRadio"] input[type="radio"] {
-                    display: none;
-                }
-                        
-            </style>
-            """, unsafe_allow_html=True)
-        
-       
-      
-
-        options = [
-            "⭐⭐⭐\nТийм, үнэ цэнтэй ач холбогдолтой", "⭐⭐\n Сайн, гэхдээ сайжруулах шаардлагатай ", "⭐\nАч холбогдолгүй, үр ашиггүй",
-        ]
-
-        answer_key = "Team_Collaboration_Satisfaction"
-
-        def onRadioChange():
-            submitAnswer(answer_key,st.session_state.get(answer_key))
-            goToNextPageForRadio()
-        
-        # --- Create radio group ---
-        choice = st.radio(
-            "",
-            options,
-            horizontal=True,
-            key="Team_Collaboration_Satisfaction",
-            index=None,  
-            on_change=onRadioChange
-        )
-
-
-        # with c1:
-        #      # --- Hidden Streamlit trigger ---
-        #     # --- Custom HTML Button with Image + Text ---
-        #     components.html(f"""
-        #         <button id="imgBtn" style=" 
-        #             background: #fff;
-        #             padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-        #             border: 1px solid #ccc;
-        #             border-radius: 15px;
-        #             cursor: pointer;
-        #             display: flex;
-        #             flex-direction: column;
-        #             align-items: center;
-        #             justify-content: center;
-        #             gap: 1rem;
-        #             width: 100%;
-        #             max-width: 420px;
-        #             height: 25rem;
-        #         ">
-        #             <span style="font-size: clamp(0.5rem, 1, 2rem)">Тийм, үнэ цэнтэй ач холбогдолтой</span>
-        #         </button>
-
-        #         <script>
-        #             document.getElementById("imgBtn").onclick = () => {{
-        #                 const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-        #                 if (btn) btn.click();
-        #             }};
-        #         </script>
-
-        #     """, height=450)
-        # with c2:
-        #     # --- Custom HTML Button with Image + Text ---
-        #     components.html(f"""
-        #         <button id="imgBtn" style=" 
-        #             background: #fff;
-        #             border: 1px solid #ccc;
-        #             padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-        #             border-radius: 15px;
-        #             cursor: pointer;
-        #             display: flex;
-        #             flex-direction: column;
-        #             align-items: center;
-        #             justify-content: center;
-        #             width: 100%;
-        #             max-width: 420px;
-        #             height: 25rem;   
-
-        #         ">
-        #             <span style="font-size: clamp(0.5rem, 1, 2rem);">Сайн, гэхдээ сайжруулах шаардлагатай</span>
-        #         </button>   
-
-        #         <script>    
-        #             document.getElementById("imgBtn").onclick = () => {{
-        #                 const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-        #                 if (btn) btn[1].click();
-        #             }};
-        #         </script>
-
-        #     """, height=450)    
-        # with c3:
-        #     # --- Custom HTML Button with Image + Text ---
-        #     components.html(f"""
-        #         <button id="imgBtn" style=" 
-        #             background: #fff;
-        #             border: 1px solid #ccc;
-        #             padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-        #             border-radius: 15px;
-        #             cursor: pointer;
-        #             display: flex;
-        #             flex-direction: column;
-        #             align-items: center;
-        #             justify-content: center;
-        #             width: 100%;
-        #             max-width: 420px;
-        #             height: 25rem;   
-
-        #         ">
-        #             <span style="font-size: clamp(0.5rem, 1, 2rem);">Ач холбогдолгүй,<br> Үр ашиггүй</span>
-        #         </button>   
-
-        #         <script>    
-        #             document.getElementById("imgBtn").onclick = () => {{
-        #                 const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-        #                 if (btn) btn[1].click();
-        #             }};
-        #         </script>
-
-        #     """, height=450)    
-        
-
-        
-        # answer_key = "Value_Of_Benefits"
-
-        # button1 = st.button("trigger1", key="r{answer_key}1", on_click=lambda: submitAnswer(answer_key,"Тийм, үнэ цэнтэй ач холбогдолтой"))
-        # button2 = st.button("trigger2", key="r{answer_key}2", on_click=lambda: submitAnswer(answer_key, "Сайн, гэхдээ сайжруулах шаардлагатай"))
-        # button3 = st.button("trigger2", key="r{answer_key}3", on_click=lambda: submitAnswer(answer_key, "Ач холбогдолгүй, үр ашиггүй"))
-        
-        # if( button1 or button2 or button3):
-        #     goToNextPage()
-
-    progress_chart()
-
-
-elif st.session_state.page == 12:
-    header()
-    col1,col2 =  st.columns(2)
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-                    
-            <h1 style="text-align: left; margin-left: 0; font-size: clamp(1rem, 1.5rem, 2rem); display:flex; height:50vh;align-items: center; ">
-                <p>Таны ажлын гүйцэтгэлийг (<span style="color: #ec1c24;">KPI, LTI</span>) үнэн зөв, шударга үнэлэн дүгнэдэг байсан уу?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-    
-            c1, c2, c3 = st.columns(3)
-
-            st.markdown("""
-            <style>
-                div[data-testid="stButton"] button {
-                    display: none !important;
-                }
-                        
-            /* Mobile layout */
-            @media (max-width: 900px) {
-                div[data-testid="stHorizontalBlock"] {
-                    flex-direction: column !important;
-                }
-            }
-            </style>
-        """, unsafe_allow_html=True)
-            
-
-            st.markdown("""
-                <style>
-                        
-                    /* Hide default radio buttons */
-                    div[data-testid="stRadio"] > div > label > div:first-child {
-                        display: none !important;
-                    }
-                        
-                /* area that contains the text (Streamlit wraps text inside a div) */
-                    div[data-testid="stRadio"] label > div {
-                        /* respect newline characters in the option strings */
-                        white-space: pre-line;
-                    }
-
-                    /* Style radio group container */
-                    div[data-testid="stRadio"] > div {
-                        gap: 10px;
-                        justify-content: center;
-                        align-items: center;
-                    }
-                        /* "H1"-like first line */
-                    div[data-testid="stRadio"] label > div::first-line {
-                        font-size: clamp(0.5rem, 1.5rem, 2rem);
-                    }
-
-                    /* Style each radio option like a button */
-                    div[data-testid="stRadio"] label {
-                        background-color: #fff;       /* default background */
-                        width: 60%;
-                        padding: 8px 16px;
-                        border-radius: 8px;
-                        cursor: pointer;
-                        border: 1px solid #ccc;
-                        transition: background-color 0.2s;
-                        text-align: center;
-                        justify-content: center;
-                    }
-                            
-                    label[data-testid="stWidgetLabel"]{
-                        border: 0px !important;
-                        font-size: 2px !important;
-                        color: #898989;
-                        
-                    }
-
-                    /* Hover effect */
-                    div[data-testid="stRadio"] label:hover {
-                        border-color: #ec1c24;
-                    }
-
-                    /* Checked/selected option */
-                    div[data-testid="stRadio"] input:checked + label {
-                        background-color: #FF0000 !important; /* selected color */
-                        color: white !important;
-                        border-color: #ec1c24 !important;
-                    }
-
-                    /* Hide default radio circle */
-                    div[data-testid="stRadio"] input[type="radio"] {
-                        display: none;
-                    }
-                            
-                </style>
-                """, unsafe_allow_html=True)
-            
-        
-        
-
-            options = [
-                "⭐⭐⭐⭐\nШударга, үнэн зөв үнэлдэг", "⭐⭐⭐\n Зарим нэг үзүүлэлт зөрүүтэй үнэлдэг ", "⭐⭐\nҮнэлгээ миний гүйцэтгэлтэй нийцдэггүй ","⭐\nМиний гүйцэтгэлийг хэрхэн үнэлснийг би ойлгодоггүй"
-            ]
-
-            answer_key = "Accuracy_Of_KPI_Evaluation"
-
-            def onRadioChange():
-                submitAnswer(answer_key,st.session_state.get(answer_key))
-                goToNextPageForRadio()
-            
-            # --- Create radio group ---
-            choice = st.radio(
-                "",
-                options,
-                horizontal=True,
-                key="Accuracy_Of_KPI_Evaluation",
-                index=None,  
-                on_change=onRadioChange
-            )
-       
-
-     
-    
-     
-    #     import base64
-    #     from pathlib import Path
-
-    #     def load_base64(path):
-    #         img_bytes = Path(path).read_bytes()
-    #         return base64.b64encode(img_bytes).decode()
-        
-    #     emoji1 = load_base64("static/images/Image (39).png")
-    #     emoji2 = load_base64("static/images/Image (21).png")
-    #     emoji3 = load_base64("static/images/Image (22).png")
-    #     emoji4 = load_base64("static/images/Image (35).png")
-
-
-    #     c1, c2, c3, c4 = st.columns(4)
-        
-
-
-
-    #     st.markdown("""
-    #     <style>
-    #         div[data-testid="stButton"] button {
-    #             display: none !important;
-    #         }
-                    
-    #     /* Mobile layout */
-    #     @media (max-width: 900px) {
-    #         div[data-testid="stHorizontalBlock"] {
-    #             flex-direction: column !important;
-    #         }
-    #     }
-    #     </style>
-    # """, unsafe_allow_html=True)
-
-
-
-    #     with c1:
-    #          # --- Hidden Streamlit trigger ---
-    #         # --- Custom HTML Button with Image + Text ---
-    #         components.html(f"""
-    #             <button id="imgBtn" style=" 
-    #                 background: #fff;
-    #                 padding: clamp(4rem, 6rem, 8rem) clamp(1rem, 1rem, 4rem);
-    #                 border: 1px solid #ccc;
-    #                 border-radius: 15px;
-    #                 cursor: pointer;
-    #                 display: flex;
-    #                 flex-direction: column;
-    #                 align-items: center;
-    #                 justify-content: center;
-    #                 width: 100%;
-    #                 max-width: 420px;
-    #                 height: 25rem;   
-    #             ">
-    #                 </br>
-    #                 <span style="font-size: clamp(1rem, 1rem, 2.5rem)">Шударга,<br> үнэн зөв үнэлдэг</span>
-    #             </button>
-
-    #             <script>
-    #                 document.getElementById("imgBtn").onclick = () => {{
-    #                     const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-    #                     if (btn) btn.click();
-    #                 }};
-    #             </script>
-
-    #         """, height=450)
-
-    #     with c2:
-    #         # --- Custom HTML Button with Image + Text ---
-    #         components.html(f"""
-    #             <button id="imgBtn" style=" 
-    #                 background: #fff;
-    #                 border: 1px solid #ccc;
-    #                 padding: clamp(4rem, 6rem, 8rem) clamp(1rem, 1rem, 4rem);
-    #                 border-radius: 15px;
-    #                 cursor: pointer;
-    #                 display: flex;
-    #                 flex-direction: column;
-    #                 align-items: center;
-    #                 justify-content: center;
-    #                 width: 100%;
-    #                 max-width: 420px;   
-    #                 height: 25rem;
-
-    #             ">
-    #                 </br>
-    #                 <span style="font-size: clamp(1rem, 1rem, 2.5rem);">Зарим нэг үзүүлэлт зөрүүтэй үнэлдэг</span>
-    #             </button>   
-
-    #             <script>    
-    #                 document.getElementById("imgBtn").onclick = () => {{
-    #                     const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-    #                     if (btn) btn[1].click();
-    #                 }};
-    #             </script>
-
-    #         """, height=450)    
-    #     with c3:
-    #         # --- Custom HTML Button with Image + Text ---
-    #         components.html(f"""
-    #             <button id="imgBtn" style=" 
-    #                 background: #fff;
-    #                 border: 1px solid #ccc;
-    #                 padding: clamp(4rem, 6rem, 8rem) clamp(1rem, 1rem, 4rem);
-    #                 border-radius: 15px;
-    #                 cursor: pointer;
-    #                 display: flex;
-    #                 flex-direction: column;
-    #                 align-items: center;
-    #                 justify-content: center;
-    #                 width: 100%;
-    #                 max-width: 420px;
-    #                 height: 25rem;   
-
-    #             ">
-    #                 </br>
-    #                 <span style="font-size: clamp(1rem, 1rem, 2.5rem);">Үнэлгээ миний гүйцэтгэлтэй нийцдэггүй</span>
-    #             </button>   
-
-    #             <script>    
-    #                 document.getElementById("imgBtn").onclick = () => {{
-    #                     const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-    #                     if (btn) btn[1].click();
-    #                 }};
-    #             </script>
-
-    #         """, height=450)    
-        
-    #     with c4:
-    #         # --- Custom HTML Button with Image + Text ---
-    #         components.html(f"""
-    #             <button id="imgBtn" style=" 
-    #                 background: #fff;
-    #                 border: 1px solid #ccc;
-    #                 padding: clamp(4rem, 6rem, 8rem) clamp(1rem, 1rem, 4rem);
-    #                 border-radius: 15px;
-    #                 cursor: pointer;
-    #                 display: flex;
-    #                 flex-direction: column;
-    #                 align-items: center;
-    #                 justify-content: center;
-    #                 width: 100%;
-    #                 max-width: 420px;  
-    #                 height: 25rem; 
-
-    #             ">
-    #                 </br>
-    #                 <span style="font-size: clamp(1rem, 1rem, 2.5rem);">Миний гүйцэтгэлийг хэрхэн үнэлснийг би ойлгодоггүй</span>
-    #             </button>   
-
-    #             <script>    
-    #                 document.getElementById("imgBtn").onclick = () => {{
-    #                     const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-    #                     if (btn) btn[1].click();
-    #                 }};
-    #             </script>
-
-    #         """, height=450)    
-        
-
-        
-
-    #     button1 = st.button("trigger1", key="r{answer_key}1", on_click=lambda: submitAnswer(answer_key,"Шударга, үнэн зөв үнэлдэг"))
-    #     button2 = st.button("trigger2", key="r{answer_key}2", on_click=lambda: submitAnswer(answer_key, "Зарим нэг үзүүлэлт зөрүүтэй үнэлдэг"))
-    #     button3 = st.button("trigger3", key="r{answer_key}3", on_click=lambda: submitAnswer(answer_key, "Үнэлгээ миний гүйцэтгэлтэй нийцдэггүй"))
-    #     button4 = st.button("trigger4", key="r{answer_key}4", on_click=lambda: submitAnswer(answer_key, "Миний гүйцэтгэлийг хэрхэн үнэлснийг би ойлгодоггүй"))
-        
-    #     if( button1 or button2 or button3 or button4):
-    #         goToNextPage()
-
-
-    progress_chart()
-
-
-elif st.session_state.page == 13:
-    header()
-    col1,col2 =  st.columns(2)
-
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3; display:flex; height:50vh;align-items: center;">
-                <p>Таны бодлоор компанидаа ажил, мэргэжлийн хувьд <span style="color: #ec1c24;">өсөж, хөгжих</span> боломж хангалттай байсан уу?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-
-
-        st.markdown("""
-            <style>
-                    
-                /* Hide default radio buttons */
-                div[data-testid="stRadio"] > div > label > div:first-child {
-                    display: none !important;
-                }
-                    
-              /* area that contains the text (Streamlit wraps text inside a div) */
-                div[data-testid="stRadio"] label > div {
-                    /* respect newline characters in the option strings */
-                    white-space: pre-line;
-                }
-
-                /* Style radio group container */
-                div[data-testid="stRadio"] > div {
-                    gap: 10px;
-                    justify-content: center;
-                    align-items: center;
-                }
-                    /* "H1"-like first line */
-                div[data-testid="stRadio"] label > div::first-line {
-                    font-size: clamp(0.5rem, 1.5rem, 2rem);
-                }
-
-                /* Style each radio option like a button */
-                div[data-testid="stRadio"] label {
-                    background-color: #fff;       /* default background */
-                    width: 60%;
-                    padding: 8px 16px;
-                    border-radius: 8px;
-                    cursor: pointer;
-                    border: 1px solid #ccc;
-                    transition: background-color 0.2s;
-                    text-align: center;
-                    justify-content: center;
-                }
-                        
-                label[data-testid="stWidgetLabel"]{
-                    border: 0px !important;
-                    font-size: 2px !important;
-                    color: #898989;
-                    
-                }
-
-                /* Hover effect */
-                div[data-testid="stRadio"] label:hover {
-                    border-color: #ec1c24;
-                }
-
-                /* Checked/selected option */
-                div[data-testid="stRadio"] input:checked + label {
-                    background-color: #FF0000 !important; /* selected color */
-                    color: white !important;
-                    border-color: #ec1c24 !important;
-                }
-
-                /* Hide default radio circle */
-                div[data-testid="stRadio"] input[type="radio"] {
-                    display: none;
-                }
-                        
-            </style>
-            """, unsafe_allow_html=True)
-        
-       
-       
-        options = [
-            "⭐⭐⭐\nӨсөж хөгжих боломж хангалттай байдаг", "⭐⭐\nХангалттай биш", "⭐\nӨсөж хөгжих боломж байдаггүй",
-        ]
-
-        answer_key = "Career_Growth_Opportunities"
-
-        def onRadioChange():
-            submitAnswer(answer_key,st.session_state.get(answer_key))
-            goToNextPageForRadio()
-        
-        # --- Create radio group ---
-        choice = st.radio(
-            "",
-            options,
-            horizontal=True,
-            key="Career_Growth_Opportunities",
-            index=None,  
-            on_change=onRadioChange
+with get_rerun_timings().page(timing_page_name()):
+    if not st.session_state.logged_in:
+        login_page()
+        st.stop()
+    elif st.session_state.page == -0.5:
+        directory_page()
+        st.stop()
+    elif st.session_state.page == -1:
+        table_view_page()
+        st.stop()
+    elif st.session_state.page == -2:
+        analytics_page()
+        st.stop()
+
+
+    # ---- PAGE 0: CATEGORY + SURVEY TYPE (Single Page) ----
+    if st.session_state.page == 0:
+        header()
+        st.header("Ерөнхий мэдээлэл")
+        st.markdown("**Судалгааны ангилал болон төрлөө сонгоно уу.**")
+
+        # Step 1: Category (dropdown)
+        category = st.selectbox(
+            "Судалгааны ангилал:",
+            ["-- Сонгох --"] + list(survey_types.keys()),
+            index=0 if not st.session_state.category_selected else list(survey_types.keys()).index(st.session_state.category_selected) + 1,
+            key="category_select"
         )
-
-    progress_chart()
-
-elif st.session_state.page == 14:
-    header()
-    col1,col2 =  st.columns(2)
-
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3; display:flex; height:50vh;align-items: center; ">
-                <p>Компаниас зохион байгуулдаг <span style="color: #ec1c24;"> сургалтууд </span> чанартай үр дүнтэй байж таныг ажил мэргэжлийн ур чадвараа нэмэгдүүлэхэд дэмжлэг үзүүлж чадсан уу?</p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        with st.spinner("loading"):
-            import base64
-            from pathlib import Path
-
-            def load_base64(path):
-                img_bytes = Path(path).read_bytes()
-                return base64.b64encode(img_bytes).decode()
-            
-            emoji1 = load_base64("static/images/Image (15).png")
-            emoji2 = load_base64("static/images/Image (5).png")
-            emoji3 = load_base64("static/images/Image (9).png")
-
-
-            c1, c2, c3 = st.columns(3)
-            
-
-            st.markdown("""
-                    <style>
-                        div[data-testid="stButton"] button {
-                            display: none !important;
-                        }
-                                
-                    /* Mobile layout */
-                    @media (max-width: 900px) {
-                        div[data-testid="stHorizontalBlock"] {
-                            flex-direction: column !important;
-                        }
-                    }
-                    </style>
-                """, unsafe_allow_html=True)
-
-
-            with c1:
-                # --- Hidden Streamlit trigger ---
-                # --- Custom HTML Button with Image + Text ---
-                with st.spinner("loading"):
-                    components.html(f"""
-                    <button id="imgBtn" style=" 
-                        background: #fff;
-                        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                        border: 1px solid #ccc;
-                        border-radius: 15px;
-                        cursor: pointer;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        justify-content: space-between;
-                        gap: 1rem;
-                        width: 100%;
-                        max-width: 420px;  
-                        height: 25rem;
-
-                    ">
-                        <img src="data:image/png;base64,{emoji1}" width="clamp(60px, 15vw, 130px)" height="150">
-                        <br/>                    
-                        <span style="font-size: clamp(0.1rem, 0.5, 2rem)">Маш сайн</span>
-                    </button>
-
-                    <script>
-                        document.getElementById("imgBtn").onclick = () => {{
-                            const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-                            if (btn) btn.click();
-                        }};
-                    </script>
-
-                """, height=450)
-
-            
-            with c2:
-                # --- Custom HTML Button with Image + Text ---
-                with st.spinner("loading"):
-                    components.html(f"""
-                    <button id="imgBtn" style=" 
-                        background: #fff;
-                        border: 1px solid #ccc;
-                        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                        border-radius: 15px;
-                        cursor: pointer;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        justify-content: space-between;
-                        width: 100%;
-                        max-width: 420px;   
-                        height: 25rem;
-                    ">
-                        <img src="data:image/png;base64,{emoji2}" width="auto" height="150">
-                        <br/>
-                        <br/>
-                        <br/>
-                        <span style="font-size: clamp(0.1rem, 0.5, 2rem);">Сайн, гэхдээ сайжруулах шаардлагатай</span>
-                    </button>   
-
-                    <script>    
-                        document.getElementById("imgBtn").onclick = () => {{
-                            const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-                            if (btn) btn[1].click();
-                        }};
-                    </script>
-
-                """, height=450)    
-            with c3:
-                # --- Custom HTML Button with Image + Text ---
-                with st.spinner("loading"):
-                    components.html(f"""
-                    <button id="imgBtn" style=" 
-                        background: #fff;
-                        border: 1px solid #ccc;
-                        padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                        border-radius: 15px;
-                        cursor: pointer;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        justify-content: space-between;
-                        width: 100%;
-                        max-width: 420px; 
-                        height: 25rem;
-                    ">
-                        <img src="data:image/png;base64,{emoji3}" width="auto" height="150">
-                        <br/>
-                        <br/> 
-                        <br/> 
-                        <span style="font-size: clamp(0.1rem, 0.5, 2rem);">Үр дүнгүй</span>
-                    </button>   
-
-                    <script>    
-                        document.getElementById("imgBtn").onclick = () => {{
-                            const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-                            if (btn) btn[1].click();
-                        }};
-                    </script>
-
-                """, height=450)    
-            
-
-            
-            answer_key = "Quality_Of_Training_Programs"
-
-            button1 = st.button("trigger1", key="r{answer_key}1", on_click=lambda: submitAnswer(answer_key,"Маш сайн"))
-            button2 = st.button("trigger2", key="r{answer_key}2", on_click=lambda: submitAnswer(answer_key, "Сайн, гэхдээ сайжруулах шаардлагатай"))
-            button3 = st.button("trigger2", key="r{answer_key}3", on_click=lambda: submitAnswer(answer_key, "Үр дүнгүй"))
-            
-            if( button1 or button2 or button3):
-                goToNextPage()
-        
-    progress_chart()
-
-        
-elif st.session_state.page == 15:
-    header()
-    col1, col2 = st.columns(2)
-    st.markdown("""
-        <style>
-                div[data-testid="stHorizontalBlock"] {
-                    align-items: center;
-                }
-        </style>
-    """, unsafe_allow_html=True)
-
-
-    with col1:
-
-        st.markdown("""
-            <h1 style="font-size: clamp(1rem, 1.5rem, 2rem); line-height: 1.3; display:flex; height:50vh;align-items: center; ">
-                <p> Та ойрын хүрээлэлдээ "<span style="color: #ec1c24;">АПУ ХХК</span>" -т ажилд орохыг санал болгох уу? </p>
-            </h1>
-        """, unsafe_allow_html=True)
-    with col2:
-        import base64
-        from pathlib import Path
-
-        def load_base64(path):
-            img_bytes = Path(path).read_bytes()
-            return base64.b64encode(img_bytes).decode()
-        
-        emoji1 = load_base64("static/images/Image (25).png")
-        emoji2 = load_base64("static/images/Image (16).png")
-
-
-        c1, c2 = st.columns(2)
-        
-        st.markdown("""
-                <style>
-                    div[data-testid="stButton"] button {
-                        display: none !important;
-                    }
-                            
-                /* Mobile layout */
-                @media (max-width: 900px) {
-                    div[data-testid="stHorizontalBlock"] {
-                        flex-direction: column !important;
-                    }
-                }
-                </style>
-            """, unsafe_allow_html=True)
-
-        with c1:
-             # --- Hidden Streamlit trigger ---
-            # --- Custom HTML Button with Image + Text ---
-            with st.spinner("loading"):
-                components.html(f"""
-                <button id="imgBtn" style=" 
-                    background: #fff;
-                    padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                    border: 1px solid #ccc;
-                    border-radius: 15px;
-                    cursor: pointer;
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                    gap: 1rem;
-                    width: 100%;
-                    max-width: 420px;
-                    height: 25rem;
-                ">
-                    <img src="data:image/png;base64,{emoji1}" width="clamp(60px, 15vw, 130px)" height="180">
-                    <span style="font-size: clamp(1.2rem, 2vw, 2rem)">Тийм</span>
-                </button>
-
-                <script>
-                    document.getElementById("imgBtn").onclick = () => {{
-                        const btn = parent.document.querySelector('button[data-testid="stBaseButton-secondary"][kind="secondary"]:first-of-type');
-                        if (btn) btn.click();
-                    }};
-                </script>
-
-                """, height=450)
-
-        
-        with c2:
-            # --- Custom HTML Button with Image + Text ---
-            with st.spinner("loading"):
-                components.html(f"""
-                <button id="imgBtn" style=" 
-                    background: #fff;
-                    border: 1px solid #ccc;
-                    padding: clamp(6rem, 2vw, 8rem) clamp(3rem, 2vw, 4rem);
-                    border-radius: 15px;
-                    cursor: pointer;
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                    width: 100%;
-                    max-width: 420px;   
-                    height: 25rem;
-                ">
-                    <img src="data:image/png;base64,{emoji2}" width="auto" height="180">
-                    <br/>
-                    <span style="font-size: clamp(1.2rem, 2vw, 2rem);">Үгүй</span>
-                </button>   
-
-                <script>    
-                    document.getElementById("imgBtn").onclick = () => {{
-                       const btn = parent.document.querySelectorAll('button[data-testid="stBaseButton-secondary"][kind="secondary"]');
-                        if (btn) btn[1].click();
-                    }};
-                </script>
-
-                """, height=450)    
-            
-        
-        answer_key = "Loyalty"
-
-        button1 = st.button("trigger1", key="r{answer_key}1", on_click=lambda: submitAnswer(answer_key,"Тийм"))
-        button2 = st.button("trigger2", key="r{answer_key}2", on_click=lambda: submitAnswer(answer_key, "Үгүй"))
-        
-        if( button1 or button2):
-            goToNextPage()
-
-
-    progress_chart()
-
-elif st.session_state.page == "survey_end":
-    with st.spinner("Submitting answers"):
+        if category != "-- Сонгох --":
+            set_category(category)
+
+        # Step 2: Survey type (buttons) -- always shown if category selected
+        if st.session_state.category_selected:
+            st.markdown("**Судалгааны төрөл:**")
+            types = survey_types[st.session_state.category_selected]
+            cols = st.columns(len(types))
+            for i, survey in enumerate(types):
+                with cols[i]:
+                    if st.button(survey, key=f"survey_{i}"):
+                        set_survey_type(survey)
+                        st.rerun()
+
+
+    # ---- SURVEY QUESTIONS ----
+    elif st.session_state.page in QUESTIONS:
+        question_page(QUESTIONS[st.session_state.page])
+
+    elif st.session_state.page == SURVEY_END:
         if submit_answers():
             final_thank_you()
 
-elif st.session_state.page == "show_survey_answers":
-    empcode = st.session_state.survey_answer_empcode 
-    if empcode:
-        show_survey_answers_page(empcode)
+    elif st.session_state.page == "show_survey_answers":
+        empcode = st.session_state.survey_answer_empcode 
+        if empcode:
+            show_survey_answers_page(empcode)
 
-elif st.session_state.page == "interview_0":
-    interview_intro()
+    elif st.session_state.page == "interview_0":
+        interview_intro()
 
-elif st.session_state.page == "interview_form":
-    interview_form()
+    elif st.session_state.page == "interview_form":
+        interview_form()
 
-elif st.session_state.page == "interview_end":
-    interview_end()
+    elif st.session_state.page == "interview_end":
+        interview_end()
 
 
 # progress_chart
@@ -0,0 +1,291 @@
+# submission_queue.py
+# Write-behind queue for survey answers: the page acknowledges right away, the rows are
+# spooled to a local SQLite file and a background thread flushes them to the storage backend
+# (Snowflake, see storage.py) in batches.
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from analytics import get_exit_rollup
+from exit_summary import get_exit_summary
+from hr_views import invalidate_submitted_surveys
+from link_cache import get_link_cache
+from pending_interviews import get_pending_interviews
+from storage import get_storage
+
+
+# ---- Queue defaults (override under [submission_queue] in secrets.toml) ----
+DEFAULT_SPOOL_PATH = ".spool/survey_answers.sqlite3"
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 2.0   # seconds the worker waits for more rows before flushing
+DEFAULT_RETRY_BACKOFF = 2.0    # first retry delay after a failed flush, doubled per attempt
+DEFAULT_MAX_BACKOFF = 300.0    # cap on the retry delay (seconds)
+DEFAULT_MAX_AGE = 7 * 24 * 3600.0  # a row still unflushed this long after enqueue is marked "failed"
+
+PENDING = "pending"
+FLUSHED = "flushed"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    empcode     TEXT,
+    payload     TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    last_error  TEXT,
+    created_at  REAL NOT NULL,
+    flushed_at  REAL,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS submissions_status ON submissions (status, id);
+CREATE INDEX IF NOT EXISTS submissions_empcode ON submissions (empcode);
+"""
+
+
+def _encode(row: dict) -> str:
+    return json.dumps(
+        {k: ({"__dt__": v.isoformat()} if isinstance(v, datetime) else v) for k, v in row.items()},
+        ensure_ascii=False,
+    )
+
+
+def _decode(payload: str) -> dict:
+    row = json.loads(payload)
+    return {
+        k: (datetime.fromisoformat(v["__dt__"]) if isinstance(v, dict) and "__dt__" in v else v)
+        for k, v in row.items()
+    }
+
+
+class SubmissionQueue:
+    """Durable (SQLite-spooled) write-behind queue flushed by one daemon thread."""
+
+    def __init__(self, spool_path, flush_fn, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, retry_backoff=DEFAULT_RETRY_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF, max_age=DEFAULT_MAX_AGE, on_flushed=None):
+        self.spool_path = spool_path
+        self._flush_fn = flush_fn          # flush_fn(list_of_rows) -> None, raises on failure
+        self._on_flushed = on_flushed      # on_flushed(list_of_rows) after a successful flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.max_age = max_age
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        spool_dir = os.path.dirname(spool_path)
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            # Spools written before retries were scheduled lack the column
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(submissions)")}
+            if "next_attempt_at" not in columns:
+                conn.execute(
+                    "ALTER TABLE submissions ADD COLUMN next_attempt_at REAL NOT NULL DEFAULT 0"
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.spool_path, timeout=30)
+
+    # ---- producer side ----
+    def enqueue(self, row: dict) -> int:
+        """Spool one answer row; returns the submission id to poll with status()."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO submissions (empcode, payload, created_at) VALUES (?, ?, ?)",
+                (row.get("EMPCODE"), _encode(row), time.time()),
+            )
+            submission_id = cur.lastrowid
+        self._wake.set()
+        return submission_id
+
+    def status(self, submission_id: int) -> dict:
+        with self._connect() as conn:
+            r = conn.execute(
+                "SELECT status, attempts, last_error FROM submissions WHERE id = ?",
+                (submission_id,),
+            ).fetchone()
+        if r is None:
+            return {"status": None, "attempts": 0, "error": None}
+        return {"status": r[0], "attempts": r[1], "error": r[2]}
+
+    def has_submission(self, empcode) -> bool:
+        """True if this empcode is waiting in (or was flushed from) the local spool."""
+        with self._connect() as conn:
+            r = conn.execute(
+                "SELECT 1 FROM submissions WHERE empcode = ? AND status != ? LIMIT 1",
+                (empcode, FAILED),
+            ).fetchone()
+        return r is not None
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM submissions GROUP BY status").fetchall())
+            retrying, next_attempt_at = conn.execute(
+                "SELECT COUNT(*), MIN(next_attempt_at) FROM submissions WHERE status = ? AND attempts > 0",
+                (PENDING,),
+            ).fetchone()
+        stats = {s: counts.get(s, 0) for s in (PENDING, FLUSHED, FAILED)}
+        stats["retrying"] = retrying
+        stats["next_retry_in"] = max(0.0, next_attempt_at - time.time()) if retrying else None
+        return stats
+
+    def requeue_failed(self, ids=None) -> int:
+        """Put failed rows (all, or just ids) back to pending for an immediate retry."""
+        # created_at restarts too, so a requeued row gets a fresh max_age window
+        sql = (
+            "UPDATE submissions SET status = ?, attempts = 0, next_attempt_at = 0, created_at = ?"
+            " WHERE status = ?"
+        )
+        params = [PENDING, time.time(), FAILED]
+        if ids is not None:
+            ids = list(ids)
+            if not ids:
+                return 0
+            sql += f" AND id IN ({', '.join('?' * len(ids))})"
+            params += ids
+        with self._connect() as conn:
+            requeued = conn.execute(sql, params).rowcount
+        if requeued:
+            self._wake.set()
+        return requeued
+
+    # ---- consumer side ----
+    def flush_once(self) -> int:
+        """Flush up to batch_size pending rows that are due; returns how many were written."""
+        with self._connect() as conn:
+            batch = conn.execute(
+                "SELECT id, payload FROM submissions WHERE status = ? AND next_attempt_at <= ?"
+                " ORDER BY id LIMIT ?",
+                (PENDING, time.time(), self.batch_size),
+            ).fetchall()
+        if not batch:
+            return 0
+
+        ids = [r[0] for r in batch]
+        rows = [_decode(r[1]) for r in batch]
+        try:
+            self._flush_fn(rows)
+        except Exception as e:
+            if len(batch) == 1:
+                self._mark_failed_attempt(ids[0], e)
+                return 0
+            # One bad row must not hold back the rest: retry the batch row by row
+            written = 0
+            for submission_id, row in zip(ids, rows):
+                try:
+                    self._flush_fn([row])
+                except Exception as row_error:
+                    self._mark_failed_attempt(submission_id, row_error)
+                else:
+                    self._mark_flushed([submission_id], [row])
+                    written += 1
+            return written
+
+        self._mark_flushed(ids, rows)
+        return len(ids)
+
+    def _mark_flushed(self, ids, rows):
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE submissions SET status = ?, flushed_at = ?, last_error = NULL WHERE id = ?",
+                [(FLUSHED, time.time(), i) for i in ids],
+            )
+        if self._on_flushed:
+            try:
+                self._on_flushed(rows)
+            except Exception:
+                pass
+
+    def _mark_failed_attempt(self, submission_id, error):
+        """Schedule the next try with exponential backoff; only rows older than max_age give up."""
+        now = time.time()
+        with self._connect() as conn:
+            r = conn.execute(
+                "SELECT attempts, created_at FROM submissions WHERE id = ?", (submission_id,)
+            ).fetchone()
+            if r is None:
+                return
+            attempts, created_at = r
+            delay = min(self.retry_backoff * 2 ** attempts, self.max_backoff)
+            status = FAILED if now - created_at >= self.max_age else PENDING
+            conn.execute(
+                """
+                UPDATE submissions
+                SET attempts = attempts + 1,
+                    last_error = ?,
+                    next_attempt_at = ?,
+                    status = ?
+                WHERE id = ?
+                """,
+                (str(error), now + delay, status, submission_id),
+            )
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="survey-answer-flusher", daemon=True)
+        self._thread.start()
+        self._wake.set()  # pick up anything left over from before a restart
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                # Keep draining while full batches come back
+                while self.flush_once() >= self.batch_size:
+                    pass
+            except Exception:
+                # Spool errors must never kill the worker; next tick retries
+                time.sleep(self.flush_interval)
+
+
+def _flush_to_storage(rows):
+    get_storage().insert_survey_answers(rows)
+
+
+def _on_flushed(rows):
+    invalidate_submitted_surveys()
+    link_cache = get_link_cache()
+    for row in rows:
+        link_cache.invalidate_empcode(row.get("EMPCODE"))
+    get_pending_interviews().add_submitted(rows)
+    get_exit_summary().request_refresh()
+    get_exit_rollup().request_refresh()
+
+
+@st.cache_resource
+def get_submission_queue() -> SubmissionQueue:
+    """One queue + flusher thread per Streamlit server process."""
+    cfg = st.secrets.get("submission_queue", {})
+    queue = SubmissionQueue(
+        cfg.get("spool_path", DEFAULT_SPOOL_PATH),
+        flush_fn=_flush_to_storage,
+        batch_size=int(cfg.get("batch_size", DEFAULT_BATCH_SIZE)),
+        flush_interval=float(cfg.get("flush_interval", DEFAULT_FLUSH_INTERVAL)),
+        retry_backoff=float(cfg.get("retry_backoff", DEFAULT_RETRY_BACKOFF)),
+        max_backoff=float(cfg.get("max_backoff", DEFAULT_MAX_BACKOFF)),
+        max_age=float(cfg.get("max_age", DEFAULT_MAX_AGE)),
+        on_flushed=_on_flushed,
+    )
+    queue.start()
+    return queue
@@ -0,0 +1,127 @@
+# survey_links.py
+# Survey links for many leavers at once. HR pastes / uploads "empcode, category" rows; every
+# employee is resolved in one query, tenure and survey type are computed column-wise, all
+# tokens are written with multi-row INSERTs and the result comes back as a table of links.
+import io
+import re
+import uuid
+from datetime import date
+
+import pandas as pd
+
+from config import BASE_URL
+from navigation import total_questions_number_dict
+from survey_types import categorize_employment_duration, survey_types_for, tenure_months
+
+# Categories that have an online survey (АЖИЛ ХАЯЖ ЯВСАН is recorded by HR directly)
+LINK_CATEGORIES = tuple(total_questions_number_dict)
+
+STATUS_CREATED = "✅ Линк үүслээ"
+STATUS_NOT_FOUND = "❌ Ажилтан олдсонгүй"
+STATUS_SUBMITTED = "❌ Судалгаа бөглөсөн"
+STATUS_BAD_CATEGORY = "❌ Ангилал буруу"
+
+RESULT_COLUMNS = (
+    "EMPCODE", "LASTNAME", "FIRSTNAME", "COMPANYNAME", "POSNAME", "CATEGORY", "SURVEY_TYPE",
+    "STATUS", "LINK",
+)
+
+_SPLIT = re.compile(r"\s*[,;\t]\s*")
+
+
+def survey_link(token, order=None) -> str:
+    """Link URL for a token; legacy random tokens carry their total_questions_order in the URL."""
+    if order is None:
+        return f"{BASE_URL}?mode=link&token={token}"
+    return (
+        f"{BASE_URL}?mode=link&token={token}&start_idx={order['start_idx']}"
+        f"&skip_idx={order['skip_idx']}&total_questions={order['total_questions']}"
+    )
+
+
+def issue_link(signer, empcode, survey_type, order):
+    """(TOKEN stored in APU_SURVEY_LINKS, link URL) for one employee.
+
+    With a TokenSigner the URL carries a signed token (plan and expiry inside) and the table
+    keeps its token id for auditing / revocation; without one it is a random lookup token.
+    """
+    if signer is None:
+        token = uuid.uuid4().hex
+        return token, survey_link(token, order)
+    token_id, token = signer.issue(empcode, survey_type, order)
+    return token_id, survey_link(token)
+
+
+def parse_link_requests(text, default_category=None) -> pd.DataFrame:
+    """EMPCODE / CATEGORY frame from pasted lines "empcode" or "empcode, category" (also ; or tab)."""
+    rows = []
+    for line in str(text or "").splitlines():
+        if not line.strip():
+            continue
+        parts = _SPLIT.split(line.strip(), maxsplit=1)
+        rows.append((parts[0], parts[1] if len(parts) > 1 and parts[1] else default_category))
+    return _normalize_requests(pd.DataFrame(rows, columns=["EMPCODE", "CATEGORY"]))
+
+
+def read_link_requests_csv(data, default_category=None) -> pd.DataFrame:
+    """EMPCODE / CATEGORY frame from an uploaded CSV (EMPCODE column required, CATEGORY optional)."""
+    df = pd.read_csv(io.BytesIO(data) if isinstance(data, bytes) else data, dtype=str, encoding="utf-8-sig")
+    df.columns = [c.strip().upper() for c in df.columns]
+    if "EMPCODE" not in df.columns:
+        raise ValueError("CSV файлд EMPCODE багана алга")
+    if "CATEGORY" not in df.columns:
+        df["CATEGORY"] = default_category
+    df["CATEGORY"] = df["CATEGORY"].fillna(default_category)
+    return _normalize_requests(df[["EMPCODE", "CATEGORY"]])
+
+
+def _normalize_requests(df) -> pd.DataFrame:
+    df = df.assign(
+        EMPCODE=df["EMPCODE"].astype("string").str.strip(),
+        CATEGORY=df["CATEGORY"].astype("string").str.strip().str.upper(),
+    )
+    df = df[df["EMPCODE"].fillna("") != ""]
+    return df.drop_duplicates("EMPCODE", keep="last").reset_index(drop=True)
+
+
+def generate_links(storage, requests: pd.DataFrame, today=None, queued=lambda empcode: False,
+                   signer=None) -> pd.DataFrame:
+    """Resolve, type and insert links for every request row; one RESULT_COLUMNS row per request.
+
+    storage is the storage.py backend; queued(empcode) -> True blocks employees whose survey is
+    still in the local write-behind queue; signer is the TokenSigner (None: random lookup tokens).
+    """
+    today = today or date.today()
+    employees = storage.employees_for_links(requests["EMPCODE"].tolist())
+    employees["EMPCODE"] = employees["EMPCODE"].astype(str)
+
+    df = requests.merge(employees, on="EMPCODE", how="left", indicator=True)
+    found = df["_merge"] == "both"
+    df["TENURE_MONTHS"] = 0
+    df.loc[found, "TENURE_MONTHS"] = tenure_months(df[found], today)
+
+    valid_category = df["CATEGORY"].isin(LINK_CATEGORIES)
+    submitted = found & (
+        df["ALREADY_SUBMITTED"].fillna(False).astype(bool) | df["EMPCODE"].map(queued).astype(bool)
+    )
+    df["STATUS"] = STATUS_CREATED
+    df.loc[submitted, "STATUS"] = STATUS_SUBMITTED
+    df.loc[~valid_category, "STATUS"] = STATUS_BAD_CATEGORY
+    df.loc[~found, "STATUS"] = STATUS_NOT_FOUND
+    ok = df["STATUS"] == STATUS_CREATED
+
+    df["SURVEY_TYPE"] = None
+    df["LINK"] = None
+    if ok.any():
+        rows = df[ok]
+        types = survey_types_for(rows["CATEGORY"], rows["TENURE_MONTHS"])
+        buckets = rows["TENURE_MONTHS"].map(categorize_employment_duration)
+        issued = [
+            issue_link(signer, empcode, survey_type, total_questions_number_dict[category][bucket])
+            for empcode, survey_type, category, bucket in zip(rows["EMPCODE"], types, rows["CATEGORY"], buckets)
+        ]
+        df.loc[ok, "SURVEY_TYPE"] = types
+        df.loc[ok, "LINK"] = [url for _, url in issued]
+        storage.insert_survey_links(zip([token for token, _ in issued], rows["EMPCODE"], types))
+
+    return df[list(RESULT_COLUMNS)]
@@ -0,0 +1,231 @@
+# survey_tokens.py
+# Self-contained survey link tokens: empcode, survey type, question plan, issue time and expiry,
+# signed with HMAC-SHA256. Opening a link verifies the token in process (no APU_SURVEY_LINKS lookup,
+# no trusting start_idx / skip_idx / total_questions from the URL); revoked links are caught
+# by an in-memory deny-list that a background thread refreshes from APU_SURVEY_LINK_REVOCATIONS.
+# Revoking an employee rejects the links issued up to then; a link sent afterwards works again.
+#
+# Enabled by a `secret` under [survey_tokens] in secrets.toml; without one the app keeps issuing
+# random tokens that are resolved through APU_SURVEY_LINKS. Old secrets listed under
+# `previous_secrets` still verify, so the key can be rotated without breaking sent links.
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+
+import streamlit as st
+
+from storage import get_storage
+
+TOKEN_VERSION = 2                  # 2 added the issue time; version 1 tokens still verify
+SIGNATURE_BYTES = 16               # truncated HMAC-SHA256 (128 bits)
+DEFAULT_TTL = 30 * 24 * 3600       # seconds a link stays valid
+DEFAULT_REVOCATION_REFRESH = 300   # seconds between deny-list refreshes
+
+# Survey types travel as their index here (append only: issued tokens keep their meaning)
+SURVEY_TYPE_CODES = (
+    "1 жил хүртэл", "1-ээс дээш", "6 сар дотор гарч байгаа", "7 сараас 3 жил ",
+    "4-10 жил", "11 болон түүнээс дээш", "Мэдээлэл бүртгэх",
+)
+
+
+class InvalidToken(ValueError):
+    """Malformed, tampered or expired token; str(e) says which."""
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def is_signed_token(token) -> bool:
+    """Signed tokens are "<payload>.<signature>"; the legacy random ones are bare hex."""
+    return isinstance(token, str) and token.count(".") == 1
+
+
+class TokenSigner:
+    """Issues and verifies signed link tokens."""
+
+    def __init__(self, secret, previous_secrets=(), ttl=DEFAULT_TTL):
+        self._keys = [s.encode("utf-8") for s in (secret, *previous_secrets) if s]
+        if not self._keys:
+            raise ValueError("survey token secret is empty")
+        self.ttl = ttl
+
+    def _sign(self, payload: str, key: bytes) -> str:
+        return _b64encode(hmac.new(key, payload.encode("ascii"), hashlib.sha256).digest()[:SIGNATURE_BYTES])
+
+    def issue(self, empcode, survey_type, order, now=None):
+        """(token id, token) for one employee; order is the total_questions_order dict."""
+        token_id = secrets.token_hex(6)
+        issued = int(now or time.time())
+        expires = int(issued + self.ttl)
+        survey_type = survey_type or ""
+        kind = SURVEY_TYPE_CODES.index(survey_type) if survey_type in SURVEY_TYPE_CODES else survey_type
+        body = [
+            TOKEN_VERSION, str(empcode), kind,
+            int(order["start_idx"]), int(order["skip_idx"]), int(order["total_questions"]),
+            expires, token_id, issued,
+        ]
+        payload = _b64encode(json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+        return token_id, f"{payload}.{self._sign(payload, self._keys[0])}"
+
+    def verify(self, token, now=None) -> dict:
+        """Claims {token_id, empcode, survey_type, total_questions_order, issued, expires}; InvalidToken otherwise.
+
+        issued is None for version 1 tokens, which did not carry it.
+        """
+        if not is_signed_token(token):
+            raise InvalidToken("malformed token")
+        payload, signature = token.split(".")
+        if not any(hmac.compare_digest(signature, self._sign(payload, key)) for key in self._keys):
+            raise InvalidToken("bad signature")
+        try:
+            body = json.loads(_b64decode(payload))
+            version = body[0]
+        except (ValueError, TypeError, IndexError, KeyError) as e:
+            raise InvalidToken("malformed token") from e
+        if version not in (1, TOKEN_VERSION):
+            raise InvalidToken(f"unsupported token version {version}")
+        try:
+            _, empcode, kind, start_idx, skip_idx, total, expires, token_id, *rest = body
+            issued = rest[0] if version >= 2 else None
+        except (ValueError, IndexError) as e:
+            raise InvalidToken("malformed token") from e
+        if expires < (now or time.time()):
+            raise InvalidToken("expired")
+        return {
+            "token_id": token_id,
+            "empcode": empcode,
+            "survey_type": SURVEY_TYPE_CODES[kind] if isinstance(kind, int) else kind,
+            "total_questions_order": {"start_idx": start_idx, "skip_idx": skip_idx, "total_questions": total},
+            "issued": issued,
+            "expires": expires,
+        }
+
+
+# ---- Revocation deny-list ----
+class RevocationList:
+    """Revoked token ids / empcodes, held in memory and refreshed in the background.
+
+    An empcode revocation covers the links issued up to its REVOKED_AT, not later ones.
+    Lookups never wait on the database: until the first load finishes nothing counts as revoked.
+    """
+
+    def __init__(self, storage, refresh_interval=DEFAULT_REVOCATION_REFRESH):
+        self._storage = storage  # storage.py backend (revocations() / revoke())
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._token_ids = frozenset()
+        self._empcodes = {}  # empcode -> latest REVOKED_AT (epoch seconds)
+        self._refreshed_at = 0.0
+        self._last_error = None
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_revoked(self, token_id, empcode, issued=None) -> bool:
+        """issued: the token's issue time (epoch seconds); None (legacy links) counts as before any revocation."""
+        if token_id in self._token_ids:
+            return True
+        revoked_at = self._empcodes.get(str(empcode))
+        return revoked_at is not None and (issued is None or issued <= revoked_at)
+
+    def revoke(self, token_id=None, empcode=None):
+        """Record a revocation in the database and apply it here right away."""
+        self._storage.revoke(token_id, empcode)
+        revoked_at = time.time()
+        with self._lock:
+            if token_id:
+                self._token_ids = self._token_ids | {token_id}
+            if empcode is not None:
+                self._empcodes = {**self._empcodes, str(empcode): revoked_at}
+
+    def refresh_once(self):
+        try:
+            rows = self._storage.revocations()
+        except Exception as e:
+            self._last_error = str(e)
+            raise
+        with self._lock:
+            self._token_ids = frozenset(r[0] for r in rows if r[0])
+            empcodes = {}
+            for _, empcode, revoked_at in rows:
+                if empcode:
+                    empcodes[str(empcode)] = max(empcodes.get(str(empcode), 0.0), float(revoked_at or 0.0))
+            self._empcodes = empcodes
+            self._refreshed_at = time.time()
+            self._last_error = None
+
+    def info(self) -> dict:
+        return {
+            "token_ids": len(self._token_ids),
+            "empcodes": len(self._empcodes),
+            "refreshed_at": self._refreshed_at,
+            "last_error": self._last_error,
+        }
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="link-revocations-refresh", daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh_once()
+            except Exception:
+                pass  # keep the last good list; next tick retries
+
+
+def _token_config() -> dict:
+    try:
+        return st.secrets.get("survey_tokens", {})
+    except Exception:  # no secrets.toml at all
+        return {}
+
+
+@st.cache_resource
+def get_token_signer():
+    """TokenSigner from [survey_tokens], or None when no secret is configured (legacy tokens)."""
+    cfg = _token_config()
+    if not cfg.get("secret"):
+        return None
+    return TokenSigner(
+        cfg["secret"],
+        previous_secrets=tuple(cfg.get("previous_secrets", ())),
+        ttl=float(cfg.get("ttl", DEFAULT_TTL)),
+    )
+
+
+@st.cache_resource
+def get_revocation_list() -> RevocationList:
+    """One deny-list + refresh thread per Streamlit server process."""
+    cfg = _token_config()
+    revocations = RevocationList(
+        get_storage(),
+        refresh_interval=float(cfg.get("revocation_refresh", DEFAULT_REVOCATION_REFRESH)),
+    )
+    if cfg.get("revocation_check", True):
+        revocations.start()
+    return revocations
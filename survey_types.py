@@ -0,0 +1,108 @@
+# survey_types.py
+# Which survey an employee gets: the survey types per leaving category and the tenure rules
+# that pick one (shared by the single confirm flow and bulk link generation).
+import re
+from datetime import date
+
+import pandas as pd
+
+# ---- Survey types per category ----
+survey_types = {
+    "КОМПАНИЙН САНААЧИЛГААР": ["1 жил хүртэл", "1-ээс дээш"],
+    "АЖИЛТНЫ САНААЧИЛГААР": [
+        "6 сар дотор гарч байгаа", "7 сараас 3 жил ",
+        "4-10 жил", "11 болон түүнээс дээш"
+    ],
+}
+
+def choose_survey_type(category: str, total_months: int) -> str:
+    # КОМПАНИЙН САНААЧИЛГААР
+    if category == "КОМПАНИЙН САНААЧИЛГААР":
+        if total_months <= 12:
+            return "1 жил хүртэл"
+        else:
+            return "1-ээс дээш"
+    if category == "АЖИЛТНЫ САНААЧИЛГААР":
+        if total_months <= 12:
+            return "1 жил хүртэл"
+        else:
+            return "1-ээс дээш"
+
+    # Ажил хаяж явсан → always this type
+    if category == "Ажил хаяж явсан":
+        return "Мэдээлэл бүртгэх"
+
+    # fallback
+    return ""
+
+def choose_survey_type_for_db(category: str, total_months: int) -> str:
+    # Компанийн санаачилгаар
+    if category == "КОМПАНИЙН САНААЧИЛГААР":
+        if total_months <= 12:
+            return "1 жил хүртэл"
+        else:
+            return "1-ээс дээш"
+
+    # Ажилтны санаачлагаар
+    if category == "АЖИЛТНЫ САНААЧИЛГААР":
+        if total_months <= 6:
+            return "6 сар дотор гарч байгаа"
+        elif total_months <= 36:
+            return "7 сараас 3 жил "
+        elif total_months <= 120:
+            return "4-10 жил"
+        else:
+            return "11 болон түүнээс дээш"
+
+    # Ажил хаяж явсан → always this type
+    if category == "Ажил хаяж явсан":
+        return "Мэдээлэл бүртгэх"
+
+    # fallback
+    return ""
+
+
+def categorize_employment_duration(total_months: int) -> str:
+    if total_months <= 12:
+            return "1 жил хүртэл"
+    else:
+        return "1-ээс дээш"
+
+
+def total_months_from_mn_duration(text: str) -> int:
+    years = 0
+    months = 0
+
+    year_match = re.search(r"(\d+)\s*жил", text)
+    month_match = re.search(r"(\d+)\s*сар", text)
+
+    if year_match:
+        years = int(year_match.group(1))
+
+    if month_match:
+        months = int(month_match.group(1))
+
+    return years * 12 + months
+
+
+# ---- Vectorized versions (bulk link generation) ----
+def tenure_months(employees: pd.DataFrame, today: date) -> pd.Series:
+    """Months of tenure per row: parsed GROUPYEAR ("3 жил 2 сар") when set, else days since LASTHIREDDATE."""
+    hired = pd.to_datetime(employees["LASTHIREDDATE"], errors="coerce")
+    from_hire = ((pd.Timestamp(today) - hired).dt.days // 30.44).clip(lower=0).fillna(0)
+    group = employees["GROUPYEAR"].astype("string")
+    years = pd.to_numeric(group.str.extract(r"(\d+)\s*жил", expand=False), errors="coerce").fillna(0)
+    months = pd.to_numeric(group.str.extract(r"(\d+)\s*сар", expand=False), errors="coerce").fillna(0)
+    has_group = group.fillna("") != ""
+    return (years * 12 + months).where(has_group, from_hire).astype(int)
+
+
+def survey_types_for(categories: pd.Series, months: pd.Series) -> pd.Series:
+    """choose_survey_type_for_db per row, evaluated once per distinct (category, months) pair."""
+    pairs = pd.DataFrame({"category": categories.to_numpy(), "months": months.to_numpy()})
+    distinct = pairs.drop_duplicates()
+    distinct["survey_type"] = [choose_survey_type_for_db(c, m) for c, m in zip(distinct["category"], distinct["months"])]
+    return pd.Series(
+        pairs.merge(distinct, on=["category", "months"], how="left")["survey_type"].to_numpy(),
+        index=categories.index,
+    )
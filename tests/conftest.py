@@ -0,0 +1,6 @@
+# conftest.py
+# The app modules live flat in the repository root; make them importable from the tests.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
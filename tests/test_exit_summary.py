@@ -0,0 +1,232 @@
+# test_exit_summary.py
+# ExitSummary.refresh_once (exit_summary.py) over an in-memory double of SnowflakeSummaryStore,
+# plus the statements SnowflakeSummaryStore really sends (checked as SQL: they are Snowflake-only).
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+import exit_summary
+from config import ANSWER_TABLE, EXIT_SUMMARY_TABLE, INTERVIEW_TABLE, fq
+from exit_summary import (
+    EXIT_SUMMARY_DDL, MERGE_EXIT_SUMMARY_SQL, REBUILD_EXIT_SUMMARY_SQL, SUMMARY_COLUMNS,
+    SUMMARY_EMPTY_SQL, ExitSummary, SnowflakeSummaryStore,
+)
+
+T0 = datetime(2026, 3, 1, 9, 0)
+
+
+class LocalSummaryStore:
+    """SnowflakeSummaryStore's refresh semantics over plain lists.
+
+    answers / interviews are lists of (code, submitted_at), employees a dict code -> attributes.
+    """
+
+    def __init__(self, answers=(), interviews=(), employees=None):
+        self.answers = list(answers)
+        self.interviews = list(interviews)
+        self.employees = dict(employees or {})
+        self.rows = None  # EMPCODE -> summary row; None until ensure()
+        self.statements = []
+        self.fail = False
+
+    def _statement(self, name):
+        if self.fail:
+            raise RuntimeError("warehouse suspended")
+        self.statements.append(name)
+
+    def ensure(self):
+        self._statement("ensure")
+        if self.rows is None:
+            self.rows = {}
+
+    def empty(self):
+        self._statement("empty")
+        return not self.rows
+
+    def _source(self):
+        surveyed, interviewed = {}, {}
+        for code, at in self.answers:
+            if at is not None:
+                surveyed[code] = max(at, surveyed.get(code, at))
+        for code, at in self.interviews:
+            interviewed[code] = max(at, interviewed.get(code, at))
+        now = datetime.utcnow()
+        for code, at in surveyed.items():
+            emp = self.employees.get(code, {})
+            yield {
+                "EMPCODE": code,
+                "SURVEY_SUBMITTED_AT": at,
+                "INTERVIEW_SUBMITTED_AT": interviewed.get(code),
+                "SURVEY_DONE": True,
+                "INTERVIEW_DONE": code in interviewed,
+                **{c: emp.get(c) for c in ("LASTNAME", "FIRSTNAME", "COMPANYNAME", "DEPNAME", "POSNAME")},
+                "REFRESHED_AT": now,
+            }
+
+    def rebuild(self):
+        self._statement("rebuild")
+        self.rows = {r["EMPCODE"]: r for r in self._source()}
+
+    def merge_changed(self):
+        self._statement("merge")
+        for r in self._source():
+            merged = self.rows.get(r["EMPCODE"])
+            if merged is None or (merged["SURVEY_SUBMITTED_AT"], merged["INTERVIEW_SUBMITTED_AT"]) \
+                    != (r["SURVEY_SUBMITTED_AT"], r["INTERVIEW_SUBMITTED_AT"]):
+                self.rows[r["EMPCODE"]] = r
+
+
+@pytest.fixture
+def store():
+    return LocalSummaryStore(
+        answers=[("E1", T0), ("E2", T0 + timedelta(minutes=5))],
+        employees={"E1": {"FIRSTNAME": "Бат"}, "E2": {"FIRSTNAME": "Сараа"}},
+    )
+
+
+def test_first_refresh_creates_and_rebuilds(store):
+    summary = ExitSummary(store)
+    assert not summary.ready()
+    summary.refresh_once()
+    assert store.statements == ["ensure", "rebuild"]
+    assert set(store.rows) == {"E1", "E2"}
+    assert store.rows["E1"]["FIRSTNAME"] == "Бат"
+    assert summary.ready() and summary.version == 1
+
+
+def test_later_refreshes_merge(store):
+    summary = ExitSummary(store)
+    summary.refresh_once()
+    store.answers.append(("E3", T0 + timedelta(minutes=10)))
+    summary.refresh_once()
+    assert store.statements[2:] == ["empty", "merge"]
+    assert "E3" in store.rows and summary.version == 2
+
+
+def test_merge_picks_up_a_late_row_older_than_the_newest(store):
+    summary = ExitSummary(store)
+    summary.refresh_once()
+    # Flushed late by the write-behind queue: submitted before everything already merged
+    store.answers.append(("E4", T0 - timedelta(hours=3)))
+    summary.refresh_once()
+    assert store.rows["E4"]["SURVEY_SUBMITTED_AT"] == T0 - timedelta(hours=3)
+
+
+def test_merge_updates_interviews_and_leaves_unchanged_rows(store):
+    summary = ExitSummary(store)
+    summary.refresh_once()
+    untouched = store.rows["E2"]
+    store.interviews.append(("E1", T0 + timedelta(days=1)))
+    summary.refresh_once()
+    assert store.rows["E1"]["INTERVIEW_DONE"] is True
+    assert store.rows["E1"]["INTERVIEW_SUBMITTED_AT"] == T0 + timedelta(days=1)
+    assert store.rows["E2"] is untouched
+
+
+def test_empty_summary_is_rebuilt(store):
+    store.answers = []
+    summary = ExitSummary(store)
+    summary.refresh_once()
+    store.answers.append(("E1", T0))
+    summary.refresh_once()
+    assert store.statements == ["ensure", "rebuild", "empty", "rebuild"]
+    assert set(store.rows) == {"E1"}
+
+
+def test_rebuild_when_due(store):
+    summary = ExitSummary(store, rebuild_interval=0)
+    summary.refresh_once()
+    summary.refresh_once()
+    assert store.statements == ["ensure", "rebuild", "rebuild"]
+
+
+def test_failed_refresh_keeps_the_error_and_is_not_ready(store):
+    summary = ExitSummary(store)
+    store.fail = True
+    with pytest.raises(RuntimeError):
+        summary.refresh_once()
+    assert summary.info()["last_error"] == "warehouse suspended"
+    assert not summary.ready() and summary.version == 0
+    store.fail = False
+    summary.refresh_once()
+    assert summary.info()["last_error"] is None and summary.ready()
+
+
+# ---- The real statements ----
+def squash(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def test_merge_only_touches_rows_whose_merged_timestamps_differ():
+    merge = squash(MERGE_EXIT_SUMMARY_SQL)
+    assert merge.startswith(f"MERGE INTO {fq(EXIT_SUMMARY_TABLE)} t USING (")
+    # The source is narrowed by an anti-join on what the summary already holds, not a watermark
+    assert squash(exit_summary._NOT_MERGED_WHERE) in merge
+    assert (
+        f"WHERE NOT EXISTS ( SELECT 1 FROM {fq(EXIT_SUMMARY_TABLE)} m WHERE m.EMPCODE = s.EMPCODE"
+        " AND m.SURVEY_SUBMITTED_AT = s.SURVEY_SUBMITTED_AT"
+        " AND m.INTERVIEW_SUBMITTED_AT IS NOT DISTINCT FROM i.INTERVIEW_SUBMITTED_AT )"
+    ) in merge
+    assert "MAX(SUBMITTED_AT)" in merge and "SUBMITTED_AT >" not in merge
+    assert merge.count(fq(ANSWER_TABLE)) == 1 and merge.count(fq(INTERVIEW_TABLE)) == 1
+
+
+def test_merge_updates_and_inserts_every_summary_column():
+    merge = squash(MERGE_EXIT_SUMMARY_SQL)
+    assert "ON t.EMPCODE = src.EMPCODE" in merge
+    updates = ", ".join(f"t.{c} = src.{c}" for c in SUMMARY_COLUMNS[1:])
+    assert f"WHEN MATCHED THEN UPDATE SET {updates} WHEN NOT MATCHED" in merge
+    assert f"INSERT ({', '.join(SUMMARY_COLUMNS)}) VALUES ({', '.join('src.' + c for c in SUMMARY_COLUMNS)})" in merge
+
+
+def test_rebuild_reads_the_whole_source():
+    rebuild = squash(REBUILD_EXIT_SUMMARY_SQL)
+    assert rebuild.startswith(f"INSERT OVERWRITE INTO {fq(EXIT_SUMMARY_TABLE)} ({', '.join(SUMMARY_COLUMNS)})")
+    assert "NOT EXISTS" not in rebuild and "{where}" not in rebuild
+
+
+class FakeRun:
+    """run(fn) for SnowflakeSummaryStore: hands fn a session and records what collect() sends."""
+
+    def __init__(self, monkeypatch, result=()):
+        self.session = object()
+        self.sent = []
+        self.result = list(result)
+        monkeypatch.setattr(exit_summary, "collect", self._collect)
+
+    def _collect(self, session, sql, params=None):
+        assert session is self.session
+        self.sent.append((sql, params))
+        return self.result
+
+    def __call__(self, fn):
+        return fn(self.session)
+
+
+def test_snowflake_store_sends_one_statement_per_call(monkeypatch):
+    run = FakeRun(monkeypatch)
+    store = SnowflakeSummaryStore(run)
+    store.ensure()
+    store.rebuild()
+    store.merge_changed()
+    assert run.sent == [
+        (EXIT_SUMMARY_DDL, None), (REBUILD_EXIT_SUMMARY_SQL, None), (MERGE_EXIT_SUMMARY_SQL, None),
+    ]
+
+
+@pytest.mark.parametrize("row, empty", [((True,), True), ((False,), False)])
+def test_snowflake_store_empty(monkeypatch, row, empty):
+    run = FakeRun(monkeypatch, result=[row])
+    assert SnowflakeSummaryStore(run).empty() is empty
+    assert run.sent == [(SUMMARY_EMPTY_SQL, None)]
+
+
+def test_refresh_sends_the_real_statements_in_order(monkeypatch):
+    run = FakeRun(monkeypatch, result=[(False,)])
+    summary = ExitSummary(SnowflakeSummaryStore(run))
+    summary.refresh_once()
+    summary.refresh_once()
+    assert [sql for sql, _ in run.sent] == [
+        EXIT_SUMMARY_DDL, REBUILD_EXIT_SUMMARY_SQL, SUMMARY_EMPTY_SQL, MERGE_EXIT_SUMMARY_SQL,
+    ]
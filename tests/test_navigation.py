@@ -0,0 +1,104 @@
+# test_navigation.py
+# Compiled navigation plans (navigation.py) against the page arithmetic they replaced.
+import itertools
+
+import pytest
+
+from navigation import (
+    EMPTY_PLAN, NAVIGATION_PLANS, SURVEY_END, _pages, compile_plan, plan_for,
+    total_questions_number_dict,
+)
+
+
+# ---- The original arithmetic (begin_survey / goToNextPage before the plans) ----
+def baseline_first(order):
+    return order.get("start_idx", 1) + 2  # survey Q1 starts from page 3
+
+
+def baseline_next(order, curr_page):
+    start_idx = order.get("start_idx", 0)
+    skip_idx = order.get("skip_idx", 0)
+    total_questions = order.get("total_questions", 0)
+    last_page_idx = start_idx + total_questions + 1
+    if skip_idx != 0:
+        last_page_idx += 1
+
+    if curr_page < last_page_idx:
+        next_page = curr_page + 1
+        if next_page == skip_idx + 2:
+            return next_page + 1
+        return next_page
+    return "survey_end"
+
+
+def baseline_walk(order):
+    pages = [baseline_first(order)]
+    while (page := baseline_next(order, pages[-1])) != "survey_end":
+        pages.append(page)
+    return pages
+
+
+def order(start_idx, skip_idx, total_questions):
+    return {"start_idx": start_idx, "skip_idx": skip_idx, "total_questions": total_questions}
+
+
+SURVEY_ORDERS = [
+    pytest.param(o, id=f"{category}/{tenure}")
+    for category, by_tenure in total_questions_number_dict.items()
+    for tenure, o in by_tenure.items()
+]
+
+# skip_idx edge cases: unset, on the first page, before it, right after it, on the last page,
+# just past the end, far past it; plus the shortest surveys
+EDGE_ORDERS = [
+    order(1, 0, 13), order(1, 1, 12), order(3, 1, 10), order(3, 2, 10), order(1, 2, 12),
+    order(2, 13, 11), order(2, 14, 11), order(2, 15, 11), order(2, 40, 11),
+    order(1, 0, 1), order(1, 2, 1), order(1, 1, 1), order(1, 0, 0),
+]
+
+
+def assert_matches_baseline(o):
+    plan = plan_for(o)
+    walk = baseline_walk(o)
+    assert list(plan.pages) == walk
+    assert plan.first == walk[0]
+    for page in walk:
+        assert plan.next(page) == baseline_next(o, page)
+    # previous is the inverse of the baseline next step
+    assert plan.previous(walk[0]) is None
+    for before, page in zip(walk, walk[1:]):
+        assert plan.previous(page) == before
+    assert [plan.position(p) for p in walk] == list(range(1, len(walk) + 1))
+    assert plan.progress(walk[-1]) == 100
+
+
+@pytest.mark.parametrize("o", SURVEY_ORDERS)
+def test_survey_type_plans_match_baseline(o):
+    assert_matches_baseline(o)
+
+
+@pytest.mark.parametrize("o", EDGE_ORDERS, ids=lambda o: "start{start_idx}-skip{skip_idx}-total{total_questions}".format(**o))
+def test_skip_edge_cases_match_baseline(o):
+    assert_matches_baseline(o)
+
+
+def test_every_small_triple_matches_baseline():
+    for start_idx, skip_idx, total in itertools.product(range(1, 5), range(0, 20), range(0, 15)):
+        o = order(start_idx, skip_idx, total)
+        assert _pages(start_idx, skip_idx, total) == baseline_walk(o), o
+
+
+def test_registered_plans_are_the_survey_type_plans():
+    for (category, tenure), plan in NAVIGATION_PLANS.items():
+        o = total_questions_number_dict[category][tenure]
+        assert plan.pages == compile_plan(o["start_idx"], o["skip_idx"], o["total_questions"]).pages
+
+
+def test_pages_off_the_plan_and_empty_order():
+    plan = plan_for(order(1, 2, 12))
+    assert 4 not in plan  # the skipped page
+    assert plan.next(4) == SURVEY_END
+    assert plan.previous(4) is None
+    assert plan.position(4) == 0
+    assert plan_for({}) is EMPTY_PLAN
+    assert plan_for(None).first == SURVEY_END
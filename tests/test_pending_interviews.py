@@ -0,0 +1,93 @@
+# test_pending_interviews.py
+# PendingInterviews (pending_interviews.py) over an in-memory storage double.
+from datetime import datetime, timedelta
+
+from pending_interviews import PendingInterviews
+
+T0 = datetime(2026, 3, 1, 9, 0)
+
+
+class FakeStorage:
+    """answer_watermarks / pending_interviews / new_interviews over plain lists, like storage.py."""
+
+    def __init__(self):
+        self.answers = []     # (EMPCODE, SUBMITTED_AT)
+        self.interviews = []  # (EMP_CODE, SUBMITTED_AT)
+        self.summary = None   # (answers, interviews) snapshot, when the summary table is used
+        self.calls = []
+
+    def answer_watermarks(self, from_summary=False):
+        self.calls.append(("watermarks", from_summary))
+        answers, interviews = self.summary if from_summary else (self.answers, self.interviews)
+        return max((t for _, t in answers), default=None), max((t for _, t in interviews), default=None)
+
+    def pending_interviews(self, since=None, from_summary=False):
+        self.calls.append(("pending", from_summary))
+        answers, interviews = self.summary if from_summary else (self.answers, self.interviews)
+        done = {c for c, _ in interviews}
+        latest = {}
+        for code, t in answers:
+            if code not in done and (since is None or t >= since):
+                latest[code] = max(t, latest.get(code, t))
+        return list(latest.items())
+
+    def new_interviews(self, since=None):
+        return [c for c, t in self.interviews if since is None or t >= since]
+
+
+class ReadySummary:
+    def ready(self):
+        return True
+
+
+def pending(storage, **kwargs):
+    p = PendingInterviews(storage, overlap=60.0, **kwargs)
+    p.refresh_now()
+    return p
+
+
+def codes(p):
+    return sorted(p.frame()["EMP_CODE"])
+
+
+def test_late_flushed_and_tied_rows_are_picked_up():
+    storage = FakeStorage()
+    storage.answers = [("E1", T0)]
+    p = pending(storage)
+
+    # Same timestamp as the watermark, and a row flushed late with an older timestamp
+    storage.answers += [("E2", T0), ("E3", T0 - timedelta(seconds=30))]
+    p.refresh_once()
+    assert codes(p) == ["E1", "E2", "E3"]
+
+    # The overlap re-reads E1..E3 every time; still one entry each
+    p.refresh_once()
+    assert len(p.frame()) == 3
+
+
+def test_interviews_in_the_overlap_drop_rows_once():
+    storage = FakeStorage()
+    storage.answers = [("E1", T0), ("E2", T0)]
+    storage.interviews = [("X", T0)]
+    p = pending(storage)
+
+    storage.interviews.append(("E1", T0 - timedelta(seconds=10)))
+    p.refresh_once()
+    assert codes(p) == ["E2"]
+
+    # A re-read of E1's survey must not bring it back
+    storage.answers.append(("E1", T0 + timedelta(seconds=5)))
+    p.refresh_once()
+    assert codes(p) == ["E2"]
+
+
+def test_full_load_takes_watermarks_from_the_summary_when_it_is_used():
+    storage = FakeStorage()
+    storage.answers = [("E1", T0), ("E2", T0 + timedelta(hours=1))]
+    storage.summary = ([("E1", T0)], [])  # E2 not merged yet
+    p = pending(storage, summary=ReadySummary())
+    assert storage.calls[:2] == [("watermarks", True), ("pending", True)]
+    assert codes(p) == ["E1"]
+
+    p.refresh_once()
+    assert codes(p) == ["E1", "E2"]
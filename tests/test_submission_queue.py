@@ -0,0 +1,122 @@
+# test_submission_queue.py
+# SubmissionQueue (submission_queue.py) through a storage outage: backoff, aging out, requeue.
+import pytest
+
+import submission_queue
+from submission_queue import FAILED, FLUSHED, PENDING, SubmissionQueue
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyStorage:
+    """flush_fn that raises while down is set, otherwise records the rows it was given."""
+
+    def __init__(self):
+        self.down = False
+        self.rows = []
+
+    def __call__(self, rows):
+        if self.down:
+            raise ConnectionError("snowflake unreachable")
+        self.rows.extend(rows)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(submission_queue.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def storage():
+    return FlakyStorage()
+
+
+def make_queue(path, storage, **kwargs):
+    kwargs.setdefault("retry_backoff", 2.0)
+    kwargs.setdefault("max_backoff", 60.0)
+    kwargs.setdefault("max_age", 3600.0)
+    return SubmissionQueue(str(path), flush_fn=storage, **kwargs)
+
+
+def test_outage_backs_off_and_flushes_after_recovery(tmp_path, clock, storage):
+    queue = make_queue(tmp_path / "spool.sqlite3", storage)
+    sid = queue.enqueue({"EMPCODE": "E1", "ANSWER": "a"})
+
+    storage.down = True
+    for attempt, delay in enumerate([2.0, 4.0, 8.0, 16.0, 32.0, 60.0, 60.0], start=1):
+        assert queue.flush_once() == 0
+        assert queue.status(sid) == {"status": PENDING, "attempts": attempt, "error": "snowflake unreachable"}
+        # Not due yet: nothing is attempted until the backoff has passed
+        clock.now += delay - 0.5
+        assert queue.flush_once() == 0
+        assert queue.status(sid)["attempts"] == attempt
+        clock.now += 0.5
+
+    storage.down = False
+    assert queue.flush_once() == 1
+    assert queue.status(sid)["status"] == FLUSHED
+    assert storage.rows == [{"EMPCODE": "E1", "ANSWER": "a"}]
+
+
+def test_backoff_survives_restart(tmp_path, clock, storage):
+    path = tmp_path / "spool.sqlite3"
+    storage.down = True
+    queue = make_queue(path, storage)
+    sid = queue.enqueue({"EMPCODE": "E1"})
+    queue.flush_once()
+    queue.flush_once()  # not due: still one attempt, next try at +2s
+
+    storage.down = False
+    restarted = make_queue(path, storage)
+    assert restarted.flush_once() == 0
+    clock.now += 2.0
+    assert restarted.flush_once() == 1
+    assert restarted.status(sid)["status"] == FLUSHED
+
+
+def test_rows_fail_only_after_max_age_and_can_be_requeued(tmp_path, clock, storage):
+    queue = make_queue(tmp_path / "spool.sqlite3", storage, max_age=100.0)
+    sid = queue.enqueue({"EMPCODE": "E1"})
+    storage.down = True
+
+    clock.now += 99.0
+    queue.flush_once()
+    assert queue.status(sid)["status"] == PENDING
+    assert queue.has_submission("E1")
+
+    clock.now += 60.0
+    queue.flush_once()
+    assert queue.status(sid)["status"] == FAILED
+    assert not queue.has_submission("E1")
+    assert queue.stats()[FAILED] == 1
+
+    storage.down = False
+    assert queue.requeue_failed() == 1
+    assert queue.status(sid) == {"status": PENDING, "attempts": 0, "error": "snowflake unreachable"}
+    assert queue.flush_once() == 1
+    assert queue.status(sid)["status"] == FLUSHED
+    assert queue.requeue_failed() == 0
+
+
+def test_one_bad_row_does_not_hold_back_the_batch(tmp_path, clock):
+    written = []
+
+    def flush(rows):
+        if any(r["EMPCODE"] == "BAD" for r in rows):
+            raise ValueError("bad row")
+        written.extend(rows)
+
+    queue = SubmissionQueue(str(tmp_path / "spool.sqlite3"), flush_fn=flush)
+    good, bad = queue.enqueue({"EMPCODE": "E1"}), queue.enqueue({"EMPCODE": "BAD"})
+    assert queue.flush_once() == 1
+    assert queue.status(good)["status"] == FLUSHED
+    assert queue.status(bad) == {"status": PENDING, "attempts": 1, "error": "bad row"}
+    assert queue.stats()["retrying"] == 1
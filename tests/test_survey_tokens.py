@@ -0,0 +1,150 @@
+# test_survey_tokens.py
+# Signed link tokens (survey_tokens.py): tampering, expiry, key rotation and revocation.
+import base64
+import json
+import time
+
+import pytest
+
+from storage import SQLiteStorage
+from survey_tokens import TOKEN_VERSION, InvalidToken, RevocationList, TokenSigner
+
+ORDER = {"start_idx": 3, "skip_idx": 7, "total_questions": 21}
+NOW = 1_760_000_000
+
+
+def _body(token) -> list:
+    payload = token.split(".")[0]
+    return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+
+
+def _payload(body) -> str:
+    return base64.urlsafe_b64encode(json.dumps(body, separators=(",", ":")).encode()).rstrip(b"=").decode()
+
+
+# ---- issue / verify ----
+def test_round_trip():
+    signer = TokenSigner("s3cret", ttl=3600)
+    token_id, token = signer.issue("E100", "1-ээс дээш", ORDER, now=NOW)
+    claims = signer.verify(token, now=NOW + 60)
+    assert claims == {
+        "token_id": token_id,
+        "empcode": "E100",
+        "survey_type": "1-ээс дээш",
+        "total_questions_order": ORDER,
+        "issued": NOW,
+        "expires": NOW + 3600,
+    }
+
+
+def test_tampered_payload_is_rejected():
+    signer = TokenSigner("s3cret")
+    _, token = signer.issue("E100", "1-ээс дээш", ORDER, now=NOW)
+    body = _body(token)
+    body[1] = "E999"
+    forged = f"{_payload(body)}.{token.split('.')[1]}"
+    with pytest.raises(InvalidToken, match="bad signature"):
+        signer.verify(forged, now=NOW)
+
+
+def test_tampered_signature_is_rejected():
+    signer = TokenSigner("s3cret")
+    _, token = signer.issue("E100", "1-ээс дээш", ORDER, now=NOW)
+    payload, signature = token.split(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+    with pytest.raises(InvalidToken, match="bad signature"):
+        signer.verify(f"{payload}.{flipped}", now=NOW)
+
+
+@pytest.mark.parametrize("token", ["", "abc123", "a.b.c", None])
+def test_malformed_token_is_rejected(token):
+    with pytest.raises(InvalidToken):
+        TokenSigner("s3cret").verify(token, now=NOW)
+
+
+def test_expired_token_is_rejected():
+    signer = TokenSigner("s3cret", ttl=3600)
+    _, token = signer.issue("E100", "1-ээс дээш", ORDER, now=NOW)
+    signer.verify(token, now=NOW + 3600)
+    with pytest.raises(InvalidToken, match="expired"):
+        signer.verify(token, now=NOW + 3601)
+
+
+def test_version_1_token_verifies_without_issue_time():
+    signer = TokenSigner("s3cret")
+    payload = _payload([1, "E100", 1, 3, 7, 21, NOW + 3600, "abc"])
+    claims = signer.verify(f"{payload}.{signer._sign(payload, signer._keys[0])}", now=NOW)
+    assert claims["issued"] is None
+    assert claims["token_id"] == "abc"
+
+
+def test_unknown_version_is_rejected():
+    signer = TokenSigner("s3cret")
+    payload = _payload([TOKEN_VERSION + 1, "E100", 1, 3, 7, 21, NOW + 3600, "abc", NOW])
+    with pytest.raises(InvalidToken, match="unsupported token version"):
+        signer.verify(f"{payload}.{signer._sign(payload, signer._keys[0])}", now=NOW)
+
+
+# ---- key rotation ----
+def test_previous_secret_still_verifies():
+    _, old_token = TokenSigner("old").issue("E100", "1-ээс дээш", ORDER, now=NOW)
+    rotated = TokenSigner("new", previous_secrets=("old",))
+    assert rotated.verify(old_token, now=NOW)["empcode"] == "E100"
+
+
+def test_new_tokens_are_signed_with_the_current_secret():
+    rotated = TokenSigner("new", previous_secrets=("old",))
+    _, token = rotated.issue("E100", "1-ээс дээш", ORDER, now=NOW)
+    assert TokenSigner("new").verify(token, now=NOW)["empcode"] == "E100"
+    with pytest.raises(InvalidToken, match="bad signature"):
+        TokenSigner("old").verify(token, now=NOW)
+
+
+def test_dropped_secret_no_longer_verifies():
+    _, old_token = TokenSigner("old").issue("E100", "1-ээс дээш", ORDER, now=NOW)
+    with pytest.raises(InvalidToken, match="bad signature"):
+        TokenSigner("new").verify(old_token, now=NOW)
+
+
+def test_empty_secret_is_refused():
+    with pytest.raises(ValueError):
+        TokenSigner("", previous_secrets=("",))
+
+
+# ---- revocation ----
+@pytest.fixture
+def revocations(tmp_path):
+    return RevocationList(SQLiteStorage(str(tmp_path / "survey.sqlite3")))
+
+
+def test_revoked_token_id(revocations):
+    revocations.revoke(token_id="abc")
+    assert revocations.is_revoked("abc", "E100", issued=time.time())
+    assert not revocations.is_revoked("def", "E100", issued=time.time())
+
+
+def test_empcode_revocation_covers_links_issued_before_it(revocations):
+    issued = int(time.time()) - 60
+    revocations.revoke(empcode="E100")
+    assert revocations.is_revoked("abc", "E100", issued=issued)
+    assert revocations.is_revoked("abc", "E100")  # legacy link: no issue time
+    assert not revocations.is_revoked("abc", "E200", issued=issued)
+
+
+def test_link_issued_after_empcode_revocation_is_accepted(revocations):
+    revocations.revoke(empcode="E100")
+    assert not revocations.is_revoked("abc", "E100", issued=time.time() + 60)
+
+
+def test_refresh_loads_revocations_with_their_time(revocations, tmp_path):
+    issued = int(time.time()) - 60
+    revocations.revoke(token_id="abc")
+    revocations.revoke(empcode="E100")
+
+    fresh = RevocationList(SQLiteStorage(str(tmp_path / "survey.sqlite3")))
+    assert not fresh.is_revoked("abc", "E100", issued=issued)  # nothing loaded yet
+    fresh.refresh_once()
+    assert fresh.is_revoked("abc", "E200", issued=issued)
+    assert fresh.is_revoked("def", "E100", issued=issued)
+    assert not fresh.is_revoked("def", "E100", issued=time.time() + 60)
+    assert fresh.info()["token_ids"] == 1 and fresh.info()["empcodes"] == 1
@@ -0,0 +1,152 @@
+# tools/build_assets.py
+"""
+Asset build step: size-appropriate image variants + a subset web font + a manifest.
+
+    python tools/build_assets.py            # from the repo root
+
+For every (image, height) the app renders (the questions.py registry plus any literal
+image_src(...) calls) this writes static/build/<name>-h<height>.png at RETINA_SCALE x height,
+plus .webp / .avif variants when they come out smaller than the PNG, subsets
+fonts/CeraPro-Medium.ttf to the Latin + Cyrillic glyphs the survey uses (woff2 + ttf), and
+records everything in static/build/manifest.json. assets.py serves these prebuilt files
+whenever the manifest lists them and falls back to resizing on the fly otherwise.
+
+Needs Pillow (ships with Streamlit) and fontTools + brotli for the font (`pip install fonttools brotli`).
+"""
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from PIL import Image, features
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from assets import BUILD_DIR, MANIFEST_PATH, RETINA_SCALE  # noqa: E402
+from questions import question_images  # noqa: E402
+
+FONT_PATH = "fonts/CeraPro-Medium.ttf"
+
+# Unicode ranges kept in the subset font (employee names can contain any Cyrillic letter)
+FONT_UNICODE_RANGES = [
+    (0x0020, 0x007E),  # Basic Latin
+    (0x00A0, 0x00FF),  # Latin-1 supplement
+    (0x0400, 0x04FF),  # Cyrillic, incl. Mongolian Ө ө Ү ү
+    (0x2010, 0x2027),  # dashes, quotes, ellipsis
+    (0x2116, 0x2116),  # №
+    (0x2190, 0x2193),  # arrows (→ on the continue buttons)
+]
+
+_IMAGE_SRC_CALL = re.compile(r'image_src\(\s*"([^"]+)"\s*,\s*height\s*=\s*(\d+)\s*\)')
+
+
+def rendered_images():
+    """(path, height) pairs shown by the question registry or passed to image_src(...) literally."""
+    found = set(question_images())
+    for py in ROOT.glob("*.py"):
+        for path, height in _IMAGE_SRC_CALL.findall(py.read_text(encoding="utf-8")):
+            found.add((path, int(height)))
+    return sorted(found)
+
+
+def _slug(path: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", Path(path).stem).strip("_")
+
+
+def _entry(file: Path) -> dict:
+    data = file.read_bytes()
+    return {
+        "file": file.relative_to(ROOT / "static").as_posix(),
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest()[:12],
+    }
+
+
+def build_image(path: str, height: int) -> dict:
+    with Image.open(ROOT / path) as im:
+        paletted = im.mode == "P"
+        im = im.convert("RGBA")
+        target_h = min(im.height, height * RETINA_SCALE)
+        target_w = max(1, round(im.width * target_h / im.height))
+        small = im.resize((target_w, target_h), Image.LANCZOS)
+
+    base = BUILD_DIR / f"{_slug(path)}-h{height}"
+    variants = {}
+
+    png = small.quantize(256, method=Image.Quantize.FASTOCTREE) if paletted else small
+    png.save(base.with_suffix(".png"), format="PNG", optimize=True)
+    variants["png"] = _entry(base.with_suffix(".png"))
+
+    small.save(base.with_suffix(".webp"), format="WEBP", quality=80, method=6)
+    _keep_if_smaller(variants, "webp", base.with_suffix(".webp"))
+
+    if features.check("avif"):
+        small.save(base.with_suffix(".avif"), format="AVIF", quality=60)
+        _keep_if_smaller(variants, "avif", base.with_suffix(".avif"))
+
+    return variants
+
+
+def _keep_if_smaller(variants, fmt, file: Path):
+    """List file as a variant only when it beats the PNG; otherwise delete it (flat artwork often doesn't)."""
+    entry = _entry(file)
+    if entry["bytes"] < variants["png"]["bytes"]:
+        variants[fmt] = entry
+    else:
+        file.unlink()
+
+
+def build_font(path: str) -> dict:
+    try:
+        from fontTools import subset
+    except ImportError:
+        print("fontTools not installed: skipping font subset", file=sys.stderr)
+        return {}
+
+    unicodes = set()
+    for lo, hi in FONT_UNICODE_RANGES:
+        unicodes.update(range(lo, hi + 1))
+
+    variants = {}
+    for flavor, suffix in ((None, ".ttf"), ("woff2", ".woff2")):
+        options = subset.Options()
+        options.flavor = flavor
+        options.layout_features = ["*"]
+        options.name_IDs = ["*"]
+        options.notdef_outline = True
+        font = subset.load_font(str(ROOT / path), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=unicodes)
+        subsetter.subset(font)
+        target = BUILD_DIR / f"{Path(path).stem}-subset{suffix}"
+        try:
+            subset.save_font(font, str(target), options)
+        except Exception as e:  # woff2 needs brotli
+            print(f"skipping {suffix}: {e}", file=sys.stderr)
+            continue
+        variants[suffix.lstrip(".")] = _entry(target)
+    return variants
+
+
+def main():
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {"retina_scale": RETINA_SCALE, "images": {}, "fonts": {}}
+
+    for path, height in rendered_images():
+        manifest["images"].setdefault(path, {})[str(height)] = build_image(path, height)
+        sizes = ", ".join(f"{fmt} {v['bytes'] // 1024} KB" for fmt, v in manifest["images"][path][str(height)].items())
+        print(f"{path} @ {height}px: {sizes}")
+
+    font = build_font(FONT_PATH)
+    if font:
+        manifest["fonts"][FONT_PATH] = font
+        print(f"{FONT_PATH}: " + ", ".join(f"{fmt} {v['bytes'] // 1024} KB" for fmt, v in font.items()))
+
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"wrote {MANIFEST_PATH.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# tools/migrate_answer_codes.py
+"""
+One-off migration: APU_SURVEY_ANSWERS label text -> codebook codes (see codebook.py).
+
+    python tools/migrate_answer_codes.py --dry-run   # report what would be converted
+    python tools/migrate_answer_codes.py             # from the repo root, after deploying
+
+Reads the Snowflake login from .streamlit/secrets.toml ([connections.snowflake]). Every
+distinct stored answer is encoded in Python with the same codebook the app writes with, then:
+
+  1. APU_SURVEY_ANSWERS_CODED is built from APU_SURVEY_ANSWERS with each question column
+     replaced by its code (multi select: bitmask), every other column kept as is
+  2. the two tables are swapped atomically; the text rows stay in APU_SURVEY_ANSWERS_LABELS_BACKUP
+  3. rows that reached the old table while 1. ran (those in the backup with no
+     (EMPCODE, SUBMITTED_AT) match in the new table) are encoded and copied over
+  4. the codebook table and the APU_SURVEY_ANSWERS_LABELED view are created, and
+     APU_EXIT_ROLLUP is emptied so the next refresh re-aggregates it by code
+
+Text that is not an option of its question stops the migration (listed per column) before
+anything is copied unless --force is given, in which case it is stored as NULL; the backup
+keeps the original either way. If it stops at step 3, fix the registry / data and re-run:
+the catch-up only copies rows that are still missing. Re-running after a successful
+migration repeats that (a no-op) and refreshes the codebook and the view.
+"""
+import argparse
+import sys
+import tomllib
+from pathlib import Path
+
+from snowflake.snowpark import Session
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from codebook import ANSWER_COLUMNS, encode_answer, sync_codebook  # noqa: E402
+from config import ANSWER_TABLE, DATABASE_NAME, EXIT_ROLLUP_TABLE, SCHEMA_NAME, fq  # noqa: E402
+
+CODED_TABLE = f"{ANSWER_TABLE}_CODED"
+BACKUP_TABLE = f"{ANSWER_TABLE}_LABELS_BACKUP"
+
+COLUMN_TYPE_SQL = f"""
+    SELECT DATA_TYPE
+    FROM {DATABASE_NAME}.INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = '{SCHEMA_NAME}' AND TABLE_NAME = '{ANSWER_TABLE}' AND COLUMN_NAME = ?
+"""
+
+TABLE_EXISTS_SQL = f"""
+    SELECT 1
+    FROM {DATABASE_NAME}.INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = '{SCHEMA_NAME}' AND TABLE_NAME = ?
+"""
+
+
+def connect() -> Session:
+    with open(ROOT / ".streamlit" / "secrets.toml", "rb") as f:
+        secrets = tomllib.load(f)
+    return Session.builder.configs(dict(secrets["connections"]["snowflake"])).create()
+
+
+def already_coded(session) -> bool:
+    rows = session.sql(COLUMN_TYPE_SQL, params=[ANSWER_COLUMNS[0].upper()]).collect()
+    return bool(rows) and rows[0][0] != "TEXT"
+
+
+def table_exists(session, table) -> bool:
+    return bool(session.sql(TABLE_EXISTS_SQL, params=[table]).collect())
+
+
+def _encode_stored(key, value):
+    # Rows the new app wrote into the text table before the swap already hold codes ("36")
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    return encode_answer(key, value, strict=True)
+
+
+def build_mappings(session, source):
+    """{column: {stored text: code}} for every distinct non-blank value, plus {column: [unknown texts]}."""
+    mappings, unknown = {}, {}
+    for key in ANSWER_COLUMNS:
+        values = session.sql(f"SELECT DISTINCT {key} FROM {fq(source)} WHERE NULLIF(TRIM({key}), '') IS NOT NULL").collect()
+        mappings[key] = {}
+        for (value,) in values:
+            try:
+                mappings[key][value] = _encode_stored(key, value)
+            except ValueError:
+                unknown.setdefault(key, []).append(value)
+    return mappings, unknown
+
+
+def coded_select(mappings, source, where=""):
+    """SELECT of `source` with every question column replaced by its code, plus its bind params."""
+    exprs, params = [], []
+    for key in ANSWER_COLUMNS:
+        whens = " ".join("WHEN ? THEN ?" for _ in mappings[key])
+        exprs.append(f"(CASE {key} {whens} END)::NUMBER AS {key}" if whens else f"NULL::NUMBER AS {key}")
+        for text, code in mappings[key].items():
+            params.extend([text, code])
+    q = f"SELECT * EXCLUDE ({', '.join(ANSWER_COLUMNS)}), {', '.join(exprs)} FROM {fq(source)} b {where}"
+    return q, params
+
+
+# Backup rows with no copy in the coded table yet: the rows that reached the old table while
+# it was being copied. An anti-join, so a re-run after a stop copies only what is still missing.
+_MISSING_WHERE = f"""
+    WHERE NOT EXISTS (
+        SELECT 1 FROM {fq(ANSWER_TABLE)} a
+        WHERE a.EMPCODE = b.EMPCODE AND a.SUBMITTED_AT IS NOT DISTINCT FROM b.SUBMITTED_AT
+    )
+"""
+
+
+def report(mappings, unknown, force) -> bool:
+    """Print the encoding summary and every unknown answer; False if the migration must stop."""
+    for key in ANSWER_COLUMNS:
+        print(f"{key}: {len(mappings[key])} distinct answers encoded, {len(unknown.get(key, []))} unknown")
+    for key, values in unknown.items():
+        for value in values:
+            print(f"  unknown {key}: {value!r}")
+    if unknown and not force:
+        print("stopping: fix the registry / data or re-run with --force (unknown answers become NULL)")
+        return False
+    return True
+
+
+def catch_up(session, force=False, dry_run=False):
+    """Step 3: encode and copy the backup rows that have no copy in the coded table."""
+    mappings, unknown = build_mappings(session, BACKUP_TABLE)
+    if not report(mappings, unknown, force):
+        print(f"nothing copied; the missing rows stay in {BACKUP_TABLE} until the re-run")
+        return 1
+    if dry_run:
+        return 0
+    q, params = coded_select(mappings, BACKUP_TABLE, _MISSING_WHERE)
+    copied = session.sql(f"INSERT INTO {fq(ANSWER_TABLE)} {q}", params=params).collect()[0][0]
+    print(f"{copied} rows copied from {BACKUP_TABLE}")
+    return 0
+
+
+def migrate(session, force=False, dry_run=False):
+    if already_coded(session):
+        print(f"{ANSWER_TABLE} already stores codes: catching up, then refreshing the codebook and view")
+        if table_exists(session, BACKUP_TABLE) and catch_up(session, force=force, dry_run=dry_run):
+            return 1
+        if not dry_run:
+            sync_codebook(session)
+        return 0
+
+    mappings, unknown = build_mappings(session, ANSWER_TABLE)
+    if not report(mappings, unknown, force):
+        return 1
+    if dry_run:
+        return 0
+
+    q, params = coded_select(mappings, ANSWER_TABLE)
+    session.sql(f"CREATE OR REPLACE TABLE {fq(CODED_TABLE)} AS {q}", params=params).collect()
+    session.sql(f"ALTER TABLE {fq(ANSWER_TABLE)} SWAP WITH {fq(CODED_TABLE)}").collect()
+    session.sql(f"ALTER TABLE {fq(CODED_TABLE)} RENAME TO {fq(BACKUP_TABLE)}").collect()
+    print(f"{ANSWER_TABLE} now stores codes; text rows kept in {BACKUP_TABLE}")
+
+    if catch_up(session, force=force):
+        return 1
+
+    sync_codebook(session)
+    session.sql(f"TRUNCATE TABLE IF EXISTS {fq(EXIT_ROLLUP_TABLE)}").collect()
+    print("codebook, labeled view and rollup reset done")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="only report the encoding")
+    parser.add_argument("--force", action="store_true", help="store unknown answers as NULL instead of stopping")
+    args = parser.parse_args()
+
+    session = connect()
+    try:
+        sys.exit(migrate(session, force=args.force, dry_run=args.dry_run))
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# tools/seed_local_storage.py
+"""
+Fill the local SQLite storage backend (storage.py) with employees, to run the app offline.
+
+    python tools/seed_local_storage.py --employees employees.csv    # a CSV export of the master
+    python tools/seed_local_storage.py --demo 500                   # generated demo employees
+
+then set in .streamlit/secrets.toml:
+
+    [storage]
+    backend = "sqlite"
+    path = ".spool/apu_exit_survey.sqlite3"
+
+The CSV needs an EMPCODE column; the other employee columns (LASTNAME, FIRSTNAME, COMPANYNAME,
+HEADDEPNAME, DEPNAME, POSNAME, GROUPYEAR, LASTHIREDDATE) are optional. Demo employees have
+codes D00001, D00002, ... and hire dates spread over the last 15 years.
+"""
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from storage import DEFAULT_SQLITE_PATH, SQLiteStorage  # noqa: E402
+
+DEMO_COMPANIES = ("АПУ ХК", "АПУ Дэйри ХХК", "АПУ Трейдинг ХХК")
+DEMO_DEPARTMENTS = ("Борлуулалт", "Үйлдвэрлэл", "Санхүү", "Хүний нөөц", "Логистик")
+DEMO_POSITIONS = ("Менежер", "Мэргэжилтэн", "Оператор", "Жолооч", "Нягтлан бодогч")
+DEMO_LASTNAMES = ("Бат", "Дорж", "Болд", "Сүх", "Ганбаатар", "Энхтуяа")
+DEMO_FIRSTNAMES = ("Тэмүүлэн", "Номин", "Ариунаа", "Билгүүн", "Сарнай", "Мөнх-Эрдэнэ")
+
+
+def demo_employees(n, seed=0, today=None) -> pd.DataFrame:
+    """n made-up employees with the employee master columns (deterministic for a seed)."""
+    rng = random.Random(seed)
+    today = today or date.today()
+    rows = []
+    for i in range(1, n + 1):
+        department = rng.choice(DEMO_DEPARTMENTS)
+        rows.append({
+            "EMPCODE": f"D{i:05d}",
+            "LASTNAME": rng.choice(DEMO_LASTNAMES),
+            "FIRSTNAME": rng.choice(DEMO_FIRSTNAMES),
+            "COMPANYNAME": rng.choice(DEMO_COMPANIES),
+            "HEADDEPNAME": department,
+            "DEPNAME": department,
+            "POSNAME": rng.choice(DEMO_POSITIONS),
+            "GROUPYEAR": None,
+            "LASTHIREDDATE": (today - timedelta(days=rng.randint(30, 15 * 365))).isoformat(),
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--path", default=str(ROOT / DEFAULT_SQLITE_PATH), help="SQLite file to fill")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--employees", help="CSV file with the employee master")
+    source.add_argument("--demo", type=int, help="generate this many demo employees")
+    parser.add_argument("--replace", action="store_true", help="delete the employees already in the file first")
+    args = parser.parse_args()
+
+    if args.employees:
+        df = pd.read_csv(args.employees, dtype=str, encoding="utf-8-sig")
+        df.columns = [c.strip().upper() for c in df.columns]
+        if "EMPCODE" not in df.columns:
+            sys.exit("the CSV has no EMPCODE column")
+    else:
+        df = demo_employees(args.demo)
+
+    SQLiteStorage(args.path).import_employees(df, replace=args.replace)
+    print(f"{len(df)} employees written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()